@@ -0,0 +1,22 @@
+"""
+The shared engine behind every script: the run_game() editions (the four
+original scripts 4K1.Xa, V0, gemini and ultra HDR, and the endless and
+giant modes) and the Game-class engine in arcade.py, which
+$acholdingpacman4k.py and the legacy acholdingpacman4k.py play.
+
+The four original editions play the same game; what differs (window
+scaling, HUD, menu, caption, leaderboard) lives in their Profiles, and the
+maze and where everything starts come from a .maze file under mazes/ (see
+mazefile.py). The two Game-class scripts differ in rules only, held in the
+"arcade" and "arcade-legacy" profiles. arcade.py opens its window when
+imported, so it is imported on its own (from pacman_core import arcade),
+not from here. A run_game() launcher script is
+
+    from pacman_core import Edition, PROFILES
+    edition = Edition(PROFILES["v0"])
+    edition.main()
+"""
+
+from pacman_core.profiles import Profile, PROFILES
+from pacman_core.maze import Maze
+from pacman_core.edition import Edition
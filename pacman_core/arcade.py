@@ -0,0 +1,1340 @@
+"""
+The Game-class engine: the Namco 1:1 AI edition's tick-driven Game, played
+by a profile's rules (see profiles.py).
+
+$acholdingpacman4k.py plays the "arcade" profile and re-exports this
+module's API, which the headless, netplay, server, video and analysis
+tools load; acholdingpacman4k.py plays "arcade-legacy". Importing this
+module opens the window and synthesizes the sound effects, as the scripts
+always have, so pacman_core does not import it.
+"""
+
+import pygame
+import sys
+import math
+import random
+from array import array
+
+from pacman_core.profiles import PROFILES
+
+# ── Audio Pre‑init ────────────────────────────────────────────────────────────
+pygame.mixer.pre_init(44100, -16, 2, 512)
+pygame.init()
+
+# ── Constants ─────────────────────────────────────────────────────────────────
+TILE = 16
+COLS = 28
+ROWS = 31
+HUD_H = 48
+WIN_W = COLS * TILE
+WIN_H = ROWS * TILE + HUD_H
+MTOP = HUD_H
+
+# Directions
+UP, DOWN, LEFT, RIGHT = 0, 1, 2, 3
+DX = {UP: 0, DOWN: 0, LEFT: -1, RIGHT: 1}
+DY = {UP: -1, DOWN: 1, LEFT: 0, RIGHT: 0}
+OPP = {UP: DOWN, DOWN: UP, LEFT: RIGHT, RIGHT: LEFT}
+
+# Colors
+BK = (0, 0, 0)
+WC = (33, 33, 222)      # wall
+DC = (255, 184, 174)    # dot
+YL = (255, 255, 0)
+RED = (255, 0, 0)
+PNK = (255, 184, 255)
+CYN = (0, 255, 255)
+ORG = (255, 184, 82)
+BLU = (33, 33, 255)     # frightened
+WH = (255, 255, 255)
+
+# The profile a Game plays unless given another
+ARCADE = PROFILES["arcade"]
+
+screen = pygame.display.set_mode((WIN_W, WIN_H))
+pygame.display.set_caption(ARCADE.caption)
+clock = pygame.time.Clock()
+FPS = ARCADE.fps
+
+# Turbo: simulation ticks per drawn frame (TAB cycles). 0 = unthrottled.
+TURBO_STEPS = (1, 2, 4, 16, 0)
+# Frames per white/blue flash of a frightened ghost near the end of fright
+FLASH_PERIOD = 20
+
+# ── Inline Audio Synthesis ───────────────────────────────────────────────────
+def _synth_wave(freq, duration, vol=0.3, wave='square', slide=0):
+    sr = 44100
+    n_samples = int(sr * duration)
+    buf = bytearray(n_samples * 4)
+
+    for i in range(n_samples):
+        t = i / sr
+        f = freq + (slide * t)
+
+        if wave == 'square':
+            v = 1.0 if (f * t * 2 * math.pi) % (2 * math.pi) < math.pi else -1.0
+        elif wave == 'triangle':
+            p = (f * t) % 1.0
+            v = 4 * p - 1 if p < 0.5 else 3 - 4 * p
+        else:
+            v = math.sin(f * t * 2 * math.pi)
+
+        # envelope
+        env = 1.0
+        if i < 500:
+            env = i / 500
+        if i > n_samples - 1000:
+            env = (n_samples - i) / 1000
+
+        val = int(v * vol * env * 32767)
+        val = max(-32768, min(32767, val))
+
+        struct = val.to_bytes(2, 'little', signed=True)
+        buf[i*4:i*4+2] = struct
+        buf[i*4+2:i*4+4] = struct
+
+    return pygame.mixer.Sound(buffer=bytes(buf))
+
+SFX_WAKA = [
+    _synth_wave(200, 0.1, 0.2, 'triangle', slide=-50),
+    _synth_wave(150, 0.1, 0.2, 'triangle', slide=50)
+]
+SFX_DEATH = _synth_wave(100, 1.2, 0.3, 'square', slide=-80)
+SFX_EAT_GHOST = _synth_wave(600, 0.2, 0.3, 'square', slide=200)
+
+# ── Maze Data ─────────────────────────────────────────────────────────────────
+# 0:Empty, 1:Wall, 2:Dot, 3:Power, 4:GhostHouse, 5:Tunnel, 6:Door
+_ = 0
+W = 1
+D = 2
+P = 3
+H = 4
+T = 5
+G = 6
+
+MAZE = [
+    [W, W, W, W, W, W, W, W, W, W, W, W, W, W, W, W, W, W, W, W, W, W, W, W, W, W, W, W],
+    [W, D, D, D, D, D, D, D, D, D, D, D, D, W, W, D, D, D, D, D, D, D, D, D, D, D, D, W],
+    [W, D, W, W, W, W, D, W, W, W, W, W, D, W, W, D, W, W, W, W, W, D, W, W, W, W, D, W],
+    [W, P, W, _, _, W, D, W, _, _, _, W, D, W, W, D, W, _, _, _, W, D, W, _, _, W, P, W],
+    [W, D, W, W, W, W, D, W, W, W, W, W, D, W, W, D, W, W, W, W, W, D, W, W, W, W, D, W],
+    [W, D, D, D, D, D, D, D, D, D, D, D, D, D, D, D, D, D, D, D, D, D, D, D, D, D, D, W],
+    [W, D, W, W, W, W, D, W, W, D, W, W, W, W, W, W, W, W, D, W, W, D, W, W, W, W, D, W],
+    [W, D, W, W, W, W, D, W, W, D, W, W, W, W, W, W, W, W, D, W, W, D, W, W, W, W, D, W],
+    [W, D, D, D, D, D, D, W, W, D, D, D, D, W, W, D, D, D, D, W, W, D, D, D, D, D, D, W],
+    [W, W, W, W, W, W, D, W, W, W, W, W, _, W, W, _, W, W, W, W, W, D, W, W, W, W, W, W],
+    [_, _, _, _, _, W, D, W, W, W, W, W, _, W, W, _, W, W, W, W, W, D, W, _, _, _, _, _],
+    [W, W, W, W, W, W, D, W, W, _, _, _, _, _, _, _, _, _, _, W, W, D, W, W, W, W, W, W],
+    [W, W, W, W, W, W, D, W, W, _, W, W, W, G, G, W, W, W, _, W, W, D, W, W, W, W, W, W],
+    [T, T, T, T, T, T, D, _, _, _, W, H, H, H, H, H, H, W, _, _, _, D, T, T, T, T, T, T],
+    [W, W, W, W, W, W, D, W, W, _, W, W, W, W, W, W, W, W, _, W, W, D, W, W, W, W, W, W],
+    [W, W, W, W, W, W, D, W, W, _, _, _, _, _, _, _, _, _, _, W, W, D, W, W, W, W, W, W],
+    [W, W, W, W, W, W, D, W, W, _, W, W, W, W, W, W, W, W, _, W, W, D, W, W, W, W, W, W],
+    [W, D, D, D, D, D, D, D, D, D, D, D, D, W, W, D, D, D, D, D, D, D, D, D, D, D, D, W],
+    [W, D, W, W, W, W, D, W, W, W, W, W, D, W, W, D, W, W, W, W, W, D, W, W, W, W, D, W],
+    [W, D, W, W, W, W, D, W, W, W, W, W, D, W, W, D, W, W, W, W, W, D, W, W, W, W, D, W],
+    [W, P, D, D, W, W, D, D, D, D, D, D, D, _, _, D, D, D, D, D, D, D, W, W, D, D, P, W],
+    [W, W, W, D, W, W, D, W, W, D, W, W, W, W, W, W, W, W, D, W, W, D, W, W, D, W, W, W],
+    [W, W, W, D, W, W, D, W, W, D, W, W, W, W, W, W, W, W, D, W, W, D, W, W, D, W, W, W],
+    [W, D, D, D, D, D, D, W, W, D, D, D, D, W, W, D, D, D, D, W, W, D, D, D, D, D, D, W],
+    [W, D, W, W, W, W, W, W, W, W, W, W, D, W, W, D, W, W, W, W, W, W, W, W, W, W, D, W],
+    [W, D, W, W, W, W, W, W, W, W, W, W, D, W, W, D, W, W, W, W, W, W, W, W, W, W, D, W],
+    [W, D, D, D, D, D, D, D, D, D, D, D, D, D, D, D, D, D, D, D, D, D, D, D, D, D, D, W],
+    [W, W, W, W, W, W, W, W, W, W, W, W, W, W, W, W, W, W, W, W, W, W, W, W, W, W, W, W],
+    [_, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _],
+    [_, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _],
+    [_, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _, _],
+]
+
+# Flat immutable template: tile (c, r) lives at ROW_OFF[r] + c. A game's maze
+# is a bytearray copy (868 bytes); level resets copy the template back in.
+MAZE_BYTES = bytes(v for row in MAZE for v in row)
+if len(MAZE_BYTES) != ROWS * COLS:
+    raise ValueError("MAZE must be exactly ROWS x COLS tiles")
+ROW_OFF = tuple(r * COLS for r in range(ROWS))
+DOTS_TOTAL = MAZE_BYTES.count(D) + MAZE_BYTES.count(P)
+
+def make_maze():
+    return bytearray(MAZE_BYTES)
+
+# Entity.update_grid_pos buckets positions (entity centres) into TILE-sized
+# cells starting at these origins; the fast-forward event horizon uses the
+# same boundaries. They start at the maze edge, so an entity's cell is the
+# tile its centre is on.
+GRID_X0 = 0
+GRID_Y0 = MTOP
+
+# ── Utils ─────────────────────────────────────────────────────────────────────
+def get_tile_center(c, r):
+    return (c * TILE + TILE // 2, MTOP + r * TILE + TILE // 2)
+
+def is_wall(c, r, maze):
+    if not (0 <= r < ROWS):
+        return False
+    return maze[ROW_OFF[r] + c % COLS] == W
+
+def is_solid(c, r, maze):
+    if not (0 <= r < ROWS):
+        return True
+    return maze[ROW_OFF[r] + c % COLS] == W
+
+
+# ── Corridor / Intersection Tables ────────────────────────────────────────────
+# Walls never change during play, so the legal moves a ghost has when it
+# reaches a tile centre depend only on (tile, heading, may-use-door).
+# GHOST_EXITS[door_ok][r * COLS + c][dir] -> legal dirs in UP, LEFT, DOWN,
+# RIGHT priority order, never including the reverse of dir.
+def _static_tile(c, r):
+    if not (0 <= r < ROWS):
+        return None
+    return MAZE_BYTES[ROW_OFF[r] + c % COLS]
+
+def build_ghost_exits(door_ok):
+    table = []
+    for r in range(ROWS):
+        for c in range(COLS):
+            per_dir = []
+            for heading in (UP, DOWN, LEFT, RIGHT):
+                opts = []
+                for d in (UP, LEFT, DOWN, RIGHT):
+                    if d == OPP[heading]:
+                        continue
+                    t = _static_tile(c + DX[d], r + DY[d])
+                    if t is None or t == W:
+                        continue
+                    if t == G and not door_ok:
+                        continue
+                    opts.append(d)
+                per_dir.append(tuple(opts))
+            table.append(per_dir)
+    return table
+
+GHOST_EXITS = (build_ghost_exits(False), build_ghost_exits(True))
+
+
+# ── Shortest-Path Distance Fields (hard ghost AI) ─────────────────────────────
+UNREACHABLE = 0xFFFF
+
+class DistanceFields:
+    """All-pairs BFS move counts over the fixed MAZE.
+
+    Built once per door rule and shared by every game and ghost. field(c, r)
+    returns an array indexed by r * COLS + c holding the number of moves from
+    each tile to (c, r); targets off the grid or inside walls are snapped to
+    the nearest open tile first.
+    """
+    _shared = {}
+
+    @classmethod
+    def shared(cls, door_ok):
+        if door_ok not in cls._shared:
+            cls._shared[door_ok] = cls(door_ok)
+        return cls._shared[door_ok]
+
+    def __init__(self, door_ok):
+        blocked = (W,) if door_ok else (W, G)
+        open_tiles = [r * COLS + c for r in range(ROWS) for c in range(COLS)
+                      if _static_tile(c, r) not in blocked]
+        is_open = bytearray(ROWS * COLS)
+        for i in open_tiles:
+            is_open[i] = 1
+
+        neighbours = [()] * (ROWS * COLS)
+        for i in open_tiles:
+            r, c = divmod(i, COLS)
+            adj = []
+            for d in (UP, LEFT, DOWN, RIGHT):
+                nr = r + DY[d]
+                if 0 <= nr < ROWS:
+                    j = nr * COLS + (c + DX[d]) % COLS
+                    if is_open[j]:
+                        adj.append(j)
+            neighbours[i] = tuple(adj)
+
+        self.rows = {}
+        for src in open_tiles:
+            dist = array('H', [UNREACHABLE]) * (ROWS * COLS)
+            dist[src] = 0
+            frontier = [src]
+            step = 0
+            while frontier:
+                step += 1
+                nxt = []
+                for i in frontier:
+                    for j in neighbours[i]:
+                        if dist[j] == UNREACHABLE:
+                            dist[j] = step
+                            nxt.append(j)
+                frontier = nxt
+            self.rows[src] = dist
+
+        # Nearest open tile (Euclidean) for every grid cell, for snapping
+        self.nearest = []
+        for r in range(ROWS):
+            for c in range(COLS):
+                best = min(open_tiles, key=lambda i: (i // COLS - r) ** 2 + (i % COLS - c) ** 2)
+                self.nearest.append(best)
+
+    def field(self, c, r):
+        c = min(max(c, 0), COLS - 1)
+        r = min(max(r, 0), ROWS - 1)
+        return self.rows[self.nearest[r * COLS + c]]
+
+
+class GhostNav:
+    """Per-game handle on the shared fields used by the hard ghost AI.
+
+    Most chase targets are Pac-Man's own tile, so that field is re-fetched
+    only when Pac-Man changes tile; everything else is one dict lookup.
+    """
+
+    def __init__(self):
+        self.fields = (DistanceFields.shared(False), DistanceFields.shared(True))
+        self.pac_tile = None
+        self.pac_field = None
+
+    def track(self, pac):
+        tile = (pac.col, pac.row)
+        if tile != self.pac_tile:
+            self.pac_tile = tile
+            self.pac_field = self.fields[False].field(*tile)
+
+    def field(self, tx, ty, door_ok):
+        if not door_ok and (tx, ty) == self.pac_tile:
+            return self.pac_field
+        return self.fields[door_ok].field(tx, ty)
+
+# ── Event Horizon Helpers ─────────────────────────────────────────────────────
+# Closed-form tick counts used by Game.fast_forward. All of them round down
+# (with a small epsilon), so a skipped stretch never contains an event.
+_EPS = 1e-6
+NEVER = 1 << 30
+
+def _moves_in_cell(p, v, origin):
+    """Moves of v from p that keep (p - origin) // TILE unchanged."""
+    if v == 0:
+        return NEVER
+    lo = origin + ((p - origin) // TILE) * TILE
+    if v > 0:
+        return max(0, int((lo + TILE - p) / v - _EPS))
+    return max(0, int((p - lo) / -v - _EPS))
+
+def _ticks_outside_radius(along, perp, speed, radius):
+    """Ticks before an entity moving towards a point comes within radius.
+
+    along is the remaining distance to the point along the heading (negative
+    once it is behind), perp the fixed perpendicular offset.
+    """
+    if perp > radius:
+        return NEVER
+    reach = math.sqrt(radius * radius - perp * perp)
+    if along < 0:
+        return 0 if -along <= reach else NEVER
+    if speed <= 0:
+        return 0 if along <= reach else NEVER
+    return max(0, int((along - reach) / speed - _EPS))
+
+def _axis_offsets(ent, cx, cy, d):
+    """(distance ahead to (cx, cy) along heading d, perpendicular offset)."""
+    if DX[d]:
+        return (cx - ent.x) * DX[d], abs(cy - ent.y)
+    return (cy - ent.y) * DY[d], abs(cx - ent.x)
+
+
+# ── Classes ───────────────────────────────────────────────────────────────────
+
+class Entity:
+    # Fixed attribute layout: no per-instance __dict__, faster attribute access
+    __slots__ = ('x', 'y', 'col', 'row', 'dir', 'speed')
+
+    def __init__(self, x, y):
+        self.place(x, y)
+        self.dir = LEFT
+        self.speed = 0.0
+
+    def place(self, x, y):
+        self.x = x
+        self.y = y
+        self.col = int(x // TILE)
+        self.row = int((y - MTOP) // TILE)
+
+    def save(self):
+        """Every slot value, in FIELDS order (see load)."""
+        return tuple([getattr(self, n) for n in self.FIELDS])
+
+    def load(self, state):
+        for n, v in zip(self.FIELDS, state):
+            setattr(self, n, v)
+
+    def update_grid_pos(self):
+        self.col = int((self.x - GRID_X0) // TILE) % COLS
+        self.row = int((self.y - GRID_Y0) // TILE)
+        if self.row < 0:
+            self.row = 0
+        if self.row >= ROWS:
+            self.row = ROWS - 1
+        if self.col < 0:
+            self.col = COLS - 1
+        if self.col >= COLS:
+            self.col = 0
+
+    def draw(self, surf):
+        pass
+
+
+class Pacman(Entity):
+    __slots__ = ('next_dir', 'alive', 'mouth_open', 'mouth_speed')
+
+    def __init__(self):
+        cx, cy = get_tile_center(13, 20)    # the undotted start tiles under the house
+        super().__init__(cx, cy)
+        self.next_dir = LEFT
+        self.dir = LEFT
+        self.alive = True
+        self.mouth_open = 0
+        self.mouth_speed = 0.2
+
+    def update(self, maze, row):
+        if not self.alive:
+            return
+
+        self.speed = row.pac_speed
+
+        cx, cy = get_tile_center(self.col, self.row)
+        dist_to_center = math.hypot(self.x - cx, self.y - cy)
+
+        if dist_to_center <= row.corner_px:
+            if self.next_dir != self.dir:
+                nx = self.col + DX[self.next_dir]
+                ny = self.row + DY[self.next_dir]
+                if 0 <= ny < ROWS and not is_wall(nx, ny, maze) and maze[ROW_OFF[ny] + nx % COLS] != G:
+                    self.dir = self.next_dir
+                    self.x = cx
+                    self.y = cy
+
+        self.x += DX[self.dir] * self.speed
+        self.y += DY[self.dir] * self.speed
+
+        nx = self.col + DX[self.dir]
+        ny = self.row + DY[self.dir]
+        cx, cy = get_tile_center(self.col, self.row)
+
+        moving_into_wall = False
+        if 0 <= ny < ROWS:
+            if is_wall(nx, ny, maze) or maze[ROW_OFF[ny] + nx % COLS] == G:
+                if self.dir == UP and self.y < cy:
+                    moving_into_wall = True
+                if self.dir == DOWN and self.y > cy:
+                    moving_into_wall = True
+                if self.dir == LEFT and self.x < cx:
+                    moving_into_wall = True
+                if self.dir == RIGHT and self.x > cx:
+                    moving_into_wall = True
+
+        if moving_into_wall:
+            self.x = cx
+            self.y = cy
+
+        # Tunnel wrap
+        if self.x < -8:
+            self.x += WIN_W
+        if self.x > WIN_W + 8:
+            self.x -= WIN_W
+
+        self.update_grid_pos()
+
+        self.mouth_open += self.mouth_speed
+        if self.mouth_open > 1 or self.mouth_open < 0:
+            self.mouth_speed *= -1
+
+    def draw(self, surf):
+        if not self.alive:
+            return
+        px, py = int(self.x), int(self.y)
+        radius = 7
+        angle_offsets = {RIGHT: 0, DOWN: 90, LEFT: 180, UP: 270}
+        base_angle = angle_offsets.get(self.dir, 0)
+
+        if self.mouth_open <= 0.1:
+            pygame.draw.circle(surf, YL, (px, py), radius)
+        else:
+            start_angle = base_angle + (45 * self.mouth_open)
+            end_angle = base_angle - (45 * self.mouth_open)
+            points = [(px, py)]
+            steps = 10
+            for i in range(steps + 1):
+                a = math.radians(start_angle + (end_angle - start_angle) * (i / steps))
+                points.append((px + radius * math.cos(a), py + radius * math.sin(a)))
+            pygame.draw.polygon(surf, YL, points)
+
+
+# Scatter targets, Blinky to Clyde; Clyde also heads for his when near Pac-Man
+SCATTER_CORNERS = ((25, -2), (2, -2), (27, 31), (0, 31))
+
+
+class Ghost(Entity):
+    SCATTER = 0
+    CHASE = 1
+    FRIGHT = 2
+    EATEN = 3
+    HOUSE = 4
+
+    BLINKY = 0
+    PINKY = 1
+    INKY = 2
+    CLYDE = 3
+
+    __slots__ = ('id', 'color', 'next_dir', 'mode', 'scared_timer',
+                 'house_dot_limit', 'dot_counter', 'player')
+
+    def __init__(self, g_id, row=None):
+        self.id = g_id
+        self.color = [RED, PNK, CYN, ORG][g_id]
+        # Steered by a player's next_dir instead of the targeting AI
+        self.player = False
+        self.reset_pos(row)
+
+    def reset_pos(self, row=None):
+        """Back to the start; row (default: the arcade profile's level 1)
+        gives the dots eaten before he may leave the house."""
+        if row is None:
+            row = LEVELS.row(1)
+        starts = [(13, 11), (13, 13), (11, 13), (15, 13)]
+        sc, sr = starts[self.id]
+        cx, cy = get_tile_center(sc, sr)
+        self.place(cx, cy)
+        self.speed = 0.0
+
+        if self.id == self.PINKY:
+            self.dir = LEFT
+        elif self.id == self.BLINKY:
+            self.dir = LEFT
+        else:
+            self.dir = UP
+
+        self.next_dir = self.dir
+        self.mode = self.HOUSE if self.id != self.BLINKY else self.SCATTER
+
+        self.scared_timer = 0
+        self.house_dot_limit = row.release_dots[self.id]
+        self.dot_counter = 0
+
+    def reverse(self):
+        if self.mode in [self.SCATTER, self.CHASE, self.FRIGHT]:
+            self.dir = OPP[self.dir]
+
+    def get_target(self, pac, ghosts, row):
+        if self.mode == self.EATEN:
+            return (13, 11)
+        if self.mode == self.SCATTER:
+            return SCATTER_CORNERS[self.id]
+        if self.mode == self.CHASE:
+            if self.id == self.BLINKY:
+                return (pac.col, pac.row)
+            if self.id == self.PINKY:
+                ahead = row.pinky_ahead
+                tx = pac.col + DX[pac.dir] * ahead
+                ty = pac.row + DY[pac.dir] * ahead
+                if pac.dir == UP:          # overflow bug
+                    tx -= ahead * row.up_overflow[0]
+                    ty -= ahead * row.up_overflow[1]
+                return (tx, ty)
+            if self.id == self.INKY:
+                ahead = row.inky_ahead
+                px = pac.col + DX[pac.dir] * ahead
+                py = pac.row + DY[pac.dir] * ahead
+                if pac.dir == UP:
+                    px -= ahead * row.up_overflow[0]
+                    py -= ahead * row.up_overflow[1]
+                bx = ghosts[self.BLINKY].col
+                by = ghosts[self.BLINKY].row
+                vx = px - bx
+                vy = py - by
+                return (px + vx, py + vy)
+            if self.id == self.CLYDE:
+                dx, dy = self.col - pac.col, self.row - pac.row
+                if dx * dx + dy * dy >= row.clyde_radius_sq:
+                    return (pac.col, pac.row)
+                else:
+                    return SCATTER_CORNERS[self.CLYDE]
+        return (0, 0)
+
+    def speed_for(self, maze, dots_remaining, row):
+        # Speeds come from the level's LevelRow; only ghost state is checked here
+        if 0 <= self.row < ROWS and 0 <= self.col < COLS:
+            if maze[ROW_OFF[self.row] + self.col] == T:
+                return row.tunnel_speed
+        if self.mode == self.EATEN:
+            return row.eaten_speed
+        if self.mode == self.FRIGHT:
+            return row.fright_speed
+
+        # Cruise Elroy
+        if self.id == self.BLINKY and self.mode == self.CHASE:
+            if dots_remaining <= row.elroy2_dots:
+                return row.elroy2_speed
+            if dots_remaining <= row.elroy1_dots:
+                return row.elroy1_speed
+        return row.ghost_speed
+
+    def update(self, maze, pac, ghosts, global_mode, dots_remaining, row, nav=None,
+               rng=random):
+        current_speed = self.speed_for(maze, dots_remaining, row)
+
+        # ---- Ghost house behavior ----
+        if self.mode == self.HOUSE:
+            cy = get_tile_center(0, 13)[1]
+            if self.y < cy - 4:
+                self.dir = DOWN
+            if self.y > cy + 4:
+                self.dir = UP
+            self.y += DY[self.dir] * 0.5
+
+            can_leave = False
+            if self.id == self.PINKY:
+                can_leave = True
+            elif self.dot_counter >= self.house_dot_limit:
+                can_leave = True
+
+            if can_leave:
+                cx = get_tile_center(13, 0)[0]
+                if abs(self.x - cx) > 1:
+                    self.x += 1 if self.x < cx else -1
+                else:
+                    self.x = cx
+                    self.y -= 1
+                    if self.row == 11:
+                        # Out on the row's centre line, where the turns are
+                        # taken: a ghost slower than the 7 px still to rise
+                        # would never come within a step of a tile centre
+                        self.y = get_tile_center(13, 11)[1]
+                        self.mode = global_mode
+                        self.dir = LEFT
+            self.update_grid_pos()
+            return
+
+        # A move longer than a tile (an eaten ghost's) would jump a tile
+        # centre and the turn due there: take it in tile-sized parts
+        parts = int(math.ceil(current_speed / TILE))
+        for _ in range(parts):
+            self.step(current_speed / parts, maze, pac, ghosts, row, nav, rng)
+            if self.mode == self.HOUSE:
+                break
+
+    def step(self, current_speed, maze, pac, ghosts, row, nav, rng):
+        """Turn if at a tile centre, then move current_speed px (at most a tile)."""
+        # ---- At intersection, choose new direction ----
+        cx, cy = get_tile_center(self.col, self.row)
+        dist = math.hypot(self.x - cx, self.y - cy)
+
+        if dist <= current_speed:
+            self.x = cx
+            self.y = cy
+            opts = GHOST_EXITS[self.mode == self.EATEN][self.row * COLS + self.col][self.dir]
+
+            if self.player and self.mode != self.EATEN:
+                # Held direction if legal here, else keep going (or first exit)
+                if self.next_dir in opts:
+                    self.dir = self.next_dir
+                elif opts and self.dir not in opts:
+                    self.dir = opts[0]
+            elif self.mode == self.FRIGHT:
+                if opts:
+                    self.dir = rng.choice(opts)
+            else:
+                if len(opts) == 1:
+                    # Corridor or corner: only one legal move, no targeting
+                    best_d = opts[0]
+                elif not opts:
+                    best_d = -1
+                elif nav is not None:
+                    # Hard AI: true maze distance from each exit to the target
+                    tx, ty = self.get_target(pac, ghosts, row)
+                    field = nav.field(tx, ty, self.mode == self.EATEN)
+                    best_d = -1
+                    min_dist = UNREACHABLE + 1
+                    for d in opts:
+                        n = field[(self.row + DY[d]) * COLS + (self.col + DX[d]) % COLS]
+                        if n < min_dist:
+                            min_dist = n
+                            best_d = d
+                else:
+                    tx, ty = self.get_target(pac, ghosts, row)
+                    best_d = -1
+                    min_dist = 99999999
+                    # priority order: UP > LEFT > DOWN > RIGHT
+                    for d in opts:
+                        dx = self.col + DX[d] - tx
+                        dy = self.row + DY[d] - ty
+                        d_sq = dx * dx + dy * dy
+                        if d_sq < min_dist:
+                            min_dist = d_sq
+                            best_d = d
+
+                if best_d != -1:
+                    self.dir = best_d
+
+                    # Eaten ghost returning to house
+                    if self.mode == self.EATEN:
+                        # Straight down through the door at (13, 12)
+                        if self.col == 13 and self.row in (11, 12):
+                            self.dir = DOWN
+                        if self.col == 13 and self.row == 13:
+                            self.mode = self.HOUSE
+                            self.color = [RED, PNK, CYN, ORG][self.id]
+                            # Eaten ghosts exit house immediately (no dot wait)
+                            self.dot_counter = self.house_dot_limit
+                            self.dir = UP
+
+        # Move
+        self.x += DX[self.dir] * current_speed
+        self.y += DY[self.dir] * current_speed
+
+        # Tunnel wrap
+        if self.x < -8:
+            self.x += WIN_W
+        if self.x > WIN_W + 8:
+            self.x -= WIN_W
+
+        self.update_grid_pos()
+
+    def draw(self, surf, flash_frames=FLASH_PERIOD * 6):
+        px, py = int(self.x), int(self.y)
+
+        if self.mode == self.FRIGHT:
+            c = BLU
+            # Flashes white for the last flash_frames of fright
+            if self.scared_timer < flash_frames and (self.scared_timer // (FLASH_PERIOD // 2)) % 2 == 0:
+                c = WH
+        else:
+            c = self.color
+
+        if self.mode != self.EATEN:
+            pygame.draw.circle(surf, c, (px, py), 7)
+            pygame.draw.rect(surf, c, (px - 7, py, 14, 7))
+
+        # eyes
+        eye_off_x = DX[self.dir] * 2
+        eye_off_y = DY[self.dir] * 2 - 2
+        pygame.draw.circle(surf, WH, (px - 3 + eye_off_x, py + eye_off_y), 2)
+        pygame.draw.circle(surf, WH, (px + 3 + eye_off_x, py + eye_off_y), 2)
+
+        pc = BLU if self.mode == self.FRIGHT else RED
+        pygame.draw.circle(surf, pc, (px - 3 + eye_off_x + DX[self.dir],
+                                     py + eye_off_y + DY[self.dir]), 1)
+        pygame.draw.circle(surf, pc, (px + 3 + eye_off_x + DX[self.dir],
+                                     py + eye_off_y + DY[self.dir]), 1)
+
+
+def _slot_fields(cls):
+    return tuple(n for k in reversed(cls.__mro__) for n in getattr(k, '__slots__', ()))
+
+Pacman.FIELDS = _slot_fields(Pacman)
+Ghost.FIELDS = _slot_fields(Ghost)
+
+
+# ── Level Table ───────────────────────────────────────────────────────────────
+MODES = {'scatter': Ghost.SCATTER, 'chase': Ghost.CHASE}
+# Levels prebuilt per profile; later ones are built from the same rules
+MAX_LEVEL = 256
+
+
+def from_level(level, first, changes):
+    """first, or the value of the last (from level, value) in changes that
+    level has reached."""
+    value = first
+    for start, v in changes:
+        if level >= start:
+            value = v
+    return value
+
+
+def wave_frames(seconds):
+    """Frames a wave of this many seconds lasts: the ticks the original's
+    float clock (1/FPS a tick, from 0) takes to reach it, e.g. 421 for 7."""
+    t, n = 0.0, 0
+    while t < seconds:
+        t += 1 / FPS
+        n += 1
+    return n
+
+
+def build_wave_schedule(waves):
+    """(seconds, mode) waves -> (ends, modes) in whole frames.
+
+    ends[i] is the absolute wave-clock frame at which wave i hands over to
+    wave i + 1; the final wave never ends. Integer frames make every switch
+    land on the same tick regardless of how the clock is advanced.
+    """
+    ends = []
+    frame = 0
+    for seconds, _mode in waves[:-1]:
+        frame += wave_frames(seconds)
+        ends.append(frame)
+    ends.append(NEVER)
+    return tuple(ends), tuple(MODES[mode] for _s, mode in waves)
+
+
+class LevelRow:
+    """Every rule for one level of a profile, resolved up front.
+
+    Speeds are px/frame. A profile's elroy speeds are absolute, or factors
+    of the ghost speed applied in turn when elroy_relative is set.
+    """
+    __slots__ = ('level', 'pac_speed', 'ghost_speed', 'tunnel_speed',
+                 'fright_speed', 'eaten_speed', 'elroy1_dots', 'elroy1_speed',
+                 'elroy2_dots', 'elroy2_speed', 'fright_frames', 'fright_reverses',
+                 'flash_count', 'flash_frames', 'wave_ends', 'wave_modes',
+                 'corner_px', 'hit_radius', 'release_dots', 'pinky_ahead',
+                 'inky_ahead', 'up_overflow', 'clyde_radius_sq')
+
+    def __init__(self, level, profile=ARCADE):
+        p = profile
+        self.level = level
+        self.pac_speed = p.pac_speed + level * p.pac_speed_step
+        self.ghost_speed = from_level(level, p.ghost_speed, p.ghost_speed_from)
+        self.tunnel_speed = p.tunnel_speed
+        self.fright_speed = p.fright_speed
+        self.eaten_speed = p.eaten_speed
+        (self.elroy1_dots, e1), (self.elroy2_dots, e2) = p.elroy
+        if p.elroy_relative:
+            e1 *= self.ghost_speed
+            e2 *= e1
+        self.elroy1_speed, self.elroy2_speed = e1, e2
+        self.fright_frames = from_level(level, p.fright_frames, p.fright_frames_from)
+        self.fright_reverses = p.fright_reverses
+        self.flash_count = 6
+        self.flash_frames = self.flash_count * FLASH_PERIOD
+        self.wave_ends, self.wave_modes = build_wave_schedule(
+            from_level(level, None, p.level_waves))
+        self.corner_px = p.corner_px
+        self.hit_radius = p.hit_radius
+        self.release_dots = p.release_dots
+        self.pinky_ahead = p.pinky_ahead
+        self.inky_ahead = p.inky_ahead
+        self.up_overflow = p.up_overflow
+        self.clyde_radius_sq = p.clyde_radius_sq
+
+
+class LevelTable:
+    """A profile's LevelRow for every level: 1..MAX_LEVEL built once,
+    later levels when asked for (Pac-Man keeps speeding up past the table)."""
+    _shared = {}
+
+    @classmethod
+    def shared(cls, profile):
+        if profile.name not in cls._shared:
+            cls._shared[profile.name] = cls(profile)
+        return cls._shared[profile.name]
+
+    def __init__(self, profile=ARCADE, max_level=MAX_LEVEL):
+        self.profile = profile
+        self.rows = [None] + [LevelRow(n, profile) for n in range(1, max_level + 1)]
+
+    def row(self, level):
+        if level < len(self.rows):
+            return self.rows[max(1, level)]
+        return LevelRow(level, self.profile)
+
+LEVELS = LevelTable.shared(ARCADE)
+
+
+# ── Animation Clock / Maze Layers ─────────────────────────────────────────────
+# Everything that animates runs off the simulation tick, never the wall
+# clock, so a frame is a function of the game state: replays, video export
+# and spectators draw what was played. Frightened ghosts already flash off
+# scared_timer; power pellets blink off Game.ticks.
+BLINK_MS = 200          # power pellets lit this long, then dark as long
+
+
+def pellets_lit(tick):
+    return (tick * 1000 // FPS // BLINK_MS) % 2 == 0
+
+
+def _draw_tile(surf, val, x, y, lit):
+    if val == W:
+        pygame.draw.rect(surf, WC, (x + 4, y + 4, 8, 8))
+    elif val == D:
+        pygame.draw.circle(surf, DC, (x + 8, y + 8), 2)
+    elif val == P:
+        if lit:
+            pygame.draw.circle(surf, DC, (x + 8, y + 8), 6)
+    elif val == G:
+        pygame.draw.line(surf, PNK, (x, y + 8), (x + 16, y + 8), 2)
+
+
+class MazeLayers:
+    """The maze pre-drawn in both blink phases, power pellets lit and dark,
+    so a frame blits one instead of drawing every tile.
+
+    The layers follow a maze by redrawing only the tiles that differ from
+    what they show: eaten pellets, a new level, a snapshot restore.
+    """
+    __slots__ = ('lit', 'dark', 'shows')
+
+    def __init__(self):
+        self.lit = pygame.Surface((WIN_W, WIN_H))
+        self.dark = pygame.Surface((WIN_W, WIN_H))
+        self.lit.fill(BK)
+        self.dark.fill(BK)
+        self.shows = bytes(len(MAZE_BYTES))     # blank: every tile empty
+
+    def layer(self, maze, lit):
+        now = bytes(maze)
+        if now != self.shows:
+            for i, (new, old) in enumerate(zip(now, self.shows)):
+                if new != old:
+                    r, c = divmod(i, COLS)
+                    x, y = c * TILE, MTOP + r * TILE
+                    if old != _:
+                        # Inside the tile only: a door line overhangs into the next
+                        self.lit.fill(BK, (x + 1, y + 1, TILE - 2, TILE - 2))
+                        self.dark.fill(BK, (x + 1, y + 1, TILE - 2, TILE - 2))
+                    _draw_tile(self.lit, new, x, y, True)
+                    _draw_tile(self.dark, new, x, y, False)
+            self.shows = now
+        return self.lit if lit else self.dark
+
+
+class Game:
+    def __init__(self, hard=False, seed=None, versus=False, profile=ARCADE):
+        # The rules played, level by level
+        self.profile = profile
+        self.levels = LevelTable.shared(profile)
+        # When muted, update() runs silently (turbo ticks that are never drawn)
+        self.muted = False
+        # Hard mode: ghosts steer by shortest path instead of straight-line
+        self.nav = GhostNav() if hard else None
+        # Own RNG (frightened ghosts), so a seed plus inputs replays exactly
+        self.rng = random.Random(seed)
+        # Versus: Blinky is steered by a second player
+        self.versus = versus
+        # Whether Enter on the keyboard restarts a finished game; off where
+        # all input comes from elsewhere (netplay re-simulates it)
+        self.restart_key = True
+        # The animation clock: update() calls so far
+        self.ticks = 0
+        self.layers = None      # MazeLayers, made on the first draw
+        self.reset_game()
+
+    def reset_game(self):
+        self.maze = make_maze()
+        self.level = 1
+        self.row = self.levels.row(self.level)
+        self.pac = Pacman()
+        self.ghosts = [Ghost(i, self.row) for i in range(4)]
+        self.ghosts[Ghost.BLINKY].player = self.versus
+        self.score = 0
+        self.lives = 3
+        self.dots_total = DOTS_TOTAL
+        self.dots_left = self.dots_total
+
+        self.wave_idx = 0
+        self.wave_frame = 0
+        self.global_mode = self.row.wave_modes[0]
+        self.state = "READY"
+        self.state_timer = 0
+        self.ghost_eat_combo = 0
+        self.waka_idx = 0
+
+    def play_sfx(self, sfx):
+        if not self.muted:
+            sfx.play()
+
+    def set_mode(self, mode):
+        if self.global_mode != mode:
+            self.global_mode = mode
+            for g in self.ghosts:
+                if g.mode not in [Ghost.FRIGHT, Ghost.EATEN, Ghost.HOUSE]:
+                    g.mode = mode
+                    g.reverse()
+
+    def update(self):
+        self.ticks += 1
+        if self.state == "READY":
+            self.state_timer += 1
+            if self.state_timer > 120:   # 2 seconds
+                self.state = "PLAYING"
+            return
+
+        if self.state == "GAMEOVER":
+            if self.restart_key and pygame.key.get_pressed()[pygame.K_RETURN]:
+                self.reset_game()
+            return
+
+        if self.state == "DEAD":
+            self.state_timer += 1
+            if self.state_timer > 60:    # 1 second
+                if self.lives > 0:
+                    self.reset_positions()
+                    self.state = "READY"
+                    self.state_timer = 0
+                else:
+                    self.state = "GAMEOVER"
+            return
+
+        # Wave timer (only if not frightened)
+        if self.global_mode != Ghost.FRIGHT:
+            self.wave_frame += 1
+            if self.wave_frame >= self.row.wave_ends[self.wave_idx]:
+                self.wave_idx += 1
+                self.set_mode(self.row.wave_modes[self.wave_idx])
+
+        # Update Pac‑Man
+        self.pac.update(self.maze, self.row)
+        if self.nav is not None:
+            self.nav.track(self.pac)
+
+        # Update ghosts
+        for g in self.ghosts:
+            if g.mode == Ghost.FRIGHT:
+                g.scared_timer -= 1
+                if g.scared_timer <= 0:
+                    # frightened ends → reverse direction
+                    g.mode = self.global_mode
+                    if self.row.fright_reverses:
+                        g.reverse()
+
+            g.update(self.maze, self.pac, self.ghosts, self.global_mode,
+                    self.dots_left, self.row, self.nav, self.rng)
+
+            # Collision
+            dist = math.hypot(g.x - self.pac.x, g.y - self.pac.y)
+            if dist < self.row.hit_radius:
+                if g.mode == Ghost.FRIGHT:
+                    g.mode = Ghost.EATEN
+                    self.play_sfx(SFX_EAT_GHOST)
+                    pts = 200 * (2 ** self.ghost_eat_combo)
+                    self.score += pts
+                    self.ghost_eat_combo += 1
+                elif g.mode != Ghost.EATEN and self.state != "DEAD":
+                    # One life a tick, however many ghosts catch him
+                    self.play_sfx(SFX_DEATH)
+                    self.lives -= 1
+                    self.state = "DEAD"
+                    self.state_timer = 0
+
+        # Eat dots / power pellets
+        if 0 <= self.pac.row < ROWS and 0 <= self.pac.col < COLS:
+            i = ROW_OFF[self.pac.row] + self.pac.col
+            t = self.maze[i]
+
+            if t == D:
+                self.maze[i] = _
+                self.score += 10
+                self.dots_left -= 1
+                self.play_sfx(SFX_WAKA[self.waka_idx])
+                self.waka_idx = 1 - self.waka_idx
+                for g in self.ghosts:
+                    if g.mode == Ghost.HOUSE:
+                        g.dot_counter += 1
+
+            elif t == P:
+                self.maze[i] = _
+                self.score += 50
+                self.dots_left -= 1
+                self.ghost_eat_combo = 0
+                for g in self.ghosts:
+                    if g.mode in [Ghost.SCATTER, Ghost.CHASE]:
+                        g.mode = Ghost.FRIGHT
+                        g.scared_timer = self.row.fright_frames
+                        g.reverse()
+
+        # Level complete
+        if self.dots_left == 0:
+            self.level += 1
+            self.maze[:] = MAZE_BYTES
+            self.row = self.levels.row(self.level)
+            self.reset_positions()
+            self.dots_left = self.dots_total
+            self.state = "READY"
+            self.state_timer = 0
+
+    def reset_positions(self):
+        self.pac = Pacman()
+        for g in self.ghosts:
+            g.reset_pos(self.row)
+        self.wave_idx = 0
+        self.wave_frame = 0
+        # Ghosts just placed take the first wave's mode directly (no reversal)
+        self.global_mode = self.row.wave_modes[0]
+        for g in self.ghosts:
+            if g.mode == Ghost.SCATTER:
+                g.mode = self.global_mode
+
+    # ---- Snapshots (rollback netplay, replays) ----
+    def snapshot(self):
+        """Everything update() reads or writes, as immutable values."""
+        return (bytes(self.maze), self.score, self.lives, self.level,
+                self.dots_left, self.wave_idx, self.wave_frame,
+                self.global_mode, self.state, self.state_timer,
+                self.ghost_eat_combo, self.waka_idx, self.ticks, self.rng.getstate(),
+                self.pac.save(), tuple([g.save() for g in self.ghosts]))
+
+    def restore(self, snap):
+        (maze, self.score, self.lives, self.level, self.dots_left,
+         self.wave_idx, self.wave_frame, self.global_mode, self.state,
+         self.state_timer, self.ghost_eat_combo, self.waka_idx, self.ticks, rng,
+         pac, ghosts) = snap
+        self.maze[:] = maze
+        self.row = self.levels.row(self.level)
+        self.rng.setstate(rng)
+        self.pac.load(pac)
+        for g, state in zip(self.ghosts, ghosts):
+            g.load(state)
+
+    # ---- Event-driven fast-forward (headless analysis) ----
+    def quiet_ticks(self):
+        """Number of upcoming ticks in which nothing but straight-line motion
+        and timer countdown happens: no tile change, no turn or ghost
+        decision, no dot, no collision, no wave or frightened expiry.
+        """
+        if self.state == "READY":
+            return 120 - self.state_timer
+        if self.state == "DEAD":
+            return 60 - self.state_timer
+        if self.state != "PLAYING":
+            return 0
+
+        horizon = NEVER
+        if self.global_mode != Ghost.FRIGHT:
+            horizon = min(horizon, self.row.wave_ends[self.wave_idx] - self.wave_frame - 1)
+
+        pac = self.pac
+        maze = self.maze
+        sp = 0.0
+        if pac.alive:
+            if maze[ROW_OFF[pac.row] + pac.col] in (D, P):
+                return 0
+            sp = self.row.pac_speed
+            d = pac.dir
+            horizon = min(horizon,
+                          _moves_in_cell(pac.x, DX[d] * sp, GRID_X0),
+                          _moves_in_cell(pac.y, DY[d] * sp, GRID_Y0))
+            if horizon <= 0:
+                return 0
+            cx, cy = get_tile_center(pac.col, pac.row)
+            along, perp = _axis_offsets(pac, cx, cy, d)
+            if pac.next_dir != d:
+                horizon = min(horizon, _ticks_outside_radius(along, perp, sp, self.row.corner_px))
+            nx, ny = pac.col + DX[d], pac.row + DY[d]
+            if 0 <= ny < ROWS and (is_wall(nx, ny, maze) or maze[ROW_OFF[ny] + nx % COLS] == G):
+                # Snaps back to the centre once it would move past it
+                horizon = min(horizon, max(0, int(along / sp - _EPS)) if along >= 0 else 0)
+            if horizon <= 0:
+                return 0
+
+        for g in self.ghosts:
+            if g.mode == Ghost.HOUSE:
+                if g.id == Ghost.PINKY or g.dot_counter >= g.house_dot_limit:
+                    return 0
+                sg = 0.5
+            else:
+                sg = g.speed_for(maze, self.dots_left, self.row)
+                if g.mode == Ghost.FRIGHT:
+                    horizon = min(horizon, g.scared_timer - 1)
+                horizon = min(horizon,
+                              _moves_in_cell(g.x, DX[g.dir] * sg, GRID_X0),
+                              _moves_in_cell(g.y, DY[g.dir] * sg, GRID_Y0))
+                cx, cy = get_tile_center(g.col, g.row)
+                along, perp = _axis_offsets(g, cx, cy, g.dir)
+                horizon = min(horizon, _ticks_outside_radius(along, perp, sg, sg))
+            if g.mode != Ghost.EATEN:
+                gap = math.hypot(g.x - pac.x, g.y - pac.y) - self.row.hit_radius
+                horizon = min(horizon, max(0, int(gap / (sp + sg) - _EPS)))
+            if horizon <= 0:
+                return 0
+        return max(0, horizon)
+
+    def skip_quiet(self, n):
+        """Advance n ticks previously reported by quiet_ticks()."""
+        if n <= 0:
+            return
+        self.ticks += n
+        if self.state != "PLAYING":
+            self.state_timer += n
+            return
+
+        if self.global_mode != Ghost.FRIGHT:
+            self.wave_frame += n
+
+        # Positions are advanced by repeated addition, not x + n * v, and
+        # wrapped through the tunnel the same way, so the result is
+        # bit-identical to stepping update() n times.
+        pac = self.pac
+        if pac.alive:
+            pac.speed = self.row.pac_speed
+            vx, vy = DX[pac.dir] * pac.speed, DY[pac.dir] * pac.speed
+            for _ in range(n):
+                pac.x += vx
+                pac.y += vy
+                if pac.x < -8:
+                    pac.x += WIN_W
+                if pac.x > WIN_W + 8:
+                    pac.x -= WIN_W
+                pac.mouth_open += pac.mouth_speed
+                if pac.mouth_open > 1 or pac.mouth_open < 0:
+                    pac.mouth_speed *= -1
+            pac.update_grid_pos()
+
+        for g in self.ghosts:
+            if g.mode == Ghost.HOUSE:
+                cy = get_tile_center(0, 13)[1]
+                for _ in range(n):
+                    if g.y < cy - 4:
+                        g.dir = DOWN
+                    if g.y > cy + 4:
+                        g.dir = UP
+                    g.y += DY[g.dir] * 0.5
+            else:
+                if g.mode == Ghost.FRIGHT:
+                    g.scared_timer -= n
+                sg = g.speed_for(self.maze, self.dots_left, self.row)
+                vx, vy = DX[g.dir] * sg, DY[g.dir] * sg
+                for _ in range(n):
+                    g.x += vx
+                    g.y += vy
+                    if g.x < -8:
+                        g.x += WIN_W
+                    if g.x > WIN_W + 8:
+                        g.x -= WIN_W
+            g.update_grid_pos()
+
+    def fast_forward(self, limit):
+        """Run up to limit ticks, jumping straight over quiet stretches.
+
+        Equivalent to calling update() the same number of times. Returns the
+        number of ticks advanced (at least 1 if limit >= 1). Ghosts reach a
+        tile centre every tick of play, so in practice only the READY and
+        DEAD freezes are jumped; this is no faster than update().
+        """
+        if limit <= 0:
+            return 0
+        n = min(self.quiet_ticks(), limit - 1)
+        self.skip_quiet(n)
+        self.update()
+        return n + 1
+
+    def draw(self, surf=None, tick=None):
+        """Render the frame to surf (default: the window, then flip).
+
+        tick drives the power-pellet blink (default: self.ticks); a caller
+        drawing frames of its own numbering passes it.
+        """
+        target = screen if surf is None else surf
+        if tick is None:
+            tick = self.ticks
+        if self.layers is None:
+            self.layers = MazeLayers()
+
+        # Maze: background, walls and pellets in one blit
+        target.blit(self.layers.layer(self.maze, pellets_lit(tick)), (0, 0))
+
+        # Entities
+        self.pac.draw(target)
+        for g in self.ghosts:
+            g.draw(target, self.row.flash_frames)
+
+        # HUD
+        font = pygame.font.SysFont("monospace", 20, bold=True)
+        lbl_score = font.render(f"SCORE: {self.score}", True, WH)
+        lbl_level = font.render(f"LVL: {self.level}", True, YL)
+        target.blit(lbl_score, (10, 10))
+        target.blit(lbl_level, (350, 10))
+
+        for i in range(self.lives):
+            pygame.draw.circle(target, YL, (20 + i * 20, WIN_H - 15), 6)
+
+        if self.state == "READY":
+            lbl = font.render("READY!", True, YL)
+            target.blit(lbl, (WIN_W // 2 - 40, WIN_H // 2 + 25))
+        if self.state == "GAMEOVER":
+            lbl = font.render("GAME OVER", True, RED)
+            target.blit(lbl, (WIN_W // 2 - 60, WIN_H // 2 + 25))
+
+        if surf is None:
+            pygame.display.flip()
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+def set_turbo_caption(steps, caption=ARCADE.caption):
+    if steps == 1:
+        pygame.display.set_caption(caption)
+    elif steps == 0:
+        pygame.display.set_caption(f"{caption} [TURBO MAX]")
+    else:
+        pygame.display.set_caption(f"{caption} [TURBO x{steps}]")
+
+
+def run_ticks(game, steps):
+    """Advance the game by one drawn frame's worth of simulation.
+
+    Every tick except the last runs muted, so only the state that is
+    actually presented triggers audio. steps == 0 runs as many ticks as
+    fit into one frame of wall time.
+    """
+    if steps == 0:
+        deadline = pygame.time.get_ticks() + 1000 // FPS
+        game.muted = True
+        while pygame.time.get_ticks() < deadline:
+            game.update()
+        game.muted = False
+        game.update()
+        return
+
+    game.muted = True
+    for _ in range(steps - 1):
+        game.update()
+    game.muted = False
+    game.update()
+
+
+def main(profile=ARCADE):
+    # Seeded from random, so a harness that seeds it replays the game
+    game = Game(hard="--hard" in sys.argv, seed=random.getrandbits(32), profile=profile)
+    # A clock of this run's own: pacman_golden.py and pacman_diff.py swap
+    # pygame's Clock for a virtual one before starting a launcher
+    clock = pygame.time.Clock()
+    set_turbo_caption(1, profile.caption)
+    turbo_idx = 0
+    running = True
+
+    # --spectate PORT: stream every drawn frame to pacman_spectate.py viewers
+    spectators = None
+    if "--spectate" in sys.argv:
+        from pacman_spectate import SpectatorServer
+        port = int(sys.argv[sys.argv.index("--spectate") + 1])
+        spectators = SpectatorServer("0.0.0.0", port).start()
+
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_UP:
+                    game.pac.next_dir = UP
+                elif event.key == pygame.K_DOWN:
+                    game.pac.next_dir = DOWN
+                elif event.key == pygame.K_LEFT:
+                    game.pac.next_dir = LEFT
+                elif event.key == pygame.K_RIGHT:
+                    game.pac.next_dir = RIGHT
+                elif event.key == pygame.K_TAB:
+                    turbo_idx = (turbo_idx + 1) % len(TURBO_STEPS)
+                    set_turbo_caption(TURBO_STEPS[turbo_idx], profile.caption)
+                elif event.key == pygame.K_ESCAPE:
+                    running = False
+
+        steps = TURBO_STEPS[turbo_idx]
+        run_ticks(game, steps)
+        game.draw()
+        if spectators is not None:
+            spectators.publish(game)
+        # Unthrottled mode already spent its frame budget simulating
+        clock.tick(0 if steps == 0 else FPS)
+
+    if spectators is not None:
+        spectators.close()
+    pygame.quit()
+    sys.exit()
+
@@ -0,0 +1,87 @@
+"""Procedural Famicom-style sound effects (mono, 16-bit, 44.1 kHz)."""
+
+import math
+import random
+import struct
+
+RATE = 44100
+
+
+def _synth_wave(pygame, freq_start, freq_end, duration, vol, wave_type='square'):
+    n_samples = max(1, int(RATE * duration))
+    buf = bytearray()
+    phase_acc = 0.0
+    for i in range(n_samples):
+        t = i / n_samples
+        current_freq = freq_start * (1 - t) + freq_end * t
+        phase_add = current_freq / 44100.0
+        phase_acc += phase_add
+        phase_acc -= int(phase_acc)
+        env = 1.0 if t < 0.8 else (1.0 - (t - 0.8) * 5)
+        val = 0.0
+        if wave_type == 'square':
+            val = 1.0 if phase_acc < 0.5 else -1.0
+        elif wave_type == 'triangle':
+            val = 2.0 * abs(0.5 - phase_acc) - 1.0
+        elif wave_type == 'noise':
+            val = random.uniform(-1.0, 1.0)
+        sample = max(-32768, min(32767, int(val * vol * env * 32767)))
+        buf.extend(struct.pack('h', sample))
+    return pygame.mixer.Sound(buffer=buf)
+
+
+def _synth_siren(pygame):
+    n_samples = int(RATE * 0.3)
+    buf = bytearray()
+    phase_acc = 0.0
+    for i in range(n_samples):
+        f = 450 + 100 * math.sin(i / n_samples * math.pi * 2)
+        phase_acc += f / 44100.0
+        phase_acc -= int(phase_acc)
+        val = 2.0 * abs(0.5 - phase_acc) - 1.0
+        sample = max(-32768, min(32767, int(val * 0.08 * 32767)))
+        buf.extend(struct.pack('h', sample))
+    return pygame.mixer.Sound(buffer=buf)
+
+
+class Sounds:
+    """The game's effects and its two channels; every call is a no-op when
+    the mixer could not be opened."""
+
+    def __init__(self, pygame):
+        self.ok = False
+        try:
+            self.waka_1 = _synth_wave(pygame, 450, 300, 0.1, 0.1, 'triangle')
+            self.waka_2 = _synth_wave(pygame, 300, 450, 0.1, 0.1, 'triangle')
+            self.eat_ghost = _synth_wave(pygame, 800, 1600, 0.4, 0.2, 'square')
+            self.death = _synth_wave(pygame, 300, 50, 1.5, 0.3, 'noise')
+            self.power = _synth_wave(pygame, 600, 1000, 0.3, 0.15, 'square')
+            self.siren = _synth_siren(pygame)
+            self.ch_siren = pygame.mixer.Channel(0)
+            self.ch_waka = pygame.mixer.Channel(1)
+            self.ok = True
+        except Exception:
+            pass
+
+    def siren_start(self):
+        if self.ok:
+            self.ch_siren.play(self.siren, loops=-1)
+
+    def siren_pause(self):
+        if self.ok:
+            self.ch_siren.pause()
+
+    def siren_stop(self):
+        if self.ok:
+            self.ch_siren.stop()
+
+    def play(self, name):
+        if self.ok:
+            getattr(self, name).play()
+
+    def waka(self, toggle):
+        """Start the next waka unless one is still playing; True if started."""
+        if not self.ok or self.ch_waka.get_busy():
+            return False
+        self.ch_waka.play(self.waka_1 if toggle else self.waka_2)
+        return True
@@ -0,0 +1,82 @@
+"""Whole-grid tile sets as Python ints, for fast maze checks.
+
+Tile (c, r) is bit r * (cols + 1) + c; the extra column per row stays
+clear, so shifting by one moves a set sideways without bleeding into the
+next row. A flood fill, a neighbour count or a 2x2 search is then a few
+shifts and masks over the whole grid instead of a loop over tiles.
+"""
+
+
+class BitGrid:
+    """The shifts and masks for one grid size and set of tunnel rows."""
+
+    __slots__ = ('cols', 'nrows', 'stride', 'full', 'west', 'east', 'wrap')
+
+    def __init__(self, cols, nrows, tunnel_rows=()):
+        self.cols = cols
+        self.nrows = nrows
+        self.stride = s = cols + 1
+        row = (1 << cols) - 1
+        self.full = sum(row << (r * s) for r in range(nrows))
+        # The tunnel mouths: a move off one side enters the other
+        self.west = sum(1 << (r * s) for r in tunnel_rows)
+        self.east = self.west << (cols - 1)
+        self.wrap = cols - 1
+
+    def bit(self, c, r):
+        return 1 << (r * self.stride + c)
+
+    def pack(self, flags):
+        """Row-major truthy flags -> a set."""
+        cols, s = self.cols, self.stride
+        bits = 0
+        for i, flag in enumerate(flags):
+            if flag:
+                r, c = divmod(i, cols)
+                bits |= 1 << (r * s + c)
+        return bits
+
+    def tiles(self, bits):
+        """A set's (c, r) tiles, row-major."""
+        out = []
+        s = self.stride
+        while bits:
+            low = bits & -bits
+            r, c = divmod(low.bit_length() - 1, s)
+            out.append((c, r))
+            bits ^= low
+        return out
+
+    def spread(self, bits):
+        """Every tile next to a tile of bits (tunnels included)."""
+        s, w = self.stride, self.wrap
+        out = (bits << 1) | (bits >> 1) | (bits << s) | (bits >> s)
+        out |= ((bits & self.west) << w) | ((bits & self.east) >> w)
+        return out & self.full
+
+    def flood(self, seed, open_bits):
+        """The tiles of open_bits reachable from seed."""
+        reach = seed & open_bits
+        while True:
+            grown = (reach | self.spread(reach)) & open_bits
+            if grown == reach:
+                return reach
+            reach = grown
+
+    def dead_ends(self, open_bits):
+        """Open tiles with fewer than two open neighbours."""
+        s, w = self.stride, self.wrap
+        # Each set marks the tiles whose neighbour on that side is open
+        east = (open_bits >> 1) | ((open_bits & self.west) << w)
+        west = (open_bits << 1) | ((open_bits & self.east) >> w)
+        south = open_bits >> s
+        north = open_bits << s
+        two = ((east & (west | south | north)) | (west & (south | north))
+               | (south & north))
+        return open_bits & ~two & self.full
+
+    def squares(self, open_bits):
+        """Top-left tiles of 2x2 open blocks (corridors are one tile wide)."""
+        s = self.stride
+        pairs = open_bits & (open_bits >> 1)
+        return pairs & (pairs >> s) & self.full
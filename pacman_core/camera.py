@@ -0,0 +1,140 @@
+"""Views of the maze: the whole of it, or a camera over one too big to show.
+
+A game surface shows a maze through a view. Both kinds keep the maze
+pre-drawn twice, walls and pellets with the power pellets lit and dark,
+so the blink is a choice of layer and a frame draws no pellets at all; an
+eaten pellet is erased from both. FullView is one such pair at game size.
+Camera is for a maze bigger than the surface (a 200x200 maze's wall layer
+alone would be over 40 MB): it follows Pac-Man, clamped at the maze's
+edges, and draws from CHUNK x CHUNK tile pairs rendered the first time
+they scroll into view and kept in a small cache. Actors it cannot see
+are not drawn, so a frame costs the same whatever the maze's size.
+
+Both map maze pixels to surface pixels by subtracting (x, y).
+"""
+
+from pacman_core.maze import BG, DOT_C, render_walls
+
+CHUNK = 16              # tiles per chunk side
+CACHE_CHUNKS = 24       # rendered chunks kept; a 28x31-tile view touches 9 at most
+MARGIN = 16             # how far off the view an actor is still drawn (it overhangs its tile)
+
+
+def _pellets(pygame, dark, dots, powers, dx=0, dy=0):
+    """Draw dots on dark; return a copy with the power pellets lit too."""
+    for d in dots:
+        pygame.draw.rect(dark, DOT_C, d.move(dx, dy))
+    lit = dark.copy()
+    for p in powers:
+        pygame.draw.circle(lit, DOT_C, (p.centerx + dx, p.centery + dy), 6)
+    return lit
+
+
+def _erase(surf, rect):
+    # The power pellet's circle reaches a pixel past its rect, never a wall
+    surf.fill(BG, rect.inflate(2, 2))
+
+
+class FullView:
+    """The whole maze at once, from game-sized layers."""
+
+    __slots__ = ('pygame', 'walls', 'lit', 'dark', 'x', 'y')
+
+    def __init__(self, pygame, walls):
+        self.pygame = pygame
+        self.walls = walls
+        self.lit = self.dark = walls
+        self.x = self.y = 0
+
+    def reset(self, dots, powers):
+        """Draw a level's pellets."""
+        self.dark = self.walls.copy()
+        self.lit = _pellets(self.pygame, self.dark, dots, powers)
+
+    def eat(self, rect):
+        _erase(self.lit, rect)
+        _erase(self.dark, rect)
+
+    def draw(self, surf, pac, lit):
+        surf.blit(self.lit if lit else self.dark, (0, 0))
+
+    def sees(self, actor):
+        return True
+
+
+class Camera:
+    """A window of the game surface's size onto a bigger maze."""
+
+    __slots__ = ('pygame', 'maze', 'w', 'h', 'area', 'x', 'y', 'chunks', 'dots', 'powers')
+
+    def __init__(self, pygame, maze, size):
+        self.pygame = pygame
+        self.maze = maze
+        self.w, self.h = size
+        # The maze part of the surface, between the HUD bands
+        self.area = pygame.Rect(0, maze.top_pad, self.w, self.h - maze.top_pad - maze.bottom_pad)
+        self.x = self.y = 0
+        self.chunks = {}
+        self.dots = self.powers = []
+
+    def reset(self, dots, powers):
+        """Show a level's pellets, the lists the game eats from."""
+        self.dots, self.powers = dots, powers
+        self.chunks.clear()
+
+    def eat(self, rect):
+        size = CHUNK * self.maze.tile
+        pair = self.chunks.get((rect.x // size, (rect.y - self.maze.top_pad) // size))
+        if pair is not None:
+            x, y, lit, dark = pair
+            for surf in (lit, dark):
+                _erase(surf, rect.move(-x, -y))
+
+    def follow(self, x, y):
+        """Centre on maze pixel (x, y) without showing past the edges."""
+        m, area = self.maze, self.area
+        self.x = max(0, min(int(x) - area.w // 2, m.width - area.w))
+        self.y = max(0, min(int(y) - area.centery, m.nrows * m.tile - area.h))
+
+    def draw(self, surf, pac, lit):
+        """Follow Pac-Man and draw the maze in view."""
+        self.follow(pac.x, pac.y)
+        m, size = self.maze, CHUNK * self.maze.tile
+        surf.fill(BG)
+        surf.set_clip(self.area)
+        x0, y0 = self.x, self.y
+        x1 = min(x0 + self.area.w, m.width) - 1
+        y1 = min(y0 + self.area.h, m.nrows * m.tile) - 1
+        for cy in range(y0 // size, y1 // size + 1):
+            for cx in range(x0 // size, x1 // size + 1):
+                x, y, lit_layer, dark_layer = self._chunk(cx, cy)
+                surf.blit(lit_layer if lit else dark_layer, (x - x0, y - y0))
+        surf.set_clip(None)
+
+    def sees(self, actor):
+        x, y = actor.x - self.x, actor.y - self.y
+        area = self.area
+        return (area.left - MARGIN <= x < area.right + MARGIN
+                and area.top - MARGIN <= y < area.bottom + MARGIN)
+
+    def _chunk(self, cx, cy):
+        """(x, y, lit, dark) of chunk (cx, cy), x and y in maze pixels; the
+        least recently used is dropped."""
+        key = (cx, cy)
+        pair = self.chunks.pop(key, None)
+        if pair is None:
+            pygame, m = self.pygame, self.maze
+            c0, r0 = cx * CHUNK, cy * CHUNK
+            c1, r1 = min(c0 + CHUNK, m.cols), min(r0 + CHUNK, m.nrows)
+            cells = b"".join(m.cells[r * m.cols + c0:r * m.cols + c1] for r in range(r0, r1))
+            dark = render_walls(pygame, cells, c1 - c0, r1 - r0, (m.tile, 0, 0))
+            x, y = c0 * m.tile, r0 * m.tile + m.top_pad
+            bounds = pygame.Rect(x, y, dark.get_width(), dark.get_height())
+            dots = [self.dots[i] for i in bounds.collidelistall(self.dots)]
+            powers = [self.powers[i] for i in bounds.collidelistall(self.powers)]
+            lit = _pellets(pygame, dark, dots, powers, -x, -y)
+            pair = (x, y, lit, dark)
+            if len(self.chunks) >= CACHE_CHUNKS:
+                del self.chunks[next(iter(self.chunks))]
+        self.chunks[key] = pair
+        return pair
@@ -0,0 +1,128 @@
+"""
+Player input for the run_game() editions: Pac-Man's turn request, from the
+key press to the frame that shows it.
+
+A press becomes the request, stamped with the event's own timestamp
+when it carries one (pacman_latency.py posts presses that do). pygame's
+KEYDOWN events carry none, so a real press is stamped when it is read,
+not when the key went down. The request is held
+through freezes (READY!, a death, an eaten ghost) and through Pac-Man's
+reset after a death, and is handed to him as next_dir before every move
+until he takes it, or until it lapses after the profile's pre_turn frames
+of play. A turn near a tile centre can be taken within the profile's
+corner_px, before or after it (see Pacman.update).
+
+Events are read once per frame, right after the frame's sleep and before
+the update, so the latest the frame can, and every millisecond through the
+READY! and level-clear pauses (Edition.hold). Every press is timed from
+its stamp to being read (time in the queue; always 0 for real presses),
+from being read to the flip of the first frame simulated after it (the
+loop's own latency), and, once taken, from its stamp to the flip of the
+frame in which Pac-Man turned (what the player sees; for a real press,
+from when it was read). pacman_latency.py reports all three.
+"""
+
+from collections import deque
+
+import pygame
+
+SAMPLES = 4096          # latency samples kept per measure, the most recent
+
+_KEY_DIRS = ((pygame.K_LEFT, (-1, 0)), (pygame.K_a, (-1, 0)),
+             (pygame.K_RIGHT, (1, 0)), (pygame.K_d, (1, 0)),
+             (pygame.K_UP, (0, -1)), (pygame.K_w, (0, -1)),
+             (pygame.K_DOWN, (0, 1)), (pygame.K_s, (0, 1)))
+KEY_DIRS = dict(_KEY_DIRS)
+
+
+class Latency:
+    """Latency samples in ms: the last SAMPLES of them, and how many in all."""
+
+    __slots__ = ('samples', 'count')
+
+    def __init__(self, keep=SAMPLES):
+        self.samples = deque(maxlen=keep)
+        self.count = 0
+
+    def add(self, ms):
+        self.samples.append(ms)
+        self.count += 1
+
+    def summary(self):
+        """'n=… median … p95 … max … ms' over the samples kept, or 'no samples'."""
+        s = sorted(self.samples)
+        if not s:
+            return "no samples"
+        pick = lambda q: s[min(len(s) - 1, int(q * len(s)))]
+        kept = f" (last {len(s)})" if len(s) < self.count else ""
+        return f"n={self.count}{kept}  median {pick(0.5)}  p95 {pick(0.95)}  max {s[-1]} ms"
+
+
+class Controls:
+    """Pac-Man's pending turn and the latency of the presses behind it."""
+
+    __slots__ = ('pre_turn', 'request', 'unshown', 'turned', 'lapsed',
+                 'queue', 'display', 'turn')
+
+    def __init__(self, pre_turn=None):
+        # Frames of play a request is held for; None holds it until taken
+        self.pre_turn = pre_turn
+        self.request = None         # [dir, stamp ms, frames of play held]
+        self.unshown = []           # read times of presses, until the next flip
+        self.turned = None          # stamp of the request taken this frame
+        self.lapsed = 0
+        self.queue = Latency()      # stamp -> read
+        self.display = Latency()    # read -> flip of the next frame
+        self.turn = Latency()       # stamp -> flip of the frame Pac-Man turned in
+
+    def clear(self):
+        """Forget the pending request (a new game); the samples stay."""
+        self.request = None
+        self.unshown = []
+        self.turned = None
+
+    def press(self, ev):
+        """A KEYDOWN event; whether it was a direction. Stamped with
+        ev.timestamp if it has one, else now."""
+        d = KEY_DIRS.get(ev.key)
+        if d is None:
+            return False
+        now = pygame.time.get_ticks()
+        stamp = getattr(ev, "timestamp", None)
+        if stamp is None:
+            stamp = now
+        self.request = [d, stamp, 0]
+        self.queue.add(now - stamp)
+        self.unshown.append(now)
+        return True
+
+    def steer(self, pac):
+        """Hand the request to Pac-Man before he moves."""
+        req = self.request
+        if req is None:
+            return
+        req[2] += 1
+        if self.pre_turn is not None and req[2] > self.pre_turn:
+            if pac.next_dir == req[0]:
+                pac.next_dir = (0, 0)
+            self.request = None
+            self.lapsed += 1
+            return
+        pac.next_dir = req[0]
+
+    def moved(self, pac):
+        """After Pac-Man moves: the request is done once he heads its way."""
+        req = self.request
+        if req is not None and pac.dir == req[0]:
+            self.turned = req[1]
+            self.request = None
+
+    def flipped(self):
+        """Call right after the frame is on screen."""
+        now = pygame.time.get_ticks()
+        for read in self.unshown:
+            self.display.add(now - read)
+        self.unshown = []
+        if self.turned is not None:
+            self.turn.add(now - self.turned)
+            self.turned = None
@@ -0,0 +1,503 @@
+"""One playable edition: a profile's window, HUD, menus and game loop."""
+
+import sys
+import time
+import random
+
+import pygame
+
+from pacman_scores import ScoreStore
+from pacman_core import mazefile, mazegen
+from pacman_core.audio import Sounds
+from pacman_core.camera import FullView, Camera
+from pacman_core.controls import Controls
+from pacman_core.entities import Pacman, Ghost, BG, W, PAC_C, G_ORANGE
+
+HINT_C = (150, 150, 150)
+
+READY_FRAMES = 120      # frozen after READY! and after a life is lost
+DEATH_FRAMES = 90       # length of the death animation
+EAT_GHOST_FRAMES = 45   # pause after a ghost is eaten
+BLINK_MS = 200          # power pellets lit this long, then dark as long
+POLL_MS = 1             # how often the READY! and level-clear pauses read input
+
+HELP_TEXT = ("Eat all dots to clear the level.\n"
+             "Avoid ghosts unless powered up.\n"
+             "Eat power pellets to turn the tables!\n"
+             "Get ready for authentic ghost AI.")
+CONTROLS_TEXT = ("Arrow keys / WASD: Move Pac-Man\n"
+                 "Enter/Space: Select menu option\n"
+                 "Pause: not implemented")
+MENU_OPTIONS = ("Play Game", "About", "Help", "Controls", "Copyright", "Exit")
+
+
+class Play:
+    """The game in progress as of the last flip, for tools that check or
+    trace it (pacman_fuzz.py, pacman_diff.py): the level's maze, Pac-Man,
+    the ghosts, the pellets left and how many were eaten this level."""
+
+    __slots__ = ('maze', 'pac', 'ghosts', 'dots', 'powers', 'dots_eaten')
+
+    def __init__(self, maze, pac, ghosts, dots, powers):
+        self.maze = maze
+        self.pac = pac
+        self.ghosts = ghosts
+        self.dots = dots
+        self.powers = powers
+        self.dots_eaten = 0
+
+
+class Edition:
+    """Opens the window for a profile and runs its menu and games.
+
+    The game is drawn on a game-sized surface: the screen itself for an
+    unscaled edition, else an off-screen Surface scaled to the window each
+    frame with the HUD drawn over it at window resolution. It shows the
+    maze through a view (see camera.py): the whole maze, or a camera over
+    one bigger than the profile's view.
+    """
+
+    def __init__(self, profile):
+        self.profile = profile
+        self.maze = mazefile.load(profile.maze, (profile.tile, profile.top_pad, profile.bottom_pad))
+        self.fps = profile.fps
+        if profile.view:
+            cols, rows = profile.view
+            self.view_w = cols * profile.tile
+            self.view_h = rows * profile.tile + profile.top_pad + profile.bottom_pad
+        else:
+            self.view_w, self.view_h = self.maze.width, self.maze.height
+
+        pygame.mixer.pre_init(44100, -16, 1, 512)
+        pygame.init()
+        pygame.display.set_caption(profile.caption)
+        self.sounds = Sounds(pygame)
+
+        self.scaled = profile.window is not None
+        self.win_w, self.win_h = profile.window or (self.view_w, self.view_h)
+        self.screen = pygame.display.set_mode((self.win_w, self.win_h))
+        self.clock = pygame.time.Clock()
+        # Turn requests, and the input latency of every game played
+        self.controls = Controls(profile.pre_turn)
+        self.game_surf = pygame.Surface((self.view_w, self.view_h)) if self.scaled else self.screen
+        self.use_maze(self.maze)
+
+        sys_font = pygame.font.SysFont
+        self.fonts = {
+            "large": sys_font('courier', 36, bold=True),
+            "med": sys_font('courier', 24, bold=True),
+            "sys": sys_font('courier', 20, bold=True),
+            "small": sys_font('courier', 14, bold=True),
+            "hud": sys_font('courier', 16, bold=True),
+            "ready": sys_font('courier', 18, bold=True),
+            "attract": sys_font('courier', 42, bold=True),
+        }
+        # High scores: cached in memory, written to SQLite off the frame path
+        self.scores = ScoreStore(variant=profile.score_variant)
+        self.play = None            # the game in progress (Play), if any
+
+        self.draw_hud = getattr(self, "_hud_" + profile.hud)
+        self.draw_ready = getattr(self, "_ready_" + profile.hud)
+
+    # ── HUD ───────────────────────────────────────────────────────────────────
+    # Each style draws on the screen after the game surface has been put
+    # there; READY! is drawn over the first frame of each life.
+    def _hud_native(self, pac):
+        screen, fnt = self.screen, self.fonts["sys"]
+        screen.blit(fnt.render("1UP", True, W), (30, 5))
+        screen.blit(fnt.render(str(pac.score), True, W), (30, 25))
+        screen.blit(fnt.render("HIGH SCORE", True, W), (self.win_w // 2 - 50, 5))
+        screen.blit(fnt.render(str(max(self.scores.high(), pac.score)), True, W),
+                    (self.win_w // 2 - 20, 25))
+        for i in range(pac.lives):
+            px, py = 30 + i * 32, self.win_h - 16
+            pygame.draw.circle(screen, PAC_C, (px, py), 10)
+            pygame.draw.polygon(screen, BG, [(px, py), (px - 12, py + 8), (px - 12, py - 8)])
+
+    def _ready_at(self):
+        """Where READY! goes on the game surface: centred under the house."""
+        maze, view = self.maze, self.view
+        hx, hy = maze.house_door
+        return (hx + 0.5) * maze.tile - view.x, (hy + 6) * maze.tile + maze.top_pad - view.y
+
+    def _ready_native(self, pac):
+        x, y = self._ready_at()
+        rd = self.fonts["sys"].render("READY!", True, PAC_C)
+        self.screen.blit(rd, (int(x) - rd.get_width() // 2, int(y) + 4))
+
+    def _hud_scaled(self, pac):
+        """Score panel and lives, crisp at window resolution."""
+        screen, fnt, mid = self.screen, self.fonts["sys"], self.win_w // 2
+        screen.blit(fnt.render("1UP", True, W), (8, 4))
+        screen.blit(fnt.render(str(pac.score), True, W), (8, 22))
+        hs = fnt.render("HIGH SCORE", True, W)
+        screen.blit(hs, (mid - hs.get_width() // 2, 4))
+        hs_val = fnt.render(str(max(self.scores.high(), pac.score)), True, W)
+        screen.blit(hs_val, (mid - hs_val.get_width() // 2, 22))
+        for i in range(pac.lives):
+            px, py = 18 + i * 26, self.win_h - 12
+            pygame.draw.circle(screen, PAC_C, (px, py), 9)
+            pygame.draw.polygon(screen, BG, [(px, py), (px - 11, py + 7), (px - 11, py - 7)])
+
+    def _ready_scaled(self, pac):
+        self._hud_scaled(pac)
+        # The row under the house, mapped to window y
+        game_y = self._ready_at()[1] + self.maze.tile // 2
+        screen_y = int(game_y * (self.win_h / self.view_h)) - 10
+        rd = self.fonts["sys"].render("READY!", True, PAC_C)
+        self.screen.blit(rd, (self.win_w // 2 - rd.get_width() // 2, screen_y))
+
+    def _hud_banner(self, pac):
+        """1UP and score left, title and high score centred, lives below."""
+        screen, fnt, mid = self.screen, self.fonts["hud"], self.win_w // 2
+        screen.blit(fnt.render("1UP", True, W), (20, 2))
+        screen.blit(fnt.render(str(pac.score), True, W), (20, 17))
+        title = fnt.render("AC HOLDINGS", True, W)
+        screen.blit(title, (mid - title.get_width() // 2, 2))
+        hs = fnt.render(str(max(self.scores.high(), pac.score)), True, W)
+        screen.blit(hs, (mid - hs.get_width() // 2, 17))
+        life_y = self.win_h - 12
+        for i in range(pac.lives):
+            px = 24 + i * 24
+            pygame.draw.circle(screen, PAC_C, (px, life_y), 8)
+            pygame.draw.polygon(screen, BG, [(px, life_y), (px - 10, life_y + 6), (px - 10, life_y - 6)])
+
+    def _ready_banner(self, pac):
+        self._hud_banner(pac)
+        x, y = self._ready_at()
+        sx = int(x * (self.win_w / self.view_w))
+        sy = int((y + 4) * (self.win_h / self.view_h))
+        rd = self.fonts["ready"].render("READY!", True, PAC_C)
+        self.screen.blit(rd, (sx - rd.get_width() // 2, sy))
+
+    def next_maze(self):
+        """Endless mode: a new generated maze, drawn and ready to play.
+
+        Its generator is seeded from the global random module, so a seeded
+        run gets the same mazes.
+        """
+        p = self.profile
+        rng = random.Random(random.getrandbits(64))
+        self.use_maze(mazegen.generate_maze((p.tile, p.top_pad, p.bottom_pad), rng,
+                                            size=p.maze_size))
+
+    def use_maze(self, maze):
+        """Play on maze from the next level, through a camera if it is
+        bigger than the game surface."""
+        self.maze = maze
+        if maze.width <= self.view_w and maze.height <= self.view_h:
+            self.view = FullView(pygame, maze.surface(pygame))
+        else:
+            self.view = Camera(pygame, maze, (self.view_w, self.view_h))
+
+    def pellets_lit(self, tick):
+        """The power pellets' blink phase on frame tick."""
+        return (tick * 1000 // self.fps // BLINK_MS) % 2 == 1
+
+    def hold(self, ms):
+        """Wait ms with the screen as it is, still taking key presses.
+
+        The input is read every POLL_MS, so a press made during the pause
+        is stamped within a millisecond of its arrival instead of waiting
+        in the queue for the first frame after it.
+        """
+        end = pygame.time.get_ticks() + ms
+        while True:
+            for ev in pygame.event.get():
+                if ev.type == pygame.QUIT:
+                    pygame.quit(); sys.exit()
+                if ev.type == pygame.KEYDOWN:
+                    self.controls.press(ev)
+            left = end - pygame.time.get_ticks()
+            if left <= 0:
+                return
+            pygame.time.wait(min(left, POLL_MS))
+
+    def present(self):
+        """Put the game surface on the screen (scaled editions only)."""
+        if self.scaled:
+            self.screen.blit(pygame.transform.scale(self.game_surf, (self.win_w, self.win_h)), (0, 0))
+
+    # ── Game Loop ─────────────────────────────────────────────────────────────
+    def run_game(self):
+        """One game from three lives to game over; the score is submitted."""
+        rules, sounds = self.profile, self.sounds
+        surf = self.game_surf
+        waves = rules.waves
+        eat = rules.eat_radius
+        hit = rules.hit_radius
+        if rules.endless:
+            self.next_maze()
+        pac = Pacman(rules, self.maze)
+        controls = self.controls
+        controls.clear()
+        # The animation clock: frames since the game started. Everything
+        # that animates runs off it or off the game state, never wall time
+        tick = 0
+
+        while pac.lives > 0:
+            maze = self.maze
+            dots, powers = maze.pellets(pygame)
+            ghosts = [Ghost(i, rules, maze) for i in range(4)]
+            view = self.view
+            view.reset(dots, powers)
+
+            wave_idx = 0
+            global_state, wave_timer = waves[wave_idx][1], waves[wave_idx][0]
+
+            fright_timer = 0
+            combo = 200
+            dots_eaten = 0
+            waka_toggle = False
+            freeze_frames = READY_FRAMES
+            pending_reset = False
+            self.play = play = Play(maze, pac, ghosts, dots, powers)
+
+            # Ready screen
+            view.draw(surf, pac, self.pellets_lit(tick))
+            origin = (view.x, view.y)
+            pac.draw(surf, None, origin)
+            for g in ghosts:
+                if view.sees(g):
+                    g.draw(surf, 0, origin)
+            self.present()
+            self.draw_ready(pac)
+            pygame.display.flip()
+            self.hold(2000)
+
+            sounds.siren_start()
+
+            running = True
+            while running:
+                self.clock.tick(self.fps)
+                tick += 1
+
+                # Read as late as the frame allows: after its sleep, right
+                # before the update. Presses during a freeze are kept
+                for ev in pygame.event.get():
+                    if ev.type == pygame.QUIT:
+                        pygame.quit(); sys.exit()
+                    if ev.type == pygame.KEYDOWN:
+                        controls.press(ev)
+
+                if freeze_frames > 0:
+                    freeze_frames -= 1
+                    if freeze_frames == 0 and pending_reset:
+                        if pac.lives <= 0:
+                            self.scores.submit(pac.score)   # game over
+                            self.play = None
+                            return
+                        pac.reset()
+                        for g in ghosts:
+                            g.reset()
+                        freeze_frames = READY_FRAMES
+                        pending_reset = False
+                else:
+                    if fright_timer > 0:
+                        fright_timer -= 1
+                        if fright_timer == 0:
+                            sounds.siren_start()
+                            for g in ghosts:
+                                if g.state == 'frightened':
+                                    g.state = global_state
+                    else:
+                        wave_timer -= 1
+                        if wave_timer <= 0:
+                            wave_idx += 1
+                            global_state, wave_timer = waves[wave_idx][1], waves[wave_idx][0]
+                            for g in ghosts:
+                                if g.state in ('scatter', 'chase'):
+                                    g.state = global_state
+                                    # Reverse on every mode switch
+                                    if g.dir != (0, 0) and not g.in_house:
+                                        g.dir = (-g.dir[0], -g.dir[1])
+
+                    controls.steer(pac)
+                    pac.update(fright_timer > 0)
+                    controls.moved(pac)
+                    p_rect = pygame.Rect(pac.x - eat, pac.y - eat, 2 * eat, 2 * eat)
+                    eaten_this_frame = False
+
+                    # Hit tests in C; deleting from the back keeps the
+                    # remaining pellets in their original order
+                    hits = p_rect.collidelistall(dots)
+                    if hits:
+                        for i in reversed(hits):
+                            view.eat(dots[i])
+                            del dots[i]
+                        pac.score += 10 * len(hits)
+                        dots_eaten += len(hits)
+                        pac.freeze_frames = 1       # 1-frame pause: the waka rhythm
+                        eaten_this_frame = True
+
+                    hits = p_rect.collidelistall(powers)
+                    if hits:
+                        for i in reversed(hits):
+                            view.eat(powers[i])
+                            del powers[i]
+                        pac.score += 50 * len(hits)
+                        dots_eaten += len(hits)
+                        pac.freeze_frames = 3
+                        eaten_this_frame = True
+                        fright_timer = rules.fright_frames
+                        combo = 200
+                        sounds.play("power")
+                        sounds.siren_pause()
+                        for g in ghosts:
+                            if g.state in ('scatter', 'chase') and not g.in_house:
+                                g.state = 'frightened'
+                                g.dir = (-g.dir[0], -g.dir[1])
+
+                    if eaten_this_frame and sounds.waka(waka_toggle):
+                        waka_toggle = not waka_toggle
+
+                    for g in ghosts:
+                        g.update(pac, ghosts[0], global_state, dots_eaten)
+                        if abs(pac.x - g.x) < hit and abs(pac.y - g.y) < hit:
+                            if g.state in ('scatter', 'chase'):
+                                sounds.siren_stop()
+                                sounds.play("death")
+                                freeze_frames = DEATH_FRAMES
+                                pac.lives -= 1
+                                pending_reset = True
+                            elif g.state == 'frightened':
+                                g.state = 'eaten'
+                                pac.score += combo; combo *= 2
+                                sounds.play("eat_ghost")
+                                freeze_frames = EAT_GHOST_FRAMES
+
+                    if not dots and not powers and not pending_reset:
+                        sounds.siren_stop()
+                        pause = 1500
+                        if rules.endless:
+                            # Built inside the level-clear pause, not added to it
+                            started = time.perf_counter()
+                            self.next_maze()
+                            pac.maze = self.maze
+                            pac.reset()
+                            pause -= int((time.perf_counter() - started) * 1000)
+                        self.hold(pause)
+                        running = False         # level cleared
+
+                # Walls and pellets are one pre-drawn layer per blink
+                # phase; of the actors only those in view are drawn
+                view.draw(surf, pac, self.pellets_lit(tick))
+                origin = (view.x, view.y)
+
+                if pending_reset and freeze_frames > 0:
+                    pac.draw(surf, (DEATH_FRAMES - freeze_frames) / float(DEATH_FRAMES), origin)
+                else:
+                    pac.draw(surf, None, origin)
+                    for g in ghosts:
+                        if view.sees(g):
+                            g.draw(surf, fright_timer, origin)
+
+                self.present()
+                self.draw_hud(pac)
+                play.dots_eaten = dots_eaten
+                pygame.display.flip()
+                controls.flipped()
+
+    # ── Menus ─────────────────────────────────────────────────────────────────
+    def main(self):
+        if self.profile.menu == "attract":
+            self.attract()
+        else:
+            self.show_menu()
+
+    def attract(self):
+        """Blinking title screen; Enter or Space starts a game."""
+        screen, fnt, mid = self.screen, self.fonts["sys"], self.win_w // 2
+        tick = 0
+        while True:
+            self.clock.tick(self.fps)
+            tick += 1
+
+            for ev in pygame.event.get():
+                if ev.type == pygame.QUIT:
+                    pygame.quit(); sys.exit()
+                if ev.type == pygame.KEYDOWN and ev.key in (pygame.K_RETURN, pygame.K_SPACE):
+                    self.run_game()
+
+            screen.fill(BG)
+            c = PAC_C if (tick // 10) % 2 == 0 else G_ORANGE
+            txt = self.fonts["attract"].render("PAC-MAN 1980", True, c)
+            screen.blit(txt, (mid - txt.get_width() // 2, 100))
+            txt2 = fnt.render("EXACT FAMICOM 60 FPS EDITION", True, W)
+            screen.blit(txt2, (mid - txt2.get_width() // 2, 160))
+            if (tick // 30) % 2:
+                txt3 = fnt.render("PUSH SPACE TO START", True, PAC_C)
+                screen.blit(txt3, (mid - txt3.get_width() // 2, self.win_h // 2 + 50))
+            pygame.display.flip()
+
+    def show_menu(self):
+        """Option list (UP/DOWN, Enter) with the profile's title lines."""
+        p = self.profile
+        screen, fnt, mid = self.screen, self.fonts["sys"], self.win_w // 2
+        screens = {"About": p.about, "Help": HELP_TEXT, "Controls": CONTROLS_TEXT,
+                   "Copyright": p.copyright}
+        selected = 0
+        tick = 0
+        while True:
+            self.clock.tick(self.fps)
+            tick += 1
+
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit(); sys.exit()
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_UP:
+                        selected = (selected - 1) % len(MENU_OPTIONS)
+                    elif event.key == pygame.K_DOWN:
+                        selected = (selected + 1) % len(MENU_OPTIONS)
+                    elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
+                        option = MENU_OPTIONS[selected]
+                        if option == "Play Game":
+                            self.run_game()
+                        elif option == "Exit":
+                            pygame.quit(); sys.exit()
+                        else:
+                            self.show_info_screen(option, screens[option])
+
+            screen.fill(BG)
+            for font, text, y, lit in p.menu_title:
+                line = self.fonts[font].render(text, True, PAC_C if lit else W)
+                screen.blit(line, (mid - line.get_width() // 2, y))
+            for i, opt in enumerate(MENU_OPTIONS):
+                color = PAC_C if i == selected else W
+                if i == selected and (tick // 30) % 2:
+                    color = G_ORANGE    # blinking cursor
+                text = fnt.render(opt, True, color)
+                screen.blit(text, (mid - text.get_width() // 2, 200 + i * 30))
+            hint_text, hint_y = p.menu_hint
+            hint = self.fonts["small"].render(hint_text, True, HINT_C)
+            screen.blit(hint, (mid - hint.get_width() // 2, self.win_h - hint_y))
+            pygame.display.flip()
+
+    def show_info_screen(self, title, content_lines):
+        """Title and centred text lines until any key is pressed."""
+        title_y, y, step, gap, hint_text, hint_y = self.profile.info_layout
+        screen, mid = self.screen, self.win_w // 2
+        waiting = True
+        while waiting:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit(); sys.exit()
+                if event.type == pygame.KEYDOWN:
+                    waiting = False
+
+            screen.fill(BG)
+            t_surf = self.fonts["med"].render(title, True, PAC_C)
+            screen.blit(t_surf, (mid - t_surf.get_width() // 2, title_y))
+            line_y = y
+            for line in content_lines.split('\n'):
+                if line.strip():
+                    line_surf = self.fonts["sys"].render(line, True, W)
+                    screen.blit(line_surf, (mid - line_surf.get_width() // 2, line_y))
+                    line_y += step
+                else:
+                    line_y += gap
+            hint = self.fonts["small"].render(hint_text, True, HINT_C)
+            screen.blit(hint, (mid - hint.get_width() // 2, self.win_h - hint_y))
+            pygame.display.flip()
+            pygame.time.wait(100)       # small delay against key repeat
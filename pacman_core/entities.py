@@ -0,0 +1,319 @@
+"""Pac-Man and the ghosts, moved and drawn by a profile's rules."""
+
+import math
+import random
+
+import pygame
+
+from pacman_core.maze import DIRS
+
+BG = (0, 0, 0)
+W = (255, 255, 255)
+PAC_C = (255, 255, 0)
+FACE_C = (255, 184, 174)
+PUPIL_C = (0, 0, 255)
+
+G_RED = (255, 0, 0)
+G_PINK = (255, 184, 255)
+G_CYAN = (0, 255, 255)
+G_ORANGE = (255, 184, 82)
+G_BLUE = (33, 33, 255)
+GHOST_COLORS = (G_RED, G_PINK, G_CYAN, G_ORANGE)
+
+# Arcade tie-break order at intersections: up, left, down, right
+TURN_ORDER = DIRS
+
+
+def _passed(d, old_x, old_y, x, y, cx, cy):
+    """Whether a move along d from (old_x, old_y) to (x, y) crossed the
+    tile centre (cx, cy)."""
+    if d[0] > 0:
+        return old_x <= cx < x
+    if d[0] < 0:
+        return old_x >= cx > x
+    if d[1] > 0:
+        return old_y <= cy < y
+    if d[1] < 0:
+        return old_y >= cy > y
+    return False
+
+
+class Pacman:
+    def __init__(self, rules, maze):
+        self.rules = rules
+        self.maze = maze
+        self.score = 0
+        self.lives = 3
+        self.reset()
+
+    def reset(self):
+        t = self.maze.tile
+        self.col, self.row = self.maze.pac_start
+        self.x = self.col * t + t / 2.0
+        self.y = self.row * t + self.maze.top_pad + t / 2.0
+        self.dir = (-1, 0)
+        self.next_dir = (-1, 0)
+        self.speed = self.rules.pac_speed
+        self.anim_frame = 0
+        self.freeze_frames = 0
+
+    def update(self, is_frightened):
+        if self.freeze_frames > 0:
+            self.freeze_frames -= 1
+            return
+        maze = self.maze
+        is_wall = maze.is_wall
+        t = maze.tile
+        self.speed = self.rules.pac_fright_speed if is_frightened else self.rules.pac_speed
+        old_x, old_y = self.x, self.y
+
+        # Famicom instant reverse
+        if self.next_dir == (-self.dir[0], -self.dir[1]) and self.dir != (0, 0):
+            self.dir = self.next_dir
+            self.next_dir = (0, 0)
+
+        # Cornering: a turn asked for within corner_px of the tile centre,
+        # before or after it, is taken from the centre now
+        nd = self.next_dir
+        corner = self.rules.corner_px
+        if corner and nd != (0, 0) and nd != self.dir and self.dir != (0, 0):
+            cx = self.col * t + t / 2.0
+            cy = self.row * t + maze.top_pad + t / 2.0
+            if abs(self.x - cx) + abs(self.y - cy) <= corner and not is_wall(self.col + nd[0], self.row + nd[1]):
+                self.x, self.y = old_x, old_y = cx, cy
+                self.dir = nd
+                self.next_dir = (0, 0)
+
+        self.x += self.dir[0] * self.speed
+        self.y += self.dir[1] * self.speed
+        self.anim_frame += self.speed
+
+        # Tunnel wrap
+        if self.x < -8: self.x = maze.width + 8
+        if self.x > maze.width + 8: self.x = -8
+
+        cx = self.col * t + t / 2.0
+        cy = self.row * t + maze.top_pad + t / 2.0
+
+        # Sub-pixel intersection crossing: snap to the centre, turn or stop
+        # there, then spend the rest of the step in the new direction
+        if _passed(self.dir, old_x, old_y, self.x, self.y, cx, cy):
+            rem_dist = abs(self.x - cx) + abs(self.y - cy)
+            self.x, self.y = cx, cy
+            if self.next_dir != (0, 0) and not is_wall(self.col + self.next_dir[0], self.row + self.next_dir[1]):
+                self.dir = self.next_dir
+                self.next_dir = (0, 0)
+            if is_wall(self.col + self.dir[0], self.row + self.dir[1]):
+                self.dir = (0, 0)
+                rem_dist = 0
+            self.x += self.dir[0] * rem_dist
+            self.y += self.dir[1] * rem_dist
+
+        # Start from standstill
+        if self.dir == (0, 0) and self.next_dir != (0, 0):
+            if not is_wall(self.col + self.next_dir[0], self.row + self.next_dir[1]):
+                self.dir = self.next_dir
+                self.next_dir = (0, 0)
+
+        self.col = int(self.x // t)
+        self.row = int((self.y - maze.top_pad) // t)
+
+    def draw(self, surf, death_progress=None, origin=(0, 0)):
+        """Draw at the maze position less origin (a view's scroll)."""
+        pos = (int(self.x) - origin[0], int(self.y) - origin[1])
+        if death_progress is not None:
+            # Fold inwards
+            mouth = death_progress * 180
+            if mouth < 180:
+                pygame.draw.circle(surf, PAC_C, pos, 12)
+                p2 = (pos[0] + math.cos(math.radians(270 + mouth)) * 14,
+                      pos[1] - math.sin(math.radians(270 + mouth)) * 14)
+                p3 = (pos[0] + math.cos(math.radians(270 - mouth)) * 14,
+                      pos[1] - math.sin(math.radians(270 - mouth)) * 14)
+                pygame.draw.polygon(surf, BG, [pos, p2, p3])
+            return
+        angle = 0
+        if self.dir == (1, 0): angle = 0
+        elif self.dir == (-1, 0): angle = 180
+        elif self.dir == (0, -1): angle = 90
+        elif self.dir == (0, 1): angle = 270
+        mouth = (self.anim_frame % 20) / 20 * 60
+        if mouth > 30: mouth = 60 - mouth
+        if self.dir == (0, 0): mouth = 20
+        pygame.draw.circle(surf, PAC_C, pos, 12)
+        if mouth > 2:
+            p2 = (pos[0] + int(math.cos(math.radians(angle + mouth)) * 14),
+                  pos[1] - int(math.sin(math.radians(angle + mouth)) * 14))
+            p3 = (pos[0] + int(math.cos(math.radians(angle - mouth)) * 14),
+                  pos[1] - int(math.sin(math.radians(angle - mouth)) * 14))
+            pygame.draw.polygon(surf, BG, [pos, p2, p3])
+
+
+class Ghost:
+    def __init__(self, type_id, rules, maze):
+        self.type = type_id         # 0 Blinky, 1 Pinky, 2 Inky, 3 Clyde
+        self.color = GHOST_COLORS[type_id]
+        self.rules = rules
+        self.maze = maze
+        t = maze.tile
+        hx, hy = maze.house_door
+        self.door_x = hx * t + t / 2
+        self.door_y = hy * t + t / 2 + maze.top_pad
+        self.door_row = int(hy)
+        self.home = (maze.house_entry_cols[0], self.door_row)
+        self.corner = maze.scatter_corners[type_id]
+        self.release = rules.release_dots[type_id]
+        self.reset()
+
+    def reset(self):
+        t = self.maze.tile
+        sx, sy = self.maze.ghost_starts[self.type]
+        self.dir = (0, 0)
+        self.speed = self.rules.ghost_speed
+        self.in_house = True
+        self.x = sx * t + t / 2
+        self.y = sy * t + t / 2 + self.maze.top_pad
+        if self.type == 0:
+            # Blinky starts outside, heading left
+            self.in_house = False
+            self.dir = (-1, 0)
+        self.col = int(self.x // t)
+        self.row = int((self.y - self.maze.top_pad) // t)
+        self.state = 'scatter'
+        self.anim = 0
+
+    def update(self, pac, blinky, global_state, dots_eaten):
+        self.anim += 1
+        rules = self.rules
+        maze = self.maze
+        t = maze.tile
+
+        # Ghost house: bob until released, then centre on the door and rise
+        if self.in_house:
+            if self.release is not None and dots_eaten >= self.release:
+                if abs(self.x - self.door_x) > 1: self.x += 1 if self.x < self.door_x else -1
+                else:
+                    self.x = self.door_x
+                    self.y -= 1
+                    if self.y <= self.door_y:
+                        self.y = self.door_y
+                        self.in_house = False
+                        self.state = global_state
+                        self.dir = (-1, 0)
+            else:
+                self.y += 0.5 if (self.anim // 15) % 2 == 0 else -0.5
+            return
+
+        if self.state == 'eaten': self.speed = rules.eaten_speed
+        elif self.state == 'frightened': self.speed = rules.fright_speed
+        elif self.row in maze.tunnel_rows and (self.col < maze.tunnel_slow[0]
+                                               or self.col > maze.tunnel_slow[1]):
+            self.speed = rules.tunnel_speed
+        else: self.speed = rules.ghost_speed
+
+        old_x, old_y = self.x, self.y
+        self.x += self.dir[0] * self.speed
+        self.y += self.dir[1] * self.speed
+        if self.x < -8: self.x = maze.width + 8
+        if self.x > maze.width + 8: self.x = -8
+        cx = self.col * t + t / 2.0
+        cy = self.row * t + t / 2.0 + maze.top_pad
+
+        if _passed(self.dir, old_x, old_y, self.x, self.y, cx, cy):
+            rem_dist = abs(self.x - cx) + abs(self.y - cy)
+            self.x, self.y = cx, cy
+            if self.state == 'eaten' and self.col in maze.house_entry_cols and self.row == self.door_row:
+                self.dir = (0, 1)
+                self.state = global_state
+                self.in_house = True
+                return
+            valid = []
+            back = (-self.dir[0], -self.dir[1])
+            exits = maze.exits(self.col, self.row, self.state == 'eaten')
+            for i, d in enumerate(TURN_ORDER):
+                if not exits >> i & 1: continue
+                if d == back and self.dir != (0, 0): continue
+                # Historic no-up tiles
+                if d == (0, -1) and self.state in ('chase', 'scatter'):
+                    if (self.col, self.row) in maze.no_up_tiles: continue
+                valid.append(d)
+            if not valid:
+                self.dir = back
+            elif len(valid) == 1:
+                self.dir = valid[0]
+            elif self.state == 'frightened':
+                self.dir = random.choice(valid)
+            else:
+                tx, ty = self.target(pac, blinky)
+                # Straight-line distance from each exit tile; ties keep TURN_ORDER
+                best_d = valid[0]
+                min_dist = float('inf')
+                for d in valid:
+                    nc, nr = self.col + d[0], self.row + d[1]
+                    dist = (nc - tx) ** 2 + (nr - ty) ** 2
+                    if dist < min_dist:
+                        min_dist = dist
+                        best_d = d
+                self.dir = best_d
+            self.x += self.dir[0] * rem_dist
+            self.y += self.dir[1] * rem_dist
+
+        self.col = int(self.x // t)
+        self.row = int((self.y - maze.top_pad) // t)
+
+    def target(self, pac, blinky):
+        """Target tile for the current state, with the arcade's quirks."""
+        if self.state == 'eaten':
+            return self.home
+        if self.state == 'scatter':
+            return self.corner
+        if self.type == 0:
+            return pac.col, pac.row
+        if self.type == 1:
+            ahead = self.rules.pinky_ahead
+            tx, ty = pac.col + pac.dir[0] * ahead, pac.row + pac.dir[1] * ahead
+            if pac.dir == (0, -1): tx -= ahead     # overflow bug: up also shifts left
+            return tx, ty
+        if self.type == 2:
+            ahead = self.rules.inky_ahead
+            px, py = pac.col + pac.dir[0] * ahead, pac.row + pac.dir[1] * ahead
+            if pac.dir == (0, -1): px -= ahead
+            vx, vy = px - blinky.col, py - blinky.row
+            return px + vx, py + vy
+        dist_sq = (self.col - pac.col) ** 2 + (self.row - pac.row) ** 2
+        return (pac.col, pac.row) if dist_sq > self.rules.clyde_radius_sq else self.corner
+
+    def draw(self, surf, fright_timer, origin=(0, 0)):
+        pos = (int(self.x) - origin[0], int(self.y) - origin[1])
+        if self.state == 'eaten':
+            dx, dy = self.dir
+            pygame.draw.circle(surf, W, (pos[0] - 4 + dx * 2, pos[1] - 2 + dy * 2), 4)
+            pygame.draw.circle(surf, W, (pos[0] + 4 + dx * 2, pos[1] - 2 + dy * 2), 4)
+            pygame.draw.circle(surf, G_BLUE, (pos[0] - 4 + dx * 4, pos[1] - 2 + dy * 4), 2)
+            pygame.draw.circle(surf, G_BLUE, (pos[0] + 4 + dx * 4, pos[1] - 2 + dy * 4), 2)
+            return
+        c = self.color
+        if self.state == 'frightened':
+            c = W if (fright_timer < 120 and (fright_timer // 15) % 2 == 0) else G_BLUE
+        pygame.draw.circle(surf, c, (pos[0], pos[1] - 2), 12)
+        pygame.draw.rect(surf, c, (pos[0] - 12, pos[1] - 2, 24, 14))
+        # Wiggling skirt
+        if (self.anim // 8) % 2:
+            pygame.draw.polygon(surf, c, [(pos[0] - 12, pos[1] + 12), (pos[0] - 6, pos[1] + 16), (pos[0], pos[1] + 12)])
+            pygame.draw.polygon(surf, c, [(pos[0], pos[1] + 12), (pos[0] + 6, pos[1] + 16), (pos[0] + 12, pos[1] + 12)])
+        else:
+            pygame.draw.polygon(surf, c, [(pos[0] - 12, pos[1] + 12), (pos[0] - 8, pos[1] + 16), (pos[0] - 4, pos[1] + 12)])
+            pygame.draw.polygon(surf, c, [(pos[0] - 4, pos[1] + 12), (pos[0], pos[1] + 16), (pos[0] + 4, pos[1] + 12)])
+            pygame.draw.polygon(surf, c, [(pos[0] + 4, pos[1] + 12), (pos[0] + 8, pos[1] + 16), (pos[0] + 12, pos[1] + 12)])
+        if self.state == 'frightened':
+            pygame.draw.circle(surf, FACE_C, (pos[0] - 4, pos[1] - 2), 2)
+            pygame.draw.circle(surf, FACE_C, (pos[0] + 4, pos[1] - 2), 2)
+            for ox in (-6, -2, 2):
+                pygame.draw.line(surf, FACE_C, (pos[0] + ox, pos[1] + 4), (pos[0] + ox + 2, pos[1] + 2), 2)
+                pygame.draw.line(surf, FACE_C, (pos[0] + ox + 2, pos[1] + 2), (pos[0] + ox + 4, pos[1] + 4), 2)
+        else:
+            dx, dy = self.dir
+            pygame.draw.circle(surf, W, (pos[0] - 4 + dx * 2, pos[1] - 4 + dy * 2), 4)
+            pygame.draw.circle(surf, W, (pos[0] + 4 + dx * 2, pos[1] - 4 + dy * 2), 4)
+            pygame.draw.circle(surf, PUPIL_C, (pos[0] - 4 + dx * 4, pos[1] - 4 + dy * 4), 2)
+            pygame.draw.circle(surf, PUPIL_C, (pos[0] + 4 + dx * 4, pos[1] - 4 + dy * 4), 2)
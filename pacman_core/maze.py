@@ -0,0 +1,116 @@
+"""Maze geometry: wall lookups, exit masks, pellets and the static maze layer.
+
+A Maze is built by pacman_core.mazefile, from a .maze source or its
+compiled cache; nothing here parses or derives.
+"""
+
+BG = (0, 0, 0)
+WALL_C = (33, 33, 222)
+DOOR_C = (255, 184, 255)
+DOT_C = (255, 184, 174)
+
+OPEN, WALL, DOOR = 0, 1, 2
+
+# Up, left, down, right: the arcade's tie-break order at intersections.
+# Bit i of an exit mask is DIRS[i] with the house door shut, bit i + 4 the
+# same with it open
+DIRS = ((0, -1), (-1, 0), (0, 1), (1, 0))
+
+# Per-maze placement, read from the .maze header or derived by the compiler
+PLACEMENT = ('pac_start', 'ghost_starts', 'scatter_corners', 'no_up_tiles',
+             'tunnel_slow', 'house_door', 'house_entry_cols')
+
+
+class Maze:
+    """One maze at one tile geometry: the cell grid and everything derived
+    from it, plus where Pac-Man and the ghosts start."""
+
+    __slots__ = ('name', 'tile', 'top_pad', 'bottom_pad', 'cols', 'nrows', 'width',
+                 'height', 'cells', 'exit_masks', 'tunnel_rows', 'dots', 'powers',
+                 'wall_rgb') + PLACEMENT
+
+    def __init__(self, name, cols, nrows, geometry, cells, tunnel_rows, dots, powers,
+                 placement, exit_masks=None, wall_rgb=None):
+        self.name = name
+        self.cols = cols
+        self.nrows = nrows
+        self.tile, self.top_pad, self.bottom_pad = geometry
+        self.width = cols * self.tile
+        self.height = nrows * self.tile + self.top_pad + self.bottom_pad
+        # Flat cell kinds (OPEN, WALL, DOOR), row-major
+        self.cells = cells
+        self.tunnel_rows = tuple(tunnel_rows)
+        # Flat indices of the dots and power pellets, row-major
+        self.dots = dots
+        self.powers = powers
+        for key in PLACEMENT:
+            setattr(self, key, placement[key])
+        if exit_masks is None:
+            exit_masks = bytes(self.probe_exits(c, r)
+                               for r in range(nrows) for c in range(cols))
+        self.exit_masks = exit_masks
+        # Raw RGB of the wall layer, or None to draw it on first use
+        self.wall_rgb = wall_rgb
+
+    def is_wall(self, c, r, allow_door=False):
+        """Whether tile (c, r) blocks movement; off the side is open only in
+        a tunnel row, off the top or bottom is always solid."""
+        if c < 0 or c >= self.cols:
+            return r not in self.tunnel_rows
+        if r < 0 or r >= self.nrows:
+            return True
+        kind = self.cells[r * self.cols + c]
+        return kind == WALL or (kind == DOOR and not allow_door)
+
+    def probe_exits(self, c, r):
+        """The exit mask of (c, r) from is_wall, for both door states."""
+        mask = 0
+        for i, (dx, dy) in enumerate(DIRS):
+            if not self.is_wall(c + dx, r + dy):
+                mask |= 1 << i
+            if not self.is_wall(c + dx, r + dy, True):
+                mask |= 16 << i
+        return mask
+
+    def exits(self, c, r, door=False):
+        """Bit i set when DIRS[i] leads off tile (c, r)."""
+        if 0 <= c < self.cols and 0 <= r < self.nrows:
+            mask = self.exit_masks[r * self.cols + c]
+        else:
+            mask = self.probe_exits(c, r)       # out in a tunnel
+        return mask >> 4 if door else mask & 15
+
+    def pellets(self, pygame):
+        """Fresh (dots, powers) Rect lists, in row-major order."""
+        t, top, cols = self.tile, self.top_pad, self.cols
+        dots = [pygame.Rect(i % cols * t + 6, i // cols * t + top + 6, 4, 4) for i in self.dots]
+        powers = [pygame.Rect(i % cols * t + 2, i // cols * t + top + 2, 12, 12) for i in self.powers]
+        return dots, powers
+
+    def pellet_count(self):
+        return len(self.dots) + len(self.powers)
+
+    def surface(self, pygame):
+        """The walls and door on a background-filled game-sized Surface."""
+        if self.wall_rgb is None:
+            surf = render_walls(pygame, self.cells, self.cols, self.nrows,
+                                (self.tile, self.top_pad, self.bottom_pad))
+            self.wall_rgb = pygame.image.tobytes(surf, "RGB")
+            return surf
+        return pygame.image.frombytes(self.wall_rgb, (self.width, self.height), "RGB")
+
+
+def render_walls(pygame, cells, cols, nrows, geometry):
+    """Draw row-major cell kinds as the maze layer."""
+    t, top, bottom = geometry
+    surf = pygame.Surface((cols * t, nrows * t + top + bottom))
+    surf.fill(BG)
+    for i, kind in enumerate(cells):
+        x, y = i % cols * t, i // cols * t + top
+        if kind == WALL:
+            # Famicom-style double-line walls
+            pygame.draw.rect(surf, WALL_C, (x, y, t, t))
+            pygame.draw.rect(surf, BG, (x + 3, y + 3, t - 6, t - 6))
+        elif kind == DOOR:
+            pygame.draw.rect(surf, DOOR_C, (x, y + t // 2 - 2, t, 4))
+    return surf
@@ -0,0 +1,258 @@
+"""
+Maze sources (.maze) and their compiled caches (.mazec).
+
+A .maze file is text for authoring: `key: value` header lines, then the
+grid, one row per line (1: wall, 2: dot, 3: power pellet, =: house door,
+0: empty). `#` starts a comment. Values are numbers; a list of points is
+comma-separated, each point two numbers:
+
+    # Pac-Man, 244 dots
+    pac_start: 13 23
+    ghost_starts: 13.5 11, 13.5 14, 11.5 14, 15.5 14
+    scatter_corners: 25 -3, 2 -3, 27 34, 0 34
+    no_up_tiles: 12 11, 15 11
+    tunnel_slow: 5 22
+    1111111111111111111111111111
+    ...
+
+The compiler derives the rest: cell kinds, exit masks for both door
+states, the tunnel rows (rows whose two edges Pac-Man can reach), the
+house door and entry columns, the row-major dot and power pellet indices,
+and the wall layer pre-rendered at the profile's tile geometry (unless
+the maze is too big to be shown whole). It writes all of it, flat, to
+<name>.mazec next to the source, so a level load is one read with nothing
+to parse or derive; the cache is rebuilt whenever the source's size or
+mtime or the tile geometry changes. pacman_mazes.py compiles and checks
+them from the command line.
+"""
+
+import os
+import sys
+import json
+import struct
+from array import array
+
+from pacman_core.maze import Maze, OPEN, WALL, DOOR
+from pacman_core.bitgrid import BitGrid
+
+MAZE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mazes")
+MAGIC = b"PMZC"
+VERSION = 1
+# magic, version, cols, rows, tile, top_pad, bottom_pad, source mtime_ns and
+# size, then the lengths of the tunnel, dot, power, placement and wall sections
+HEADER = struct.Struct("<4sHHHHHHqqHHHII")
+# Bigger wall layers are not cached: a maze that size is shown through a
+# camera, which draws its walls in chunks (see camera.py)
+WALL_CACHE_MAX = 8 << 20
+
+_KIND = {'0': OPEN, '1': WALL, '2': OPEN, '3': OPEN, '=': DOOR}
+_REQUIRED = ('pac_start', 'ghost_starts', 'scatter_corners', 'tunnel_slow')
+_OPTIONAL = {'no_up_tiles': ()}
+_POINT_LISTS = ('ghost_starts', 'scatter_corners', 'no_up_tiles')
+
+
+# ── Source ────────────────────────────────────────────────────────────────────
+def _number(text):
+    return float(text) if '.' in text else int(text)
+
+
+def _value(key, text):
+    """'1 2' -> (1, 2); a point list '1 2, 3 4' -> ((1, 2), (3, 4))."""
+    points = tuple(tuple(_number(n) for n in part.split()) for part in text.split(','))
+    if any(len(p) != 2 for p in points) or (len(points) != 1 and key not in _POINT_LISTS):
+        raise ValueError(text)
+    return points if key in _POINT_LISTS else points[0]
+
+
+def parse(text, where="<maze>"):
+    """(header dict, grid rows) from .maze text; ValueError on bad input."""
+    header, rows = {}, []
+    for lineno, raw in enumerate(text.splitlines(), 1):
+        line = raw.split('#', 1)[0].strip()
+        if not line:
+            continue
+        if ':' in line and not rows:
+            key, value = (s.strip() for s in line.split(':', 1))
+            if key not in _REQUIRED and key not in _OPTIONAL:
+                raise ValueError(f"{where}:{lineno}: unknown key {key!r}")
+            try:
+                header[key] = _value(key, value) if value else ()
+            except ValueError:
+                raise ValueError(f"{where}:{lineno}: bad value for {key}: {value!r}") from None
+        elif set(line) <= set(_KIND):
+            if rows and len(line) != len(rows[0]):
+                raise ValueError(f"{where}:{lineno}: row is {len(line)} tiles, "
+                                 f"expected {len(rows[0])}")
+            rows.append(line)
+        else:
+            raise ValueError(f"{where}:{lineno}: not a header or grid row: {raw!r}")
+    if not rows:
+        raise ValueError(f"{where}: no grid")
+    for key in _REQUIRED:
+        if key not in header:
+            raise ValueError(f"{where}: missing {key}")
+    for key, default in _OPTIONAL.items():
+        header.setdefault(key, default)
+    return header, rows
+
+
+# ── Compiler ──────────────────────────────────────────────────────────────────
+def build(name, header, rows, geometry, where="<maze>"):
+    """Derive a Maze from parsed source; ValueError if it is not playable."""
+    cols, nrows = len(rows[0]), len(rows)
+    flat = "".join(rows)
+    cells = bytes(_KIND[ch] for ch in flat)
+
+    pc, pr = header['pac_start']
+    if not (0 <= pc < cols and 0 <= pr < nrows) or cells[pr * cols + pc] != OPEN:
+        raise ValueError(f"{where}: pac_start {pc, pr} is not an open tile")
+    if len(header['ghost_starts']) != 4 or len(header['scatter_corners']) != 4:
+        raise ValueError(f"{where}: need four ghost_starts and four scatter_corners")
+
+    doors = [i for i, kind in enumerate(cells) if kind == DOOR]
+    door_rows = {i // cols for i in doors}
+    if len(door_rows) != 1 or doors[-1] - doors[0] != len(doors) - 1:
+        raise ValueError(f"{where}: the house door must be one horizontal run of '='")
+    door_row = door_rows.pop()
+    entry = tuple(i % cols for i in doors)
+
+    # A row wraps when Pac-Man can reach both of its edges, with any open
+    # edge tile allowed to wrap for the search
+    grid = BitGrid(cols, nrows, tunnel_rows=range(nrows))
+    seen = grid.flood(grid.bit(pc, pr), grid.pack(kind == OPEN for kind in cells))
+    tunnel_rows = tuple(r for r in range(nrows)
+                        if seen & grid.bit(0, r) and seen & grid.bit(cols - 1, r))
+
+    dots = array('H', (i for i, ch in enumerate(flat) if ch == '2'))
+    powers = array('H', (i for i, ch in enumerate(flat) if ch == '3'))
+    if not dots and not powers:
+        raise ValueError(f"{where}: no pellets")
+    stranded = grid.tiles(grid.pack(ch in '23' for ch in flat) & ~seen)
+    if stranded:
+        raise ValueError(f"{where}: {len(stranded)} pellet(s) out of reach, "
+                         f"first at {stranded[0]}")
+
+    placement = {key: header[key] for key in _REQUIRED + tuple(_OPTIONAL)}
+    # Ghosts leave the house from the tile above the middle of the door
+    placement['house_door'] = ((entry[0] + entry[-1]) / 2, door_row - 1)
+    placement['house_entry_cols'] = entry
+    return Maze(name, cols, nrows, geometry, cells, tunnel_rows, dots, powers, placement)
+
+
+def _le(arr):
+    """An array's bytes, little-endian."""
+    if sys.byteorder == "big":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def pack(maze, stamp=(0, 0)):
+    """The .mazec bytes of a built Maze; stamp is the source (mtime_ns, size)."""
+    wall = b""
+    if maze.width * maze.height * 3 <= WALL_CACHE_MAX:
+        import pygame
+        maze.surface(pygame)                # fills in wall_rgb
+        wall = maze.wall_rgb
+    placement = json.dumps({key: getattr(maze, key) for key in
+                            _REQUIRED + tuple(_OPTIONAL) + ('house_door', 'house_entry_cols')},
+                           separators=(',', ':')).encode()
+    tunnel = bytes(maze.tunnel_rows)
+    head = HEADER.pack(MAGIC, VERSION, maze.cols, maze.nrows, maze.tile, maze.top_pad,
+                       maze.bottom_pad, stamp[0], stamp[1], len(tunnel), len(maze.dots),
+                       len(maze.powers), len(placement), len(wall))
+    return b"".join((head, maze.cells, maze.exit_masks, tunnel, _le(maze.dots),
+                     _le(maze.powers), placement, wall))
+
+
+def _tuples(value):
+    return tuple(_tuples(v) for v in value) if isinstance(value, list) else value
+
+
+def unpack(name, buf, geometry=None, stamp=None):
+    """A Maze from .mazec bytes, or None if they are stale for the geometry
+    or source stamp given, or not a cache this version wrote."""
+    if len(buf) < HEADER.size:
+        return None
+    (magic, version, cols, nrows, tile, top, bottom, mtime, size, n_tunnel, n_dots,
+     n_powers, n_place, n_wall) = HEADER.unpack_from(buf)
+    if magic != MAGIC or version != VERSION:
+        return None
+    if geometry is not None and (tile, top, bottom) != tuple(geometry):
+        return None
+    if stamp is not None and (mtime, size) != tuple(stamp):
+        return None
+    view = memoryview(buf)
+    at = HEADER.size
+    n = cols * nrows
+    sections = []
+    for length in (n, n, n_tunnel, 2 * n_dots, 2 * n_powers, n_place, n_wall):
+        sections.append(view[at:at + length])
+        at += length
+    if at != len(buf):
+        return None
+    cells, exits, tunnel, dots_b, powers_b, place, wall = sections
+    dots, powers = array('H'), array('H')
+    dots.frombytes(dots_b)
+    powers.frombytes(powers_b)
+    if sys.byteorder == "big":
+        dots.byteswap()
+        powers.byteswap()
+    placement = {key: _tuples(v) for key, v in json.loads(bytes(place)).items()}
+    return Maze(name, cols, nrows, (tile, top, bottom), bytes(cells), bytes(tunnel),
+                dots, powers, placement, exit_masks=bytes(exits), wall_rgb=bytes(wall) or None)
+
+
+# ── Loading ───────────────────────────────────────────────────────────────────
+def resolve(ref):
+    """A shipped maze's name ('famicom') or a path -> the source path."""
+    if os.sep in ref or ref.endswith(".maze"):
+        return ref
+    return os.path.join(MAZE_DIR, ref + ".maze")
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def compile_file(path, geometry, write=True):
+    """Build the Maze of a .maze source and (re)write its cache."""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    name = os.path.splitext(os.path.basename(path))[0]
+    maze = build(name, *parse(text, path), geometry, where=path)
+    if write:
+        data = pack(maze, _stamp(path))
+        tmp = f"{path}c.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path + "c")
+        except OSError:
+            # a read-only install: play from the in-memory build
+            if os.path.exists(tmp):
+                os.remove(tmp)
+    return maze
+
+
+def load(ref, geometry):
+    """The Maze for a name or .maze path at (tile, top_pad, bottom_pad).
+
+    Uses the compiled cache when it is current; a cache whose source is
+    not there (shipped on its own) is used as is.
+    """
+    path = resolve(ref)
+    have_source = os.path.exists(path)
+    try:
+        with open(path + "c", "rb") as f:
+            buf = f.read()
+    except OSError:
+        buf = b""
+    name = os.path.splitext(os.path.basename(path))[0]
+    maze = unpack(name, buf, geometry, _stamp(path) if have_source else None)
+    if maze is not None:
+        return maze
+    if not have_source:
+        raise FileNotFoundError(f"{path}: no source and no usable cache")
+    return compile_file(path, geometry)
@@ -0,0 +1,292 @@
+"""
+Procedural Pac-Man mazes in the .maze encoding, for endless mode.
+
+A maze is mirror-symmetric: only the left half is generated and the
+right half is its reflection. Corridors run along a lattice of rows and
+columns, at least three tiles apart so walls are at least two tiles
+thick. A maze is a random set of lattice edges, and horizontal edges at
+the centre column join the two halves. The Frame is the same in every
+maze of a size: the border, the ghost house and its door, the ring
+corridor around the house and Pac-Man's start under it. The lattice
+spacing, the tunnel row and the edges change from maze to maze.
+
+Every edge's tiles, mirrored, are precomputed as one bitset per layout,
+so a candidate is an OR of masks. It is checked as a whole with
+pacman_core.bitgrid: no 2x2 open block, no dead ends, every corridor
+reachable from Pac-Man's start (through the tunnel too). Failures are
+thrown away. A candidate takes well under a millisecond, so a new maze
+fits in the pause after a level is cleared.
+
+The arcade size (28x31) picks from a few fixed layouts. A bigger maze
+draws its lattice fresh, patches dead ends until there are none and
+keeps only what Pac-Man can reach, since a random graph that large is
+almost never connected as drawn.
+"""
+
+import random
+
+from pacman_core import mazefile
+from pacman_core.bitgrid import BitGrid
+
+COLS, ROWS = 28, 31
+MIN_FILL = 30           # percent of tiles that are corridor; the arcade maze has 35
+POWER_SPACING = 20      # tiles between power pellets, on the left half
+
+# Arcade lattice: columns 1 and 9 (the ring's side) and 12 (joined across
+# the centre to its mirror, 15) are fixed; the second column and the rows
+# between the fixed ones vary
+COL_CHOICES = (4, 5, 6)
+TOP_CHOICES = ((4, 7), (4, 8), (5, 8), (4,), (5,), (6,), (7,), (8,))
+BOTTOM_CHOICES = ((20, 23, 26), (20, 23), (23, 26), (23,))
+EDGE_ODDS = 0.55
+
+
+# ── Frames ────────────────────────────────────────────────────────────────────
+class Frame:
+    """The fixed part of every maze of one size, centred as in the arcade
+    maze: the house, its door and ring corridor, and Pac-Man's start."""
+
+    __slots__ = ('cols', 'nrows', 'house', 'door_cols', 'ring_rows', 'ring_col',
+                 'centre_col', 'pac_start', 'min_tiles')
+
+    def __init__(self, cols, nrows):
+        if cols % 2 or cols < COLS or nrows < ROWS:
+            raise ValueError(f"maze size {cols}x{nrows}: need an even width, "
+                             f"at least {COLS}x{ROWS}")
+        self.cols, self.nrows = cols, nrows
+        mid = cols // 2
+        r0 = nrows // 2 - 3
+        self.house = ((mid - 4, r0), (mid + 3, r0 + 4))     # corners, inclusive
+        self.door_cols = (mid - 1, mid)
+        self.ring_rows = (r0 - 1, r0 + 5)
+        self.ring_col = mid - 5
+        # Joined across the centre to its mirror
+        self.centre_col = mid - 2
+        self.pac_start = (mid - 1, r0 + 11)
+        self.min_tiles = cols * nrows * MIN_FILL // 100
+
+    def in_house(self, c, r):
+        (c0, r0), (c1, r1) = self.house
+        return c0 <= c <= c1 and r0 <= r <= r1
+
+    def house_char(self, c, r):
+        (c0, r0), (c1, r1) = self.house
+        if r == r0 and c in self.door_cols:
+            return '='
+        if r in (r0, r1) or c in (c0, c1):
+            return '1'
+        return '0'
+
+    def header(self):
+        """The .maze header: starts, corners and no-up tiles."""
+        cols, nrows, mid = self.cols, self.nrows, self.cols // 2
+        r0 = self.house[0][1]
+        cc = self.centre_col
+        return {
+            'pac_start': self.pac_start,
+            'ghost_starts': ((mid - 0.5, r0 - 1), (mid - 0.5, r0 + 2),
+                             (mid - 2.5, r0 + 2), (mid + 1.5, r0 + 2)),
+            'scatter_corners': ((cols - 3, -3), (2, -3), (cols - 1, nrows + 3), (0, nrows + 3)),
+            'no_up_tiles': tuple((c, r) for r in (self.ring_rows[0], self.pac_start[1])
+                                 for c in (cc, cols - 1 - cc)),
+            'tunnel_slow': (1, cols - 2),
+        }
+
+
+ARCADE = Frame(COLS, ROWS)
+
+
+# ── Layouts ───────────────────────────────────────────────────────────────────
+class Layout:
+    """One lattice: its nodes, every possible edge as a mirrored tile mask,
+    and which edges every maze on it has."""
+
+    __slots__ = ('frame', 'tunnel', 'grid', 'edges', 'forced', 'node_edges', 'base')
+
+    def __init__(self, frame, xs, ys, tunnel):
+        f = self.frame = frame
+        cols, cc = f.cols, f.centre_col
+        self.tunnel = tunnel
+        self.grid = BitGrid(cols, f.nrows, (tunnel,))
+        nodes = {(x, y) for x in xs for y in ys if not f.in_house(x, y)}
+
+        # Edges are (a, b, tiles); a centre crossing has b == a
+        self.edges = []
+        for y in ys:
+            row = [x for x in xs if (x, y) in nodes]
+            for a, b in zip(row, row[1:]):
+                self.edges.append(((a, y), (b, y), [(c, y) for c in range(a, b + 1)]))
+            if (cc, y) in nodes:
+                self.edges.append(((cc, y), (cc, y), [(c, y) for c in range(cc, cols - cc)]))
+        for x in xs:
+            col = [y for y in ys if (x, y) in nodes]
+            for a, b in zip(col, col[1:]):
+                tiles = [(x, r) for r in range(a, b + 1)]
+                if not any(f.in_house(*t) for t in tiles):
+                    self.edges.append(((x, a), (x, b), tiles))
+
+        masks = []
+        for a, b, tiles in self.edges:
+            bits = 0
+            for c, r in tiles:
+                bits |= self.grid.bit(c, r) | self.grid.bit(cols - 1 - c, r)
+            masks.append(bits)
+        self.edges = [(a, b, bits) for (a, b, _), bits in zip(self.edges, masks)]
+
+        (top, bottom), side = f.ring_rows, f.ring_col
+        mid = f.house[0][1] + 2
+        pac_row = f.pac_start[1]
+        ring = {((side, top), (cc, top)), ((side, bottom), (cc, bottom)),
+                ((side, top), (side, mid)), ((side, mid), (side, bottom)),
+                ((cc, top), (cc, top)), ((cc, bottom), (cc, bottom)),
+                ((cc, pac_row), (cc, pac_row))}
+        self.forced = [i for i, (a, b, _) in enumerate(self.edges) if (a, b) in ring]
+        self.node_edges = {}
+        for i, (a, b, _) in enumerate(self.edges):
+            self.node_edges.setdefault(a, []).append(i)
+            if b != a:
+                self.node_edges.setdefault(b, []).append(i)
+        # The tunnel mouths, which poke through the border
+        self.base = self.grid.bit(0, tunnel) | self.grid.bit(cols - 1, tunnel)
+
+    def candidate(self, rng, repair=False):
+        """A random edge set's open tiles; node dead ends are patched by
+        adding another edge where one is free, once, or with repair until
+        no patch is left to make."""
+        on = [False] * len(self.edges)
+        for i in self.forced:
+            on[i] = True
+        for i in range(len(on)):
+            if not on[i] and rng.random() < EDGE_ODDS:
+                on[i] = True
+        while True:
+            # Exits per node; a centre crossing is one, the tunnel mouth another
+            degree = {(1, self.tunnel): 1}
+            for i, (a, b, _) in enumerate(self.edges):
+                if on[i]:
+                    degree[a] = degree.get(a, 0) + 1
+                    if b != a:
+                        degree[b] = degree.get(b, 0) + 1
+            patched = False
+            for node, n in list(degree.items()):
+                if n == 1:
+                    free = [i for i in self.node_edges[node] if not on[i]]
+                    if free:
+                        on[rng.choice(free)] = True
+                        patched = True
+            if not (repair and patched):
+                break
+        bits = self.base
+        for i, (_, _, mask) in enumerate(self.edges):
+            if on[i]:
+                bits |= mask
+        return bits
+
+
+_layouts = {}
+
+
+def _layout(rng):
+    """One of the arcade-size layouts."""
+    top, bottom = rng.choice(TOP_CHOICES), rng.choice(BOTTOM_CHOICES)
+    rows = [y for y in (1,) + top + (14,) + bottom if 1 < y < ROWS - 2]
+    x1, tunnel = rng.choice(COL_CHOICES), rng.choice(rows)
+    key = (x1, top, bottom, tunnel)
+    if key not in _layouts:
+        f = ARCADE
+        xs = (1, x1, f.ring_col, f.centre_col)
+        ys = (1,) + top + (f.ring_rows[0], 14, f.ring_rows[1]) + bottom + (ROWS - 2,)
+        _layouts[key] = Layout(f, xs, ys, tunnel)
+    return _layouts[key]
+
+
+def _lines(lo, hi, rng):
+    """Lattice lines from lo to hi inclusive, 3 to 5 tiles apart."""
+    out = [lo]
+    while hi - out[-1] > 5:
+        out.append(out[-1] + rng.choice([s for s in (3, 4, 5) if hi - out[-1] - s >= 3]))
+    if hi != out[-1]:
+        out.append(hi)
+    return out
+
+
+def _big_layout(frame, rng):
+    """A fresh lattice over a frame bigger than the arcade's."""
+    (top, bottom), mid = frame.ring_rows, frame.house[0][1] + 2
+    pac_row = frame.pac_start[1]
+    xs = _lines(1, frame.ring_col, rng) + [frame.centre_col]
+    ys = (_lines(1, top, rng) + [mid] + _lines(bottom, pac_row, rng)
+          + _lines(pac_row, frame.nrows - 2, rng)[1:])
+    tunnel = rng.choice([y for y in ys[1:-1] if y not in frame.ring_rows])
+    return Layout(frame, xs, ys, tunnel)
+
+
+# ── Checks ────────────────────────────────────────────────────────────────────
+def check(layout, open_bits):
+    """Why a candidate is not a legal maze, or None."""
+    grid, f = layout.grid, layout.frame
+    if bin(open_bits).count("1") < f.min_tiles:
+        return "sparse"
+    if grid.squares(open_bits):
+        return "2x2"
+    if grid.dead_ends(open_bits):
+        return "dead end"
+    if grid.flood(grid.bit(*f.pac_start), open_bits) != open_bits:
+        return "disconnected"
+    return None
+
+
+def generate(rng=None, max_tries=100000, size=(COLS, ROWS)):
+    """(header, rows, tries) for a new legal maze of size (cols, rows)."""
+    rng = rng or random.Random()
+    frame = ARCADE if tuple(size) == (COLS, ROWS) else Frame(*size)
+    for tries in range(1, max_tries + 1):
+        if frame is ARCADE:
+            layout = _layout(rng)
+            open_bits = layout.candidate(rng)
+        else:
+            layout = _big_layout(frame, rng)
+            grid = layout.grid
+            open_bits = grid.flood(grid.bit(*frame.pac_start), layout.candidate(rng, repair=True))
+            # The ring must have survived: it is how the ghosts get out
+            if not open_bits & grid.bit(frame.ring_col, frame.ring_rows[0]):
+                continue
+        if check(layout, open_bits) is None:
+            return frame.header(), _rows(layout, open_bits), tries
+    raise RuntimeError(f"no legal maze in {max_tries} tries")
+
+
+def _rows(layout, open_bits):
+    f, grid = layout.frame, layout.grid
+    cols = f.cols
+    corridor = set(grid.tiles(open_bits))
+    no_dots = {(c, layout.tunnel) for c in (0, cols - 1)}
+    no_dots.update((c, f.pac_start[1]) for c in f.door_cols)
+    (ring0, ring1), side = f.ring_rows, f.ring_col
+    out = []
+    for r in range(f.nrows):
+        row = []
+        for c in range(cols):
+            if f.in_house(c, r):
+                row.append(f.house_char(c, r))
+            elif (c, r) not in corridor:
+                row.append('1')
+            elif (c, r) in no_dots or (side <= c <= cols - 1 - side and ring0 <= r <= ring1):
+                row.append('0')
+            else:
+                row.append('2')
+        out.append(row)
+    # Power pellets: the dots nearest a grid of targets (the arcade's two
+    # on the arcade size), mirrored
+    dots = [(c, r) for r in range(f.nrows) for c in range(cols // 2) if out[r][c] == '2']
+    for tr in range(3, f.nrows, POWER_SPACING):
+        for tc in range(1, cols // 2, POWER_SPACING):
+            c, r = min(dots, key=lambda t: (t[0] - tc) ** 2 + (t[1] - tr) ** 2)
+            out[r][c] = out[r][cols - 1 - c] = '3'
+    return ["".join(row) for row in out]
+
+
+def generate_maze(geometry, rng=None, name="generated", size=(COLS, ROWS)):
+    """A new Maze, built and validated like a .maze source."""
+    header, rows, _ = generate(rng, size=size)
+    return mazefile.build(name, header, rows, geometry, where=name)
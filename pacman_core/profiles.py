@@ -0,0 +1,209 @@
+"""
+Rule profiles: everything that differs between the run_game() editions.
+
+A Profile is plain data. The game rules (maze, speeds, scatter/chase waves,
+ghost-house timing, collision sizes) default to the Famicom values. The
+four original run_game() editions (4K1.Xa, V0, gemini, ultra HDR) already
+played exactly these rules, so they override only the presentation: window
+scaling, HUD layout, menu, caption and leaderboard. The rule fields are
+what the endless and giant modes change (generated mazes, the camera,
+cornering). Where things start and the ghosts' corners belong to the maze
+(see mazefile.py). Speeds are px/frame at 60 FPS; times are frames unless
+noted.
+
+The Game-class engine (arcade.py) plays the "arcade" and "arcade-legacy"
+profiles, for $acholdingpacman4k.py and acholdingpacman4k.py. Its rules
+change with the level, so it also reads the per-level fields (the *_from
+tables, level_waves, Cruise Elroy) that the run_game() editions ignore;
+its maze, house and scatter corners are its own. The legacy profile keeps
+the first script's numbers (Pac-Man 1.3, ghosts 1.25 to 1.5, one wave
+table for every level, 600 frames of fright, Cruise Elroy as speed-ups)
+and plays them on the engine's movement, ghost house and drawing.
+"""
+
+# Level 1 timers: 7s, 20s, 7s, 20s, 5s, 20s, 5s, then chase for good
+FAMICOM_WAVES = (
+    (420, 'scatter'), (1200, 'chase'), (420, 'scatter'), (1200, 'chase'),
+    (300, 'scatter'), (1200, 'chase'), (300, 'scatter'), (999999, 'chase'),
+)
+
+# The Game-class engine's waves, (seconds, mode) on a 1/60 s float clock;
+# -1 lasts for the rest of the level. Level 1: 7,20,7,20,5,20,5,inf
+ARCADE_WAVES = (
+    (7, 'scatter'), (20, 'chase'), (7, 'scatter'), (20, 'chase'),
+    (5, 'scatter'), (20, 'chase'), (5, 'scatter'), (-1, 'chase'),
+)
+# Levels 2-4: shorter final scatter, then chase for good
+ARCADE_WAVES_2 = (
+    (7, 'scatter'), (20, 'chase'), (7, 'scatter'), (20, 'chase'),
+    (5, 'scatter'), (-1, 'chase'),
+)
+# Level 5+: the original lists a single endless chase wave, but play starts
+# in scatter and a first wave never hands over, so these levels stay in scatter
+ARCADE_WAVES_5 = ((-1, 'scatter'),)
+
+ABOUT_TEXT = ("Exact Famicom/Arcade Edition\n"
+              "60 FPS | Procedural Audio\n\n"
+              "[C] Bandai Namco 1980\n"
+              "[C] AC Holdings 1999-2026")
+COPYRIGHT_TEXT = ("PAC-MAN is a trademark of Bandai Namco.\n"
+                  "This is a fan recreation for educational purposes.\n"
+                  "All rights reserved by respective owners.\n\n"
+                  "AC Holdings (c) 1999-2026")
+
+
+class Profile:
+    """One edition's rules and presentation; keyword arguments override
+    the defaults listed in __init__."""
+
+    __slots__ = (
+        'name', 'caption', 'score_variant',
+        # maze and geometry
+        'maze', 'endless', 'maze_size', 'view', 'tile', 'top_pad', 'bottom_pad',
+        # Pac-Man
+        'pac_speed', 'pac_fright_speed', 'eat_radius', 'pre_turn', 'corner_px',
+        # ghosts
+        'ghost_speed', 'fright_speed', 'eaten_speed', 'tunnel_speed',
+        'release_dots', 'pinky_ahead', 'inky_ahead', 'clyde_radius_sq',
+        # timing and scoring
+        'waves', 'fright_frames', 'hit_radius', 'fps',
+        # per-level rules (the Game-class engine only)
+        'pac_speed_step', 'ghost_speed_from', 'elroy', 'elroy_relative',
+        'fright_frames_from', 'fright_reverses', 'level_waves', 'up_overflow',
+        # presentation
+        'window', 'hud', 'menu', 'menu_title', 'menu_hint', 'info_layout',
+        'about', 'copyright',
+    )
+
+    def __init__(self, name, **overrides):
+        self.name = name
+        self.caption = "PAC-MAN - Famicom 60 FPS Exact Edition"
+        self.score_variant = name
+
+        # A shipped maze's name or a .maze path, and the tile geometry
+        self.maze = "famicom"
+        # Endless mode: every level is a freshly generated maze instead
+        self.endless = False
+        # (cols, rows) of the generated mazes
+        self.maze_size = (28, 31)
+        # (cols, rows) of tiles on show, the camera scrolling over a bigger
+        # maze; None shows the whole maze
+        self.view = None
+        self.tile = 16
+        self.top_pad = 48
+        self.bottom_pad = 32
+
+        self.pac_speed = 1.6
+        self.pac_fright_speed = 1.8
+        # Half-size of the box Pac-Man eats pellets with
+        self.eat_radius = 6
+        # Frames of play a turn pressed early is held for before it lapses
+        # (see controls.py); None holds it until Pac-Man can take it
+        self.pre_turn = None
+        # How far before or after a tile centre Pac-Man may take a turn,
+        # from the centre; 0 turns only on crossing it
+        self.corner_px = 0
+
+        self.ghost_speed = 1.4
+        self.fright_speed = 1.0
+        self.eaten_speed = 3.5
+        self.tunnel_speed = 0.8
+        # Dots eaten before each ghost may leave the house. None: never
+        # released, so Blinky stays in once he has been eaten and sent back
+        self.release_dots = (None, 0, 30, 60)
+        self.pinky_ahead = 4
+        self.inky_ahead = 2
+        self.clyde_radius_sq = 64
+
+        self.waves = FAMICOM_WAVES
+        self.fright_frames = 360
+        # A ghost touches Pac-Man when both axis distances are below this
+        self.hit_radius = 14
+        self.fps = 60
+
+        # The Game-class engine (arcade.py) reads these as well. Pac-Man
+        # gains pac_speed_step a level; the *_from tables are ((from level,
+        # value), ...) over the plain field
+        self.pac_speed_step = 0.0
+        self.ghost_speed_from = ()
+        # Cruise Elroy: ((dots left, Blinky's chase speed), ...) for its two
+        # steps; with elroy_relative the speeds are factors, each applied to
+        # the speed before it
+        self.elroy = ((20, 1.0), (10, 1.0))
+        self.elroy_relative = True
+        self.fright_frames_from = ()
+        # Whether ghosts turn around when fright wears off
+        self.fright_reverses = True
+        # ((from level, waves), ...), the waves as (seconds, mode)
+        self.level_waves = ((1, ARCADE_WAVES),)
+        # Tiles per tile ahead that Pinky's and Inky's targets also move
+        # (left, up) while Pac-Man faces up: the arcade's overflow bug
+        self.up_overflow = (1, 0)
+
+        # (width, height) to scale the game into, or None to draw unscaled
+        self.window = None
+        # HUD and READY! layout: "native", "scaled" or "banner"
+        self.hud = "native"
+        # "list" (menu of options and info screens) or "attract" (title only)
+        self.menu = "list"
+        # List menu text: ((font, text, y, lit), ...) with lit lines in
+        # Pac-Man yellow, then (hint, y from bottom)
+        self.menu_title = (("large", "AC Holdings' Pac-Man Game 1.0", 50, True),
+                           ("sys", "[C] Bandai Namco 1980   [C] AC Holdings 1999-2026", 100, False))
+        self.menu_hint = ("Use UP/DOWN arrows to select, ENTER to confirm", 40)
+        # Info screens: title y, body y, line step, blank-line step, hint, hint y from bottom
+        self.info_layout = (100, 180, 30, 15, "Press any key to return to menu", 60)
+        self.about = "AC Holdings' Pac-Man Game 1.0\n" + ABOUT_TEXT
+        self.copyright = COPYRIGHT_TEXT
+
+        for key, value in overrides.items():
+            setattr(self, key, value)
+
+
+PROFILES = {p.name: p for p in (
+    Profile("4k1.xa",
+            window=(600, 400), hud="scaled",
+            menu_title=(("large", "AC'S Holdings Pacman Game! 1.x", 50, True),
+                        ("sys", "[C] Bandai Namco 1980   [C] AC Holdings 1999-2026", 100, False)),
+            about="AC'S Holdings Pacman Game! 1.x\n" + ABOUT_TEXT),
+    Profile("v0",
+            caption="AC HOLDINGS PACMAN ENGINE 0.1",
+            window=(600, 400), hud="banner",
+            menu_title=(("med", "AC HOLDINGS", 40, True), ("sys", "PACMAN ENGINE 0.1", 72, True),
+                        ("small", "[C] Bandai Namco 1980", 105, False),
+                        ("small", "[C] AC Holdings 1999-2026", 122, False)),
+            menu_hint=("UP/DOWN to select, ENTER to confirm", 30),
+            info_layout=(80, 150, 28, 14, "Press any key to return", 40),
+            about="AC Holdings Pacman 1.0\n" + ABOUT_TEXT,
+            copyright=("PAC-MAN is a trademark of\n"
+                       "Bandai Namco Entertainment.\n"
+                       "Fan recreation for educational use.\n"
+                       "All rights to respective owners.\n\n"
+                       "AC Holdings [C] 1999-2026")),
+    Profile("gemini4k1.0", menu="attract"),
+    Profile("ultrahdr-v0"),
+    Profile("endless", caption="PAC-MAN - Endless Mazes", menu="attract", endless=True,
+            corner_px=4),
+    Profile("giant", caption="PAC-MAN - Giant Mazes", menu="attract", endless=True,
+            maze_size=(200, 200), view=(28, 31), corner_px=4),
+    # The Game-class engine's speeds are the arcade's tiles/frame * 16:
+    # Pac-Man 0.80 (+0.1 px a level), ghosts 0.75, frightened 0.50,
+    # eaten 2.00, tunnel 0.40, Cruise Elroy 0.80 and 0.85. There hit_radius
+    # is the distance between centres a ghost touches Pac-Man within
+    Profile("arcade", caption="Pac‑Man (Namco 1:1 AI)",
+            pac_speed=12.8, pac_speed_step=0.1, corner_px=3.0,
+            ghost_speed=12.0, ghost_speed_from=((2, 12.5), (5, 13.0)),
+            fright_speed=8.0, eaten_speed=32.0, tunnel_speed=6.4,
+            elroy=((20, 12.8), (10, 13.6)), elroy_relative=False,
+            release_dots=(0, 0, 30, 60), up_overflow=(1, 1),
+            level_waves=((1, ARCADE_WAVES), (2, ARCADE_WAVES_2), (5, ARCADE_WAVES_5)),
+            fright_frames=360, fright_frames_from=((2, 300), (3, 240), (4, 180), (5, 120)),
+            hit_radius=10),
+    Profile("arcade-legacy", caption="Pac-Man (Namco 1:1 AI)",
+            pac_speed=1.3, corner_px=3.0,
+            ghost_speed=1.25, ghost_speed_from=((2, 1.4), (5, 1.5)),
+            fright_speed=0.8, eaten_speed=3.0, tunnel_speed=0.65,
+            elroy=((20, 1.05), (10, 1.10)),
+            release_dots=(0, 0, 30, 60),
+            fright_frames=600, fright_reverses=False, hit_radius=10),
+)}
@@ -0,0 +1,314 @@
+"""
+Differential simulation across the six engine variants.
+
+Every variant is fed the same seeded joystick script (pacman_headless's
+random_inputs) and its state is sampled after every tick into one common
+form: positions in tile units, directions as U/D/L/R, ghost modes as
+scatter/chase/fright/eaten/house, score, lives and dots left. Each
+variant's trajectory is compared with a reference variant's, and the
+first tick at which a compared field differs is reported with both values.
+
+Over many seeds this shows which differences are systematic (a different
+start tile, wave timing or pellet score shows up on every seed at the same
+tick) and which are knock-on effects of an earlier split. Each field's own
+first differing tick is reported as well, so a fixed difference in one
+field does not hide when the others split.
+
+How each variant is driven:
+
+  $acholdingpacman4k.py     Game stepped directly
+  acholdingpacman4k.py      its import-time loop, read from Game.draw
+  the run_game() scripts    run_game(), read from Edition.play at each flip
+
+The last two run unmodified under pacman_golden's FrameProbe (virtual
+clock, scripted keys, drawing stubbed out). run_game() only starts ticking
+after its ready screen, so its first update is aligned with the engine's
+first tick.
+
+    python pacman_diff.py --seeds 50 --ticks 3600
+    python pacman_diff.py --reference gemini4k1.0pacman4k.py --fields pac
+    python pacman_diff.py --seed 3 --seeds 1 --exact     # one seed, sub-tile
+"""
+
+import os
+import sys
+import time
+import random
+import runpy
+import argparse
+import statistics
+import collections
+import multiprocessing
+
+from pacman_headless import load_engine, random_inputs
+from pacman_golden import FrameProbe, RunOver
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+VARIANTS = {
+    "$acholdingpacman4k.py": "engine",
+    "acholdingpacman4k.py": "script",
+    "#ACHOLDINGPACMAN4K1.Xa.py": "run_game",
+    "$ACHOLDINGPACMANV0.py": "run_game",
+    "gemini4k1.0pacman4k.py": "run_game",
+    "ultrapacmanhdrv0.py": "run_game",
+}
+REFERENCE = "$acholdingpacman4k.py"
+
+
+def fields(n_ghosts=4):
+    """Sample field names, in sample order."""
+    out = ["pac_x", "pac_y", "pac_col", "pac_row", "pac_dir", "score", "lives", "dots_left"]
+    for i in range(n_ghosts):
+        out += [f"g{i}_x", f"g{i}_y", f"g{i}_col", f"g{i}_row", f"g{i}_mode"]
+    return out
+
+
+FIELDS = fields()
+GROUPS = {
+    "pac": [f for f in FIELDS if f.startswith("pac_")],
+    "ghosts": [f for f in FIELDS if f.startswith("g")],
+    "game": ["score", "lives", "dots_left"],
+}
+
+
+# ── Sampling ──────────────────────────────────────────────────────────────────
+def _pos(x, y, tile, top):
+    """Tile-unit position (rounded to 1/100 tile) and the tile it is in."""
+    tx, ty = x / tile, (y - top) / tile
+    return round(tx, 2), round(ty, 2), int(tx // 1), int(ty // 1)
+
+
+def sample_game(ns, game):
+    """A Game-class engine's state; ns holds the engine's module globals."""
+    dirs = {ns.UP: "U", ns.DOWN: "D", ns.LEFT: "L", ns.RIGHT: "R"}
+    G = ns.Ghost
+    modes = {G.SCATTER: "scatter", G.CHASE: "chase", G.FRIGHT: "fright",
+             G.EATEN: "eaten", G.HOUSE: "house"}
+    pac = game.pac
+    out = list(_pos(pac.x, pac.y, ns.TILE, ns.MTOP))
+    out += [dirs.get(pac.dir, "-"), game.score, game.lives, game.dots_left]
+    for g in game.ghosts:
+        out += _pos(g.x, g.y, ns.TILE, ns.MTOP)
+        out.append(modes.get(g.mode, str(g.mode)))
+    return tuple(out)
+
+
+_TUPLE_DIRS = {(0, -1): "U", (0, 1): "D", (-1, 0): "L", (1, 0): "R"}
+
+
+def sample_run_game(ed, play):
+    """A run_game() edition's state, from its Edition.play."""
+    tile, top = ed.maze.tile, ed.maze.top_pad
+    pac = play.pac
+    out = list(_pos(pac.x, pac.y, tile, top))
+    out += [_TUPLE_DIRS.get(tuple(pac.dir), "-"), pac.score, pac.lives,
+            len(play.dots) + len(play.powers)]
+    for g in play.ghosts:
+        out += _pos(g.x, g.y, tile, top)
+        state = "fright" if g.state == "frightened" else g.state
+        out.append("house" if g.in_house else state)
+    return tuple(out)
+
+
+class _TraceProbe(FrameProbe):
+    """Records one sample per tick at each flip, via sample(caller frame)."""
+
+    def __init__(self, pygame, inputs, ticks, fps, sample, offset):
+        # run_game ticks its clock before its first update: deliver input
+        # and number samples one tick later so tick 0 is the first update
+        shifted = [(t + offset, d) for t, d in inputs]
+        super().__init__(pygame, shifted, ticks + offset, 1, fps)
+        self.sample = sample
+        self.offset = offset
+        self.trace = {}
+
+    def flip(self, *args):
+        tick = self.tick - self.offset
+        if tick >= 0:
+            s = self.sample(sys._getframe(1))
+            if s is not None:
+                self.trace[tick] = s
+        self.flips += 1
+        if self.tick >= self.frames:
+            raise RunOver
+
+
+def _fill(trace, ticks):
+    """Samples for 0..ticks-1, repeating the last one over gaps."""
+    out = []
+    last = None
+    for t in range(ticks):
+        last = trace.get(t, last)
+        out.append(last)
+    return out
+
+
+def trace_engine(path, seed, ticks):
+    eng = load_engine(path)
+    game = eng.Game(seed=seed)
+    game.muted = True
+    inputs = dict(random_inputs(seed, ticks))
+    out = []
+    for tick in range(ticks):
+        if tick in inputs:
+            game.pac.next_dir = inputs[tick]
+        game.update()
+        out.append(sample_game(eng, game))
+    return out
+
+
+def trace_run_game(path, seed, ticks):
+    import pygame
+    from pacman_scores import ScoreStore
+    ed = load_engine(path).edition
+
+    def sample(frame):
+        return sample_run_game(ed, ed.play) if ed.play is not None else None
+
+    probe = _TraceProbe(pygame, random_inputs(seed, ticks), ticks, ed.profile.fps, sample, 1)
+    random.seed(seed)
+
+    def games():
+        while True:
+            ed.run_game()
+
+    board = ScoreStore(":memory:", variant="diff")
+    probe.run(probe.hooks(ed, draw=False) + [(ed, "scores", board)], games)
+    return _fill(probe.trace, ticks)
+
+
+def trace_script(path, seed, ticks):
+    import types
+    import pygame
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    ns = []
+
+    def sample(frame):
+        # flip is called from Game.draw: self is the game, f_globals the script
+        if not ns:
+            ns.append(types.SimpleNamespace(**frame.f_globals))
+        return sample_game(ns[0], frame.f_locals["self"])
+
+    # The loop runs events -> update -> draw -> clock.tick, so no offset
+    probe = _TraceProbe(pygame, random_inputs(seed, ticks), ticks, 60, sample, 0)
+    random.seed(seed)
+    probe.run(probe.hooks(draw=False), lambda: runpy.run_path(path, run_name="pacman_diff_script"))
+    return _fill(probe.trace, ticks)
+
+
+TRACERS = {"engine": trace_engine, "run_game": trace_run_game, "script": trace_script}
+
+
+def trace(job):
+    """Worker: (name, seed, ticks) -> (name, seed, samples)."""
+    name, seed, ticks = job
+    return name, seed, TRACERS[VARIANTS[name]](os.path.join(HERE, name), seed, ticks)
+
+
+# ── Comparing ─────────────────────────────────────────────────────────────────
+def first_divergence(ref, other, columns):
+    """(tick, [(field, ref value, other value)]) of the first difference, or None."""
+    for tick, (a, b) in enumerate(zip(ref, other)):
+        if a is None or b is None:
+            continue
+        diff = [(FIELDS[i], a[i], b[i]) for i in columns if a[i] != b[i]]
+        if diff:
+            return tick, diff
+    return None
+
+
+def field_divergence(ref, other, columns):
+    """{field: first tick it differs}, each field on its own."""
+    out = {}
+    for tick, (a, b) in enumerate(zip(ref, other)):
+        if a is None or b is None:
+            continue
+        for i in columns:
+            if a[i] != b[i] and FIELDS[i] not in out:
+                out[FIELDS[i]] = tick
+        if len(out) == len(columns):
+            break
+    return out
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    ap.add_argument("--seeds", type=int, default=20)
+    ap.add_argument("--seed", type=int, default=0, help="first seed")
+    ap.add_argument("--ticks", type=int, default=60 * 60)
+    ap.add_argument("--reference", default=REFERENCE, choices=sorted(VARIANTS))
+    ap.add_argument("--variant", action="append", choices=sorted(VARIANTS),
+                    help="compare only these (repeatable; default: all)")
+    ap.add_argument("--fields", action="append", choices=sorted(GROUPS),
+                    help="compare only these field groups (repeatable; default: all)")
+    ap.add_argument("--exact", action="store_true",
+                    help="also compare sub-tile positions (default: tiles only)")
+    ap.add_argument("--jobs", type=int, default=0, help="processes (0 = one per core)")
+    args = ap.parse_args(argv)
+
+    names = [n for n in (args.variant or VARIANTS) if n != args.reference]
+    wanted = set()
+    for group in args.fields or GROUPS:
+        wanted.update(GROUPS[group])
+    if not args.exact:
+        wanted -= {f for f in FIELDS if f.endswith("_x") or f.endswith("_y")}
+    columns = [i for i, f in enumerate(FIELDS) if f in wanted]
+
+    seeds = range(args.seed, args.seed + args.seeds)
+    jobs = [(name, seed, args.ticks) for seed in seeds for name in [args.reference] + names]
+    started = time.perf_counter()
+    traces = {}
+    # close/join rather than the context manager: its terminate() sends
+    # SIGTERM, which SDL in the workers turns into a QUIT event
+    pool = multiprocessing.get_context("spawn").Pool(args.jobs or os.cpu_count() or 1)
+    try:
+        for name, seed, samples in pool.imap_unordered(trace, jobs):
+            traces[name, seed] = samples
+    finally:
+        pool.close()
+        pool.join()
+    elapsed = time.perf_counter() - started
+
+    print(f"reference {args.reference}; {len(seeds)} seeds x {args.ticks} ticks, "
+          f"{len(jobs) * args.ticks} ticks simulated in {elapsed:.2f}s")
+    for name in names:
+        ticks = []
+        first_fields = collections.Counter()
+        example = None
+        for seed in seeds:
+            hit = first_divergence(traces[args.reference, seed], traces[name, seed], columns)
+            if hit is None:
+                continue
+            ticks.append(hit[0])
+            first_fields.update(f for f, _, _ in hit[1])
+            if example is None or hit[0] < example[1]:
+                example = (seed, hit[0], hit[1])
+        print(f"\n{name}")
+        if not ticks:
+            print(f"  identical on all {len(seeds)} seeds")
+            continue
+        print(f"  diverges on {len(ticks)}/{len(seeds)} seeds; first tick "
+              f"min {min(ticks)}  median {statistics.median(ticks):g}  max {max(ticks)}")
+        print("  first differing fields: " + ", ".join(
+            f"{f} x{n}" for f, n in first_fields.most_common(8)))
+        seed, tick, diff = example
+        print(f"  earliest: seed {seed} tick {tick}")
+        for f, a, b in diff[:8]:
+            print(f"    {f:10s} {a!s:>10} -> {b!s}")
+
+        # Each field on its own: a field that splits at tick 0 on every seed
+        # is a fixed difference; one that splits late is usually a knock-on
+        per_field = collections.defaultdict(list)
+        for seed in seeds:
+            for f, t in field_divergence(traces[args.reference, seed],
+                                         traces[name, seed], columns).items():
+                per_field[f].append(t)
+        print("  per field (seeds diverged, median first tick):")
+        rows = sorted(per_field.items(), key=lambda kv: (statistics.median(kv[1]), kv[0]))
+        for f, ts in rows:
+            print(f"    {f:10s} {len(ts):4d}/{len(seeds)}  {statistics.median(ts):8g}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
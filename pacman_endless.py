@@ -0,0 +1,33 @@
+"""
+Endless mode: a freshly generated maze for every level.
+
+Mazes come from pacman_core.mazegen (mirror-symmetric, no dead ends, one
+connected corridor graph, a tunnel and the ghost house); the next one is
+generated and drawn during the pause after a level is cleared. --seed
+makes the run repeatable: the same mazes, and the same frightened-ghost
+choices.
+
+    python pacman_endless.py [--seed N]
+"""
+
+import sys
+import random
+import argparse
+
+from pacman_core import Edition, PROFILES
+
+edition = Edition(PROFILES["endless"])
+run_game = edition.run_game
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    ap.add_argument("--seed", type=int, default=None)
+    args = ap.parse_args(argv)
+    if args.seed is not None:
+        random.seed(args.seed)
+    edition.main()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,370 @@
+"""
+Input fuzzer with per-tick invariant checks, over a process pool.
+
+Each case plays one seeded game with a generated next_dir script and checks
+the game state after every tick:
+
+  bounds    every entity's position maps to a row and column in the maze
+            (the tunnel row may run one tile past either edge)
+  wall      no entity moves onto a wall tile; Pac-Man never onto the door
+  spawn     no entity is placed on one (at the start or by a reset)
+  dots      the dot counter agrees with the dots left in the maze
+  lives     lives never go negative
+
+A case always runs to the end and reports the first breach of each
+invariant, so a bad start position does not hide what happens later.
+
+Targets are the Game-class engine, stepped directly with no drawing under
+its "arcade" profile (engine) or the legacy script's (legacy), and the
+run_game() scripts, run unmodified under pacman_golden's FrameProbe
+with the checks made at every flip on the game run_game exposes
+(Edition.play) and pygame's drawing calls stubbed out for the run.
+
+Input strategies range from a player's long holds to per-tick direction
+changes and rapid reversals. A failing case is shrunk (inputs after the
+failure dropped, then input changes removed while the same invariant
+still breaks) and saved as JSON: target, seed, hard flag, tick count,
+the (tick, direction) input script and the failure. --replay re-checks
+any of them; an engine failure is also a recording pacman_video.py can
+render, while a legacy or run_game() script's has no renderer:
+
+    python pacman_fuzz.py --cases 2000 --ticks 20000
+    python pacman_fuzz.py --target ultrapacmanhdrv0.py --strategy reverse
+    python pacman_fuzz.py --replay fuzz_failures/engine-wall-jitter-17.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import multiprocessing
+
+from pacman_headless import load_engine, DEFAULT_ENGINE
+from pacman_golden import FrameProbe, RunOver
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+RUN_GAME_TARGETS = ("#ACHOLDINGPACMAN4K1.Xa.py", "$ACHOLDINGPACMANV0.py",
+                    "gemini4k1.0pacman4k.py", "ultrapacmanhdrv0.py", "pacman_endless.py",
+                    "pacman_giant.py")
+# Game-class engine targets and the profile each plays
+ENGINE_PROFILES = {"engine": "arcade", "legacy": "arcade-legacy"}
+TARGETS = tuple(ENGINE_PROFILES) + RUN_GAME_TARGETS
+OPPOSITE = (1, 0, 3, 2)     # UP, DOWN, LEFT, RIGHT
+
+
+# ── Input Strategies ──────────────────────────────────────────────────────────
+def _holds(rng, ticks, lo, hi, pick):
+    inputs = []
+    t = 0
+    d = rng.randrange(4)
+    while True:
+        t += rng.randint(lo, hi)
+        if t >= ticks:
+            return inputs
+        d = pick(rng, d)
+        inputs.append((t, d))
+
+
+def strategy_random(rng, ticks):
+    """A player's pace: hold a random direction for 5-200 ticks."""
+    return _holds(rng, ticks, 5, 200, lambda rng, d: rng.randrange(4))
+
+
+def strategy_jitter(rng, ticks):
+    """A new random direction every 1-3 ticks."""
+    return _holds(rng, ticks, 1, 3, lambda rng, d: rng.randrange(4))
+
+
+def strategy_reverse(rng, ticks):
+    """Flip to the opposite direction every 1-8 ticks, turning now and then."""
+    return _holds(rng, ticks, 1, 8,
+                  lambda rng, d: rng.randrange(4) if rng.random() < 0.1 else OPPOSITE[d])
+
+
+def strategy_burst(rng, ticks):
+    """Long holds broken by bursts of per-tick changes."""
+    inputs = []
+    t = 0
+    while t < ticks:
+        t += rng.randint(20, 300)
+        for _ in range(rng.randint(2, 30)):
+            if t >= ticks:
+                break
+            inputs.append((t, rng.randrange(4)))
+            t += 1
+    return [(at, d) for at, d in inputs if at < ticks]
+
+
+STRATEGIES = {"random": strategy_random, "jitter": strategy_jitter,
+              "reverse": strategy_reverse, "burst": strategy_burst}
+
+
+# ── Invariants ────────────────────────────────────────────────────────────────
+class Checker:
+    """The first breach of each invariant in one run: {kind: (tick, detail)}."""
+
+    def __init__(self):
+        self.first = {}
+        self.start = {}         # entity index -> first position seen
+        self.blocked = {}       # entity index -> on a wall tile at the last check
+
+    def fail(self, kind, tick, detail):
+        if kind not in self.first:
+            self.first[kind] = (tick, detail)
+
+    def position(self, i, x, y, tile, blocked, tick):
+        start = self.start.setdefault(i, (x, y))
+        if blocked and not self.blocked.get(i):
+            # Back at its start position on a wall: placed there by a reset
+            self.fail("spawn" if (x, y) == start else "wall", tick,
+                      f"{_who(i)} on tile {tile} at ({x:.2f}, {y:.2f})")
+        self.blocked[i] = blocked
+
+
+def _who(i):
+    return "pacman" if i == 0 else f"ghost {i - 1}"
+
+
+def check_game(eng, game, tick, chk):
+    """The invariants for a Game-class engine after a tick."""
+    maze = game.maze
+    top, bottom = eng.GRID_Y0, eng.GRID_Y0 + eng.ROWS * eng.TILE
+    left_x, right_x = -eng.TILE, eng.WIN_W + eng.TILE
+    tile, cols, wall, door = eng.TILE, eng.COLS, eng.W, eng.G
+    i = 0
+    for e in (game.pac, *game.ghosts):
+        x, y = e.x, e.y
+        if not (top <= y < bottom and left_x <= x < right_x):
+            chk.fail("bounds", tick, f"{_who(i)} at ({x:.2f}, {y:.2f})")
+        else:
+            c = int((x - eng.GRID_X0) // tile) % cols
+            r = int((y - top) // tile)
+            t = maze[r * cols + c]
+            blocked = t == wall or (t == door and i == 0)
+            if blocked or chk.blocked.get(i):
+                chk.position(i, x, y, (c, r), blocked, tick)
+            elif i not in chk.start:
+                chk.position(i, x, y, (c, r), False, tick)
+        i += 1
+    if game.dots_left != maze.count(eng.D) + maze.count(eng.P):
+        chk.fail("dots", tick, f"dots_left {game.dots_left}, "
+                               f"maze has {maze.count(eng.D) + maze.count(eng.P)}")
+    if game.lives < 0:
+        chk.fail("lives", tick, f"lives {game.lives}")
+
+
+def check_run_game(play, tick, chk):
+    """The invariants for a run_game() edition, from its Edition.play
+    (the level's maze among them: endless mode changes it)."""
+    maze, pac = play.maze, play.pac
+    total_dots = maze.pellet_count()
+    for i, e in enumerate([pac] + play.ghosts):
+        c, r = int(e.x // maze.tile), int((e.y - maze.top_pad) // maze.tile)
+        lo = -1 if r in maze.tunnel_rows else 0
+        if not (0 <= r < maze.nrows and lo <= c < maze.cols - lo):
+            chk.fail("bounds", tick, f"{_who(i)} at ({e.x:.2f}, {e.y:.2f})")
+            continue
+        chk.position(i, e.x, e.y, (c, r), maze.is_wall(c, r, allow_door=i > 0), tick)
+    left = len(play.dots) + len(play.powers)
+    if left + play.dots_eaten != total_dots:
+        chk.fail("dots", tick, f"{left} left + {play.dots_eaten} eaten != {total_dots}")
+    if pac.lives < 0:
+        chk.fail("lives", tick, f"lives {pac.lives}")
+
+
+# ── Runners ───────────────────────────────────────────────────────────────────
+def run_engine(inputs, seed, ticks, hard=False, engine=DEFAULT_ENGINE, profile="arcade"):
+    """Play a case on the Game-class engine; (ticks run, first breaches)."""
+    eng = load_engine(engine)
+    game = eng.Game(hard=hard, seed=seed, profile=eng.PROFILES[profile])
+    game.muted = True
+    chk = Checker()
+    check_game(eng, game, -1, chk)          # the start positions
+    pending = dict(inputs)
+    for tick in range(ticks):
+        if tick in pending:
+            game.pac.next_dir = pending[tick]
+        game.update()
+        check_game(eng, game, tick, chk)
+    return ticks, chk.first
+
+
+class _CheckingProbe(FrameProbe):
+    """A FrameProbe that checks invariants at every flip instead of hashing."""
+
+    def __init__(self, pygame, ed, inputs, ticks):
+        super().__init__(pygame, inputs, ticks, 1, ed.profile.fps)
+        self.ed = ed
+        self.chk = Checker()
+
+    def flip(self, *args):
+        # Menus flip too; only a game in progress is checked
+        if self.ed.play is not None:
+            check_run_game(self.ed.play, self.tick, self.chk)
+        self.flips += 1
+        if self.tick >= self.frames:
+            raise RunOver
+
+
+_boards = {}
+
+
+def run_script(target, inputs, seed, ticks):
+    """Play a case on a run_game() script; (ticks run, first breaches)."""
+    import pygame
+    from pacman_scores import ScoreStore
+    ed = load_engine(os.path.join(HERE, target)).edition
+    if target not in _boards:
+        _boards[target] = ScoreStore(":memory:", variant="fuzz")
+    probe = _CheckingProbe(pygame, ed, inputs, ticks)
+    random.seed(seed)
+
+    def games():
+        while True:
+            ed.run_game()
+
+    probe.run(probe.hooks(ed, draw=False) + [(ed, "scores", _boards[target])], games)
+    return probe.tick, probe.chk.first
+
+
+def run_case(target, inputs, seed, ticks, hard=False):
+    if target in ENGINE_PROFILES:
+        return run_engine(inputs, seed, ticks, hard, profile=ENGINE_PROFILES[target])
+    return run_script(target, inputs, seed, ticks)
+
+
+def fuzz_case(case):
+    """Worker: (target, strategy, seed, ticks, hard) -> (case, ticks, breaches, seconds)."""
+    target, strategy, seed, ticks, hard = case
+    inputs = STRATEGIES[strategy](random.Random(seed), ticks)
+    started = time.perf_counter()
+    ran, breaches = run_case(target, inputs, seed, ticks, hard)
+    return case, ran, breaches, time.perf_counter() - started
+
+
+# ── Minimizing ────────────────────────────────────────────────────────────────
+def minimize(target, inputs, seed, ticks, hard, kind):
+    """Fewest ticks and input changes that still break the same invariant.
+
+    Returns (inputs, tick, detail) for the smallest case found.
+    """
+
+    def fails(trial, limit):
+        return run_case(target, trial, seed, limit, hard)[1].get(kind, (None, None))
+
+    at, detail = fails(inputs, ticks)
+    inputs = [(t, d) for t, d in inputs if t <= at]
+    chunk = max(1, len(inputs) // 2)
+    while chunk:
+        i = 0
+        while i < len(inputs):
+            trial = inputs[:i] + inputs[i + chunk:]
+            hit, why = fails(trial, at + 1)
+            if hit is not None:
+                inputs, at, detail = [(t, d) for t, d in trial if t <= hit], hit, why
+            else:
+                i += chunk
+        chunk //= 2
+    return inputs, at, detail
+
+
+def save_failure(out, target, strategy, seed, hard, inputs, at, kind, detail):
+    """Write a minimized failure as JSON for --replay.
+
+    The fields are a pacman_video recording's plus the target and the
+    failure, so only the engine's failures can be rendered with it.
+    """
+    os.makedirs(out, exist_ok=True)
+    stem = target if target in ENGINE_PROFILES else os.path.splitext(target)[0].strip("#$")
+    path = os.path.join(out, f"{stem}-{kind}-{strategy}-{seed}.json")
+    rec = {"target": target, "seed": seed, "hard": hard, "ticks": max(1, at + 1),
+           "inputs": [[t, d] for t, d in inputs],
+           "failure": {"kind": kind, "detail": detail, "tick": at}}
+    with open(path, "w") as f:
+        json.dump(rec, f)
+    return path
+
+
+def replay(path):
+    with open(path) as f:
+        rec = json.load(f)
+    inputs = [(int(t), int(d)) for t, d in rec["inputs"]]
+    ticks, breaches = run_case(rec["target"], inputs, rec["seed"], rec["ticks"],
+                               rec.get("hard", False))
+    for kind, (tick, detail) in sorted(breaches.items(), key=lambda kv: kv[1][0]):
+        print(f"{path}: tick {tick}: {kind}: {detail}")
+    if not breaches:
+        print(f"{path}: no failure in {ticks} ticks")
+    return 1 if breaches else 0
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    ap.add_argument("--cases", type=int, default=200)
+    ap.add_argument("--ticks", type=int, default=20000, help="ticks per case")
+    ap.add_argument("--seed", type=int, default=0, help="first case seed")
+    ap.add_argument("--target", action="append", choices=TARGETS,
+                    help="engine, legacy or a run_game script (repeatable; default: all)")
+    ap.add_argument("--strategy", action="append", choices=sorted(STRATEGIES),
+                    help="input strategy (repeatable; default: all)")
+    ap.add_argument("--hard", action="store_true", help="shortest-path ghost AI (engine, legacy)")
+    ap.add_argument("--jobs", type=int, default=0, help="processes (0 = one per core)")
+    ap.add_argument("--out", default="fuzz_failures", help="where minimized failures go")
+    ap.add_argument("--replay", metavar="FILE", help="re-check a saved failure")
+    args = ap.parse_args(argv)
+
+    if args.replay:
+        return replay(args.replay)
+
+    targets = args.target or list(TARGETS)
+    strategies = args.strategy or sorted(STRATEGIES)
+    cases = [(targets[i % len(targets)], strategies[(i // len(targets)) % len(strategies)],
+              args.seed + i, args.ticks, args.hard) for i in range(args.cases)]
+
+    started = time.perf_counter()
+    total = 0
+    per_target = {}             # target -> [ticks, seconds]
+    first = {}                  # (target, kind) -> (case, tick, detail, cases hit)
+    jobs = args.jobs or os.cpu_count() or 1
+    # close/join rather than the context manager: its terminate() sends
+    # SIGTERM, which SDL in the workers turns into a QUIT event
+    pool = multiprocessing.get_context("spawn").Pool(jobs)
+    try:
+        for case, ticks, breaches, seconds in pool.imap_unordered(fuzz_case, cases, chunksize=4):
+            total += ticks
+            spent = per_target.setdefault(case[0], [0, 0.0])
+            spent[0] += ticks
+            spent[1] += seconds
+            for kind, (tick, detail) in breaches.items():
+                key = (case[0], kind)
+                if key in first:
+                    first[key][3] += 1
+                else:
+                    first[key] = [case, tick, detail, 1]
+    finally:
+        pool.close()
+        pool.join()
+    elapsed = time.perf_counter() - started
+
+    # Shrink one case per (target, invariant); the rest are likely the same bug
+    for (target, kind), (case, tick, detail, hits) in sorted(first.items()):
+        _, strategy, seed, ticks, hard = case
+        print(f"FAIL {target} {kind} in {hits} case(s); first: {strategy} seed {seed} "
+              f"tick {tick}: {detail}")
+        inputs = STRATEGIES[strategy](random.Random(seed), ticks)
+        small, at, detail = minimize(target, inputs, seed, ticks, hard, kind)
+        path = save_failure(args.out, target, strategy, seed, hard, small, at, kind, detail)
+        print(f"  minimized to {len(small)} inputs, {at + 1} ticks -> {path}")
+
+    for target, (ticks, seconds) in per_target.items():
+        print(f"  {target:28s} {ticks:10d} ticks  {ticks / max(seconds, 1e-9):8.0f} ticks/s per process")
+    print(f"{len(cases)} cases, {total} ticks in {elapsed:.2f}s "
+          f"({total / max(elapsed, 1e-9) * 60 / 1e6:.2f}M ticks/min), "
+          f"{len(first)} distinct failure(s)")
+    return 1 if first else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+"""
+Giant mazes: endless mode on generated mazes far bigger than the screen.
+
+Each level is a new generated maze (200x200 tiles by default) seen
+through a 28x31-tile camera that follows Pac-Man; the walls are drawn
+from cached chunks and nothing out of view is drawn, so the frame rate
+does not depend on the maze's size. --seed makes the run repeatable.
+
+    python pacman_giant.py [--size 200x200] [--seed N]
+"""
+
+import sys
+import random
+import argparse
+
+from pacman_core import Edition, PROFILES
+
+edition = Edition(PROFILES["giant"])
+run_game = edition.run_game
+
+
+def _size(text):
+    cols, _, rows = text.partition("x")
+    return int(cols), int(rows)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    ap.add_argument("--size", type=_size, default=None, help="COLSxROWS, width even")
+    ap.add_argument("--seed", type=int, default=None)
+    args = ap.parse_args(argv)
+    if args.size is not None:
+        edition.profile.maze_size = args.size
+    if args.seed is not None:
+        random.seed(args.seed)
+    edition.main()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,313 @@
+"""
+Golden-frame regression harness: pixel-exact checks of every variant.
+
+Each variant is driven headlessly through a seeded, scripted input sequence
+and the display surface is hashed (CRC-32 of its RGB bytes) every N frames.
+The hashes are compared with the stored values in pacman_golden.json, so a
+rendering change that is meant to be invisible (layer caching, atlases,
+dirty rectangles) can be checked to be exactly that.
+
+The variants are driven in one of three ways:
+
+  engine    the Game class: update every tick, draw the sampled frames to
+            an off-screen Surface with a frame-derived blink time
+  run_game  the script's edition's run_game() under hooks: pygame's clock,
+            wait, get_ticks, event queue and flip are replaced by a virtual
+            clock, the scripted key presses and the hasher
+  script    a script whose loop runs at import, executed under the same hooks
+
+Every variant runs in a fresh process, since the scripts open their window
+when imported and the hooks patch pygame process-wide.
+
+    python pacman_golden.py                 # check against the stored hashes
+    python pacman_golden.py --update        # re-record them
+    python pacman_golden.py --variant gemini4k1.0pacman4k.py
+"""
+
+import os
+import sys
+import json
+import time
+import zlib
+import random
+import runpy
+import argparse
+import multiprocessing
+
+from pacman_headless import load_engine, random_inputs
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+GOLDEN = os.path.join(HERE, "pacman_golden.json")
+FRAMES = 3600           # one minute at 60 FPS
+EVERY = 10              # frames between hashes
+
+VARIANTS = {
+    "$acholdingpacman4k.py": "engine",
+    "#ACHOLDINGPACMAN4K1.Xa.py": "run_game",
+    "$ACHOLDINGPACMANV0.py": "run_game",
+    "gemini4k1.0pacman4k.py": "run_game",
+    "ultrapacmanhdrv0.py": "run_game",
+    "pacman_endless.py": "run_game",
+    "pacman_giant.py": "run_game",
+    "acholdingpacman4k.py": "script",
+}
+
+
+def surface_crc(pygame, surf):
+    return zlib.crc32(pygame.image.tobytes(surf, "RGB"))
+
+
+# ── Drivers ───────────────────────────────────────────────────────────────────
+class RunOver(Exception):
+    """Raised by a probe's hooks to end the run."""
+
+
+class FrameProbe:
+    """Stands in for pygame's clock, input and display for one scripted run.
+
+    Time only moves when the game ticks its clock or waits, so frames are a
+    function of the frame number alone. Key presses are delivered on the
+    tick they are scripted for; every `every`-th flip is hashed, and the
+    run is stopped after `frames` flips.
+    """
+
+    def __init__(self, pygame, inputs, frames, every, fps):
+        keys = (pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT)
+        self.pygame = pygame
+        self.script = {}
+        for at, d in inputs:
+            self.script.setdefault(at, []).append(keys[d])
+        self.frames = frames
+        self.every = every
+        self.step_ms = 1000 // fps
+        self.tick = 0
+        self.ms = 0
+        self.flips = 0
+        self.crcs = []
+
+    # pygame.time
+    def tick_clock(self, framerate=0):
+        self.tick += 1
+        self.ms += self.step_ms
+        return self.step_ms
+
+    def get_ticks(self):
+        return self.ms
+
+    def wait(self, ms):
+        self.ms += ms
+        return ms
+
+    # pygame.event
+    def get_events(self, *args, **kwargs):
+        pg = self.pygame
+        return [pg.event.Event(pg.KEYDOWN, key=k, mod=0, unicode="", scancode=0)
+                for k in self.script.pop(self.tick, ())]
+
+    # pygame.display
+    def flip(self, *args):
+        if self.flips % self.every == 0:
+            self.crcs.append(surface_crc(self.pygame, self.pygame.display.get_surface()))
+        self.flips += 1
+        if self.flips >= self.frames:
+            raise RunOver
+
+    def hooks(self, module=None, draw=True):
+        """(owner, attribute, replacement) for everything the probe replaces.
+
+        With draw=False pygame's drawing calls and scaling become no-ops too,
+        for runs that only look at game state.
+        """
+        pg = self.pygame
+        clock = _ClockView(self)
+        out = [(pg.time, "Clock", lambda: clock), (pg.time, "get_ticks", self.get_ticks),
+               (pg.time, "wait", self.wait), (pg.time, "delay", self.wait),
+               (pg.event, "get", self.get_events),
+               (pg.display, "flip", self.flip), (pg.display, "update", self.flip)]
+        if module is not None and hasattr(module, "clock"):
+            out.append((module, "clock", clock))
+        if not draw:
+            out += [(pg.draw, name, _no_draw) for name in
+                    ("rect", "circle", "ellipse", "polygon", "line", "lines", "arc", "aaline")]
+            out.append((pg.transform, "scale", lambda surf, size, *args: surf))
+        return out
+
+    def run(self, hooks, body):
+        """Call body() with hooks installed until it returns or the run ends."""
+        saved = [(owner, name, getattr(owner, name)) for owner, name, _ in hooks]
+        for owner, name, value in hooks:
+            setattr(owner, name, value)
+        try:
+            body()
+        except RunOver:
+            pass
+        finally:
+            for owner, name, value in saved:
+                setattr(owner, name, value)
+        return self.crcs
+
+
+def _no_draw(*args, **kwargs):
+    return None
+
+
+class _ClockView:
+    """The Clock the scripts tick; advances the probe's virtual time."""
+    __slots__ = ('probe',)
+
+    def __init__(self, probe):
+        self.probe = probe
+
+    def tick(self, framerate=0):
+        return self.probe.tick_clock(framerate)
+
+    def tick_busy_loop(self, framerate=0):
+        return self.probe.tick_clock(framerate)
+
+    def get_fps(self):
+        return 1000 / self.probe.step_ms
+
+
+def drive_engine(path, seed, frames, every):
+    eng = load_engine(path)
+    game = eng.Game(seed=seed)
+    game.muted = True
+    surf = eng.pygame.Surface((eng.WIN_W, eng.WIN_H))
+    inputs = dict(random_inputs(seed, frames))
+    crcs = []
+    for frame in range(frames):
+        if frame in inputs:
+            game.pac.next_dir = inputs[frame]
+        game.update()
+        if frame % every == 0:
+            game.draw(surf, tick=frame)
+            crcs.append(surface_crc(eng.pygame, surf))
+    return crcs
+
+
+def drive_run_game(path, seed, frames, every):
+    import pygame
+    from pacman_scores import ScoreStore
+    ed = load_engine(path).edition
+    probe = FrameProbe(pygame, random_inputs(seed, frames), frames, every, ed.profile.fps)
+    # a private board, so the HUD's high score is the same every run
+    hooks = probe.hooks(ed) + [(ed, "scores", ScoreStore(":memory:", variant="golden"))]
+    random.seed(seed)
+
+    def games():
+        while True:             # game over: start another, as the menu would
+            ed.run_game()
+
+    return probe.run(hooks, games)
+
+
+def drive_script(path, seed, frames, every):
+    import pygame
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    probe = FrameProbe(pygame, random_inputs(seed, frames), frames, every, 60)
+    random.seed(seed)
+    return probe.run(probe.hooks(), lambda: runpy.run_path(path, run_name="pacman_golden_script"))
+
+
+DRIVERS = {"engine": drive_engine, "run_game": drive_run_game, "script": drive_script}
+
+
+def run_variant(job):
+    """Worker: (name, kind, seed, frames, every) -> (name, crcs, seconds)."""
+    name, kind, seed, frames, every = job
+    started = time.perf_counter()
+    crcs = DRIVERS[kind](os.path.join(HERE, name), seed, frames, every)
+    return name, crcs, time.perf_counter() - started
+
+
+def run_all(names, seed, frames, every, jobs=0):
+    """Hash every named variant, each in a fresh process; {name: (crcs, seconds)}."""
+    work = [(name, VARIANTS[name], seed, frames, every) for name in names]
+    jobs = jobs or os.cpu_count() or 1
+    # close/join rather than the context manager: its terminate() sends
+    # SIGTERM, which SDL in the workers turns into a QUIT event
+    pool = multiprocessing.get_context("spawn").Pool(min(jobs, len(work)), maxtasksperchild=1)
+    try:
+        done = pool.map(run_variant, work, chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+    return {name: (crcs, seconds) for name, crcs, seconds in done}
+
+
+# ── Golden File ───────────────────────────────────────────────────────────────
+def load_golden(path=GOLDEN):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(expected, actual, every):
+    """None if equal, else a description of the first difference."""
+    for i, (want, got) in enumerate(zip(expected, actual)):
+        if want != got:
+            return f"first differs at frame {i * every} (sample {i}: {want} != {got})"
+    if len(expected) != len(actual):
+        return f"{len(actual)} samples, expected {len(expected)}"
+    return None
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    ap.add_argument("--update", action="store_true", help="re-record the golden hashes")
+    ap.add_argument("--variant", action="append", choices=sorted(VARIANTS),
+                    help="only this variant (repeatable)")
+    ap.add_argument("--frames", type=int, default=FRAMES, help="with --update")
+    ap.add_argument("--every", type=int, default=EVERY, help="with --update")
+    ap.add_argument("--seed", type=int, default=1, help="with --update")
+    ap.add_argument("--jobs", type=int, default=0, help="processes (0 = one per core)")
+    ap.add_argument("--golden", default=GOLDEN)
+    args = ap.parse_args(argv)
+
+    golden = load_golden(args.golden)
+    if not args.update and golden is None:
+        ap.error(f"{args.golden} not found; record it with --update")
+    if args.update:
+        params = {"seed": args.seed, "frames": args.frames, "every": args.every}
+    else:
+        params = {k: golden[k] for k in ("seed", "frames", "every")}
+    names = args.variant or list(VARIANTS)
+
+    started = time.perf_counter()
+    results = run_all(names, params["seed"], params["frames"], params["every"], args.jobs)
+    elapsed = time.perf_counter() - started
+
+    failed = 0
+    for name in names:
+        crcs, seconds = results[name]
+        hexes = [f"{c:08x}" for c in crcs]
+        rate = len(crcs) * params["every"] / max(seconds, 1e-9)
+        if args.update:
+            status = "recorded"
+        else:
+            want = golden["variants"].get(name)
+            diff = "no golden hashes" if want is None else compare(want, hexes, params["every"])
+            status = "ok" if diff is None else "FAIL: " + diff
+            failed += diff is not None
+        print(f"{name:28s} {len(crcs):5d} hashes  {rate:7.0f} frames/s  {status}")
+        results[name] = hexes
+
+    if args.update:
+        if golden and golden.get("seed") == params["seed"] and golden.get("frames") == params["frames"] \
+                and golden.get("every") == params["every"]:
+            kept = golden["variants"]
+        else:
+            kept = {}
+        kept.update({name: results[name] for name in names})
+        with open(args.golden, "w") as f:
+            json.dump(dict(params, variants=kept), f, indent=1)
+            f.write("\n")
+        print(f"wrote {args.golden}")
+    print(f"{len(names)} variants in {elapsed:.2f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
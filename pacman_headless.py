@@ -0,0 +1,139 @@
+"""
+Headless batch runner for the Game-class engine ($acholdingpacman4k.py).
+
+Runs whole games without a window or audio output, driven by seeded random
+joystick input, and prints the resulting score distribution. Every tick
+runs through Game.update; --fast-forward advances the clock with
+Game.fast_forward instead, which jumps over ticks in which nothing but
+straight-line motion and timer countdown happens. Both produce identical
+games, so comparing them checks the event horizon. It is not a speedup:
+at this engine's speeds a ghost reaches a tile centre every tick of play,
+so only the READY and DEAD freezes are skipped (about 1.6 ticks per
+update), and computing the horizon costs about what those cheap ticks do.
+
+    python pacman_headless.py --games 200 --ticks 100000 --seed 1
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import importlib.util
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_ENGINE = os.path.join(HERE, "$acholdingpacman4k.py")
+
+_engines = {}
+
+
+def load_engine(path=DEFAULT_ENGINE, headless=True):
+    """Import an engine script by path (the file names are not identifiers).
+
+    The engine opens its window and mixer at import time, so headless SDL
+    drivers (no window, no sound card) are selected before the first load.
+    """
+    if headless:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    path = os.path.abspath(path)
+    if path not in _engines:
+        name = "pacman_engine_%d" % len(_engines)
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+        _engines[path] = module
+    return _engines[path]
+
+
+def random_inputs(seed, ticks, hold=(5, 200)):
+    """Seeded joystick script: sorted list of (tick, direction) changes."""
+    rng = random.Random(seed)
+    inputs = []
+    t = 0
+    while True:
+        t += rng.randint(*hold)
+        if t >= ticks:
+            return inputs
+        inputs.append((t, rng.randrange(4)))
+
+
+def play(engine, seed, inputs, max_ticks, event_driven=False, hard=False):
+    """Play one game to GAMEOVER or max_ticks and return its summary.
+
+    inputs is a list of (tick, direction) pairs; a direction is applied to
+    Pac-Man's next_dir just before that tick runs. The game's RNG
+    (frightened ghosts) is seeded, so a (seed, inputs) pair is a replay.
+    """
+    game = engine.Game(hard=hard, seed=seed)
+    game.muted = True
+
+    tick = 0
+    updates = 0
+    pending = list(inputs) + [(max_ticks, None)]
+    for at, direction in pending:
+        while tick < at and game.state != "GAMEOVER":
+            if event_driven:
+                tick += game.fast_forward(at - tick)
+            else:
+                game.update()
+                tick += 1
+            updates += 1
+        if game.state == "GAMEOVER":
+            break
+        if direction is not None:
+            game.pac.next_dir = direction
+
+    return {
+        "seed": seed,
+        "score": game.score,
+        "level": game.level,
+        "lives": game.lives,
+        "ticks": tick,
+        "updates": updates,
+    }
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    ap.add_argument("--games", type=int, default=50)
+    ap.add_argument("--ticks", type=int, default=60 * 60 * 10,
+                    help="tick limit per game (default: 10 minutes)")
+    ap.add_argument("--seed", type=int, default=0, help="first game seed")
+    ap.add_argument("--fast-forward", action="store_true",
+                    help="jump over quiet ticks with Game.fast_forward")
+    ap.add_argument("--hard", action="store_true",
+                    help="shortest-path ghost AI")
+    ap.add_argument("--engine", default=DEFAULT_ENGINE)
+    args = ap.parse_args(argv)
+
+    engine = load_engine(args.engine)
+    started = time.perf_counter()
+    results = []
+    for seed in range(args.seed, args.seed + args.games):
+        inputs = random_inputs(seed, args.ticks)
+        results.append(play(engine, seed, inputs, args.ticks,
+                            event_driven=args.fast_forward, hard=args.hard))
+    elapsed = time.perf_counter() - started
+
+    scores = [r["score"] for r in results]
+    ticks = sum(r["ticks"] for r in results)
+    updates = sum(r["updates"] for r in results)
+    print(f"games      {len(results)}")
+    print(f"score      min {min(scores)}  p50 {_percentile(scores, 0.5)}  "
+          f"p90 {_percentile(scores, 0.9)}  max {max(scores)}  "
+          f"mean {sum(scores) / len(scores):.1f}")
+    print(f"max level  {max(r['level'] for r in results)}")
+    print(f"ticks      {ticks}  in {updates} updates "
+          f"({ticks / max(1, updates):.2f} ticks/update)")
+    print(f"wall time  {elapsed:.2f}s  ({ticks / max(elapsed, 1e-9):.0f} ticks/s)")
+
+
+if __name__ == "__main__":
+    main()
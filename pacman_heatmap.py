@@ -0,0 +1,198 @@
+"""
+Heatmaps and occupancy analytics over recorded trajectory datasets.
+
+Reads datasets written by pacman_trajectories.py and aggregates, over the
+28x31 tile grid:
+
+  pac        ticks Pac-Man spent on each tile
+  ghosts     ticks any ghost spent on each tile
+  deaths     tiles where a scatter/chase ghost caught Pac-Man
+  dot_order  mean eating order of each dot (0 = first dot of a level)
+
+plus the share of ticks each ghost spent in each mode. All accumulation is
+np.bincount over flat tile indices, done one block of rows at a time, so
+memory stays flat however many ticks are processed. Each map is saved as a
+PNG drawn over the recorded maze, rendered in a run_game edition's wall
+style and tile geometry (pacman_core's render_walls()).
+
+    python pacman_heatmap.py runs/a runs/b --out heatmaps
+
+Requires NumPy.
+"""
+
+import os
+import time
+import argparse
+
+import numpy as np
+
+from pacman_headless import load_engine, DEFAULT_ENGINE
+from pacman_trajectories import open_dataset
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_VARIANT = os.path.join(HERE, "#ACHOLDINGPACMAN4K1.Xa.py")
+BLOCK = 1 << 22         # rows per accumulation step
+MODES = ("scatter", "chase", "fright", "eaten", "house")
+CATCH = 10              # px; the engine's collision distance
+
+
+# ── Accumulation ──────────────────────────────────────────────────────────────
+def tile_index(eng, x, y):
+    """Flat tile index for pixel positions, as Entity.update_grid_pos does."""
+    col = np.floor((x - eng.GRID_X0) / eng.TILE).astype(np.int64) % eng.COLS
+    row = np.clip(np.floor((y - eng.GRID_Y0) / eng.TILE).astype(np.int64), 0, eng.ROWS - 1)
+    return row * eng.COLS + col
+
+
+class Stats:
+    def __init__(self, eng, n_ghosts=4):
+        n = eng.ROWS * eng.COLS
+        self.eng = eng
+        self.ticks = 0
+        self.pac = np.zeros(n, np.int64)
+        self.ghosts = np.zeros(n, np.int64)
+        self.deaths = np.zeros(n, np.int64)
+        self.dot_sum = np.zeros(n, np.float64)
+        self.dot_n = np.zeros(n, np.int64)
+        self.modes = np.zeros((n_ghosts, len(MODES)), np.int64)
+
+    def add(self, cols, lo, hi):
+        """Accumulate rows [lo, hi); row lo - 1 is read for transitions."""
+        eng = self.eng
+        n = eng.ROWS * eng.COLS
+        start = max(0, lo - 1)
+        c = {k: np.asarray(v[start:hi]) for k, v in cols.items()}
+        fresh = slice(lo - start, None)     # rows not seen by an earlier block
+        self.ticks += hi - lo
+
+        pac_t = tile_index(eng, c["pac_x"], c["pac_y"])
+        self.pac += np.bincount(pac_t[fresh], minlength=n)
+
+        same_game = np.zeros(len(pac_t), bool)
+        same_game[1:] = c["game"][1:] == c["game"][:-1]
+        caught = np.zeros(len(pac_t), bool)
+        for i in range(self.modes.shape[0]):
+            gx, gy, mode = c[f"g{i}_x"], c[f"g{i}_y"], c[f"g{i}_mode"]
+            self.ghosts += np.bincount(tile_index(eng, gx, gy)[fresh], minlength=n)
+            self.modes[i] += np.bincount(mode[fresh], minlength=len(MODES))[:len(MODES)]
+            close = (gx - c["pac_x"]) ** 2 + (gy - c["pac_y"]) ** 2 < CATCH * CATCH
+            caught |= close & (mode <= 1)
+        # Only the first tick of a catch counts (positions freeze while dying)
+        onset = caught.copy()
+        onset[1:] &= ~(caught[:-1] & same_game[1:])
+        self.deaths += np.bincount(pac_t[fresh][onset[fresh]], minlength=n)
+
+        dots = c["dots_left"].astype(np.int64)
+        ate = np.zeros(len(dots), bool)
+        ate[1:] = same_game[1:] & (dots[1:] < dots[:-1])
+        ate = ate[fresh]
+        order = (eng.DOTS_TOTAL - dots[fresh] - 1)[ate]
+        tiles = pac_t[fresh][ate]
+        self.dot_sum += np.bincount(tiles, weights=order, minlength=n)
+        self.dot_n += np.bincount(tiles, minlength=n)
+
+    def dot_order(self):
+        with np.errstate(invalid="ignore"):
+            return np.where(self.dot_n > 0, self.dot_sum / np.maximum(self.dot_n, 1), np.nan)
+
+
+def analyse(paths, eng, block=BLOCK):
+    stats = Stats(eng)
+    for path in paths:
+        cols = open_dataset(path)
+        rows = len(cols["tick"])
+        for lo in range(0, rows, block):
+            stats.add(cols, lo, min(rows, lo + block))
+    return stats
+
+
+# ── Rendering ─────────────────────────────────────────────────────────────────
+def _colormap(v):
+    """0..1 -> RGB, black-blue-red-yellow-white."""
+    stops = np.array([[0, 0, 0], [40, 40, 220], [230, 40, 40],
+                      [255, 220, 0], [255, 255, 255]], np.float64)
+    pos = np.clip(v, 0, 1) * (len(stops) - 1)
+    i = np.minimum(pos.astype(int), len(stops) - 2)
+    f = (pos - i)[..., None]
+    return (stops[i] * (1 - f) + stops[i + 1] * f).astype(np.uint8)
+
+
+def maze_backdrop(pygame, eng, maze):
+    """The recorded engine's walls and door, drawn in the style and tile
+    geometry of an edition's maze; the engines' layouts differ."""
+    from pacman_core.maze import render_walls, OPEN, WALL, DOOR
+    kinds = [WALL if t == eng.W else DOOR if t == eng.G else OPEN for t in eng.MAZE_BYTES]
+    return render_walls(pygame, kinds, eng.COLS, eng.ROWS,
+                        (maze.tile, maze.top_pad, maze.bottom_pad))
+
+
+def render(pygame, eng, maze, backdrop, grid, path, log=True, alpha=170):
+    """Save grid (ROWS*COLS values, NaN = no data) over the maze backdrop.
+
+    With log, counts are log-scaled and zero counts also count as no data.
+    """
+    rows, cols, tile = eng.ROWS, eng.COLS, maze.tile
+    values = np.asarray(grid, np.float64).reshape(rows, cols)
+    have = ~np.isnan(values)
+    if log:
+        have &= values > 0
+    v = np.where(have, values, 0.0)
+    if log:
+        v = np.log1p(v)
+    top = v[have].max() if have.any() else 1.0
+    rgb = _colormap(v / top)
+    a = np.where(have, alpha, 0).astype(np.uint8)
+
+    def big(arr):
+        # one value per tile -> tile x tile pixels, in pygame's (x, y) order
+        return np.repeat(np.repeat(arr, tile, axis=0), tile, axis=1).swapaxes(0, 1)
+
+    overlay = pygame.Surface((cols * tile, rows * tile), pygame.SRCALPHA)
+    px = pygame.surfarray.pixels3d(overlay)
+    px[...] = big(rgb)
+    del px
+    pa = pygame.surfarray.pixels_alpha(overlay)
+    pa[...] = big(a)
+    del pa
+
+    surf = backdrop.copy()
+    surf.blit(overlay, (0, maze.top_pad))
+    pygame.image.save(surf, path)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    ap.add_argument("data", nargs="+", help="dataset directories")
+    ap.add_argument("--out", default="heatmaps")
+    ap.add_argument("--variant", default=DEFAULT_VARIANT,
+                    help="run_game script whose maze style is the backdrop")
+    ap.add_argument("--engine", default=DEFAULT_ENGINE,
+                    help="engine the data was recorded with (grid geometry)")
+    args = ap.parse_args(argv)
+
+    eng = load_engine(args.engine)
+    started = time.perf_counter()
+    stats = analyse(args.data, eng)
+    elapsed = time.perf_counter() - started
+    print(f"{stats.ticks} ticks from {len(args.data)} dataset(s) in {elapsed:.2f}s")
+    print(f"deaths {int(stats.deaths.sum())}  dots eaten {int(stats.dot_n.sum())}")
+    for i, counts in enumerate(stats.modes):
+        share = counts / max(1, counts.sum())
+        print(f"  ghost {i}: " + "  ".join(f"{m} {s:5.1%}" for m, s in zip(MODES, share)))
+
+    os.makedirs(args.out, exist_ok=True)
+    import pygame
+    maze = load_engine(args.variant).edition.maze
+    backdrop = maze_backdrop(pygame, eng, maze)
+    maps = {"pac": (stats.pac, True),
+            "ghosts": (stats.ghosts, True),
+            "deaths": (np.where(stats.deaths > 0, stats.deaths, np.nan), False),
+            "dot_order": (stats.dot_order(), False)}
+    for name, (grid, log) in maps.items():
+        path = os.path.join(args.out, name + ".png")
+        render(pygame, eng, maze, backdrop, grid, path, log=log)
+        print(f"  wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Input latency of a run_game() edition: how long a press takes to show.
+
+The edition's Controls (pacman_core/controls.py) time every press three
+ways: from the press to its being read ("queue"), from then to the flip
+of the first frame simulated after it ("display", the game loop's own
+latency) and, once Pac-Man turns its way, from the press to the flip of
+the frame he turned in ("turn", what the player sees, waiting for an
+opening included). This runs an edition headless and prints all three.
+
+By default it plays in real time for --seconds while a thread presses a
+random direction every 50-400 ms. Each press is posted with the time it
+was made, which pygame's own key events lack, so these are the only
+presses whose queue time can be measured; a real player's presses are
+stamped when read. --scripted plays the golden harness's seeded key
+script under its virtual clock instead: the same game every run, for
+comparing --pre-turn and --corner settings frame for frame. Its times are virtual, 16 ms a
+frame with the frame's own work taking none, so queue and display read 0.
+
+    python pacman_latency.py --target pacman_endless.py --seconds 30
+    python pacman_latency.py --scripted --frames 7200 --corner 4
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import threading
+
+from pacman_headless import load_engine, random_inputs
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+KEYS = ("K_UP", "K_DOWN", "K_LEFT", "K_RIGHT")
+
+
+class _Done(Exception):
+    """Raised from the flip hook when time is up."""
+
+
+def _games(ed):
+    while True:                 # game over: start another, as the menu would
+        ed.run_game()
+
+
+def run_real_time(ed, seconds, seed):
+    """Play for seconds of wall time with a thread pressing keys."""
+    import pygame
+    rng = random.Random(seed)
+    stop = threading.Event()
+    deadline = time.perf_counter() + seconds
+    flip = pygame.display.flip
+
+    def presser():
+        keys = [getattr(pygame, k) for k in KEYS]
+        while not stop.wait(rng.uniform(0.05, 0.4)):
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=rng.choice(keys), mod=0,
+                                                 unicode="", scancode=0,
+                                                 timestamp=pygame.time.get_ticks()))
+
+    def timed_flip(*args):
+        flip(*args)
+        if time.perf_counter() >= deadline:
+            raise _Done
+
+    thread = threading.Thread(target=presser, daemon=True)
+    pygame.display.flip = timed_flip
+    thread.start()
+    try:
+        _games(ed)
+    except _Done:
+        pass
+    finally:
+        stop.set()
+        thread.join()
+        pygame.display.flip = flip
+
+
+def run_scripted(ed, frames, seed):
+    """Play frames under the golden harness's virtual clock and key script."""
+    import pygame
+    from pacman_golden import FrameProbe
+    random.seed(seed)
+    probe = FrameProbe(pygame, random_inputs(seed, frames), frames, frames, ed.profile.fps)
+    probe.run(probe.hooks(ed, draw=False), lambda: _games(ed))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    ap.add_argument("--target", default="pacman_endless.py", help="a run_game() edition script")
+    ap.add_argument("--seconds", type=float, default=20.0)
+    ap.add_argument("--scripted", action="store_true", help="virtual clock, seeded key script")
+    ap.add_argument("--frames", type=int, default=7200, help="--scripted run length")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--pre-turn", type=int, default=None,
+                    help="frames a turn request is held (default: the profile's)")
+    ap.add_argument("--corner", type=int, default=None,
+                    help="cornering window in px (default: the profile's)")
+    args = ap.parse_args(argv)
+
+    from pacman_scores import ScoreStore
+    ed = load_engine(os.path.join(HERE, args.target)).edition
+    ed.scores = ScoreStore(":memory:", variant="latency")
+    if args.pre_turn is not None:
+        ed.profile.pre_turn = ed.controls.pre_turn = args.pre_turn
+    if args.corner is not None:
+        ed.profile.corner_px = args.corner
+
+    started = time.perf_counter()
+    if args.scripted:
+        run_scripted(ed, args.frames, args.seed)
+    else:
+        run_real_time(ed, args.seconds, args.seed)
+    elapsed = time.perf_counter() - started
+
+    c, p = ed.controls, ed.profile
+    print(f"{args.target}: {'scripted' if args.scripted else 'real time'}, "
+          f"{elapsed:.1f} s, pre_turn {p.pre_turn}, corner {p.corner_px} px")
+    print(f"  queue    {c.queue.summary()}")
+    print(f"  display  {c.display.summary()}")
+    print(f"  turn     {c.turn.summary()}")
+    print(f"  lapsed   {c.lapsed}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
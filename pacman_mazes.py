@@ -0,0 +1,58 @@
+"""
+Compile and check maze sources (.maze) into their binary caches (.mazec).
+
+Each source is parsed and validated (grid shape, pellets reachable, one
+house door, Pac-Man's start open), its derived tables and wall layer are
+built, and the cache is written next to it; the time to build it and to
+load the cache back are printed. With --check nothing is written. See
+pacman_core/mazefile.py for the format.
+
+    python pacman_mazes.py                      # every shipped maze
+    python pacman_mazes.py my.maze --check      # validate only
+"""
+
+import os
+import sys
+import time
+import argparse
+
+from pacman_core import mazefile
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    ap.add_argument("mazes", nargs="*", help="names or .maze paths (default: all shipped)")
+    ap.add_argument("--check", action="store_true", help="validate without writing caches")
+    ap.add_argument("--tile", type=int, default=16)
+    ap.add_argument("--top-pad", type=int, default=48)
+    ap.add_argument("--bottom-pad", type=int, default=32)
+    args = ap.parse_args(argv)
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    geometry = (args.tile, args.top_pad, args.bottom_pad)
+    refs = args.mazes or sorted(os.path.join(mazefile.MAZE_DIR, f)
+                                for f in os.listdir(mazefile.MAZE_DIR) if f.endswith(".maze"))
+    failed = 0
+    for ref in refs:
+        path = mazefile.resolve(ref)
+        try:
+            started = time.perf_counter()
+            maze = mazefile.compile_file(path, geometry, write=not args.check)
+            built = time.perf_counter() - started
+        except (OSError, ValueError) as e:
+            print(f"error: {e}")
+            failed += 1
+            continue
+        line = (f"{maze.name:<16} {maze.cols}x{maze.nrows}  {maze.pellet_count()} pellets  "
+                f"tunnels {list(maze.tunnel_rows)}  built in {built * 1000:.1f}ms")
+        if not args.check:
+            started = time.perf_counter()
+            mazefile.load(path, geometry)
+            loaded = time.perf_counter() - started
+            line += f"  cache {os.path.getsize(path + 'c')} bytes, loads in {loaded * 1000:.2f}ms"
+        print(line)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
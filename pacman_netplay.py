@@ -0,0 +1,428 @@
+"""
+Two-player versus over UDP with rollback netcode.
+
+Player 1 (the host) is Pac-Man, player 2 steers Blinky. Each side runs the
+full game locally from the same seed. Every frame the local input (the held
+direction) is sent to the peer and the remote input is predicted by
+repeating the last one received. When a remote input arrives that differs
+from the prediction, the game is restored to the snapshot taken before that
+frame and re-simulated, muted, up to the present.
+
+    python pacman_netplay.py --host 7777
+    python pacman_netplay.py --join 127.0.0.1:7777
+    python pacman_netplay.py --selftest --latency 60 --jitter 20 --loss 0.1
+
+Both sides must use the same --seed. --latency/--jitter (ms) and --loss
+(0..1) are injected on the sending side, so the mode can be exercised over
+localhost; --selftest plays both sides in one process against a virtual
+clock and checks the result against an offline replay of the same inputs.
+"""
+
+import sys
+import time
+import zlib
+import heapq
+import random
+import socket
+import struct
+import argparse
+
+from pacman_headless import load_engine, DEFAULT_ENGINE
+
+MAX_ROLLBACK = 8        # frames a session may run ahead of confirmed input
+INPUT_DELAY = 2         # frames local input is held back (fewer rollbacks)
+CHECK_INTERVAL = 30     # frames between desync checksums
+MAX_SEND = 64           # unacknowledged inputs resent per packet
+
+# magic, ack, checksum frame, checksum, first input frame, input count
+HEADER = struct.Struct("!4sIiIIB")
+MAGIC = b"PMRB"
+
+
+# ── Lossy Link ────────────────────────────────────────────────────────────────
+class LossyLink:
+    """Non-blocking UDP endpoint with injected latency, jitter and loss.
+
+    Outgoing datagrams are held in a heap until their due time and dropped
+    with probability loss. A host link learns its peer from the first
+    datagram it receives; after that, datagrams from anywhere else are
+    ignored.
+    """
+
+    def __init__(self, bind, peer=None, latency=0.0, jitter=0.0, loss=0.0,
+                 seed=None, clock=time.monotonic):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(bind)
+        self.sock.setblocking(False)
+        # Resolved, so it compares equal to the addresses recvfrom() reports
+        self.peer = None if peer is None else (socket.gethostbyname(peer[0]), peer[1])
+        self.latency, self.jitter, self.loss = latency, jitter, loss
+        self.rng = random.Random(seed)
+        self.clock = clock
+        self.queue = []
+        self.seq = 0
+        self.sent = self.dropped = 0
+
+    @property
+    def address(self):
+        return self.sock.getsockname()
+
+    def send(self, data):
+        if self.peer is None:
+            return
+        self.sent += 1
+        if self.rng.random() < self.loss:
+            self.dropped += 1
+            return
+        delay = max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+        self.seq += 1
+        heapq.heappush(self.queue, (self.clock() + delay, self.seq, data))
+        self.flush()
+
+    def flush(self):
+        now = self.clock()
+        while self.queue and self.queue[0][0] <= now:
+            _, _, data = heapq.heappop(self.queue)
+            try:
+                self.sock.sendto(data, self.peer)
+            except OSError:
+                pass
+
+    def recv(self):
+        self.flush()
+        packets = []
+        while True:
+            try:
+                data, addr = self.sock.recvfrom(2048)
+            except (BlockingIOError, ConnectionResetError):
+                return packets
+            if self.peer is None:
+                self.peer = addr
+            elif addr != self.peer:
+                continue
+            packets.append(data)
+
+    def close(self):
+        self.sock.close()
+
+
+# ── Rollback Session ──────────────────────────────────────────────────────────
+class RollbackSession:
+    """Drives one Game from local input plus predicted/confirmed remote input.
+
+    inputs[p][f] is player p's confirmed held direction for frame f (player
+    0 = Pac-Man, 1 = Blinky). snapshots[f] is the game state before frame f
+    ran; it is kept for the last max_rollback + 1 frames only.
+    """
+
+    def __init__(self, engine, game, link, local, max_rollback=MAX_ROLLBACK,
+                 delay=INPUT_DELAY):
+        self.eng = engine
+        self.game = game
+        self.link = link
+        self.local = local
+        self.remote = 1 - local
+        self.max_rollback = max_rollback
+        # Input comes only from here: no restarting from the keyboard, which
+        # a re-simulation could not reproduce
+        game.restart_key = False
+        # Both sides pre-fill the delay frames with the starting direction
+        self.inputs = ([engine.LEFT] * delay, [engine.LEFT] * delay)
+        self.predicted = {}
+        self.snapshots = {}
+        self.frame = 0
+        self.remote_ack = 0
+        self.rollback_to = None
+        self.crc = {}
+        self.next_check = 0
+        self.peer_crc = None
+        self.checked = -1
+        self.stats = {"frames": 0, "stalls": 0, "rollbacks": 0,
+                      "max_depth": 0, "resim": 0, "resim_s": 0.0,
+                      "desyncs": 0, "checks": 0}
+
+    # ---- input ----
+    def input_for(self, player, f):
+        known = self.inputs[player]
+        if f < len(known):
+            return known[f]
+        guess = known[-1]
+        self.predicted[f] = guess
+        return guess
+
+    def poll(self):
+        remote = self.inputs[self.remote]
+        for data in self.link.recv():
+            if len(data) < HEADER.size:
+                continue
+            magic, ack, crc_frame, crc, start, n = HEADER.unpack_from(data)
+            # Untrusted: the count must match the payload, every input be a direction
+            if magic != MAGIC or len(data) != HEADER.size + n:
+                continue
+            if n and max(data[HEADER.size:]) >= 4:
+                continue
+            self.remote_ack = max(self.remote_ack, ack)
+            if crc_frame >= 0:
+                self.peer_crc = (crc_frame, crc)
+            for f in range(max(start, len(remote)), start + n):
+                if f != len(remote):
+                    break
+                value = data[HEADER.size + f - start]
+                remote.append(value)
+                if f < self.frame and self.predicted.get(f) != value:
+                    if self.rollback_to is None or f < self.rollback_to:
+                        self.rollback_to = f
+                self.predicted.pop(f, None)
+        self._check_desync()
+
+    def send(self):
+        mine = self.inputs[self.local]
+        start = max(self.remote_ack, len(mine) - MAX_SEND)
+        payload = bytes(mine[start:])
+        crc_frame, crc = max(self.crc.items(), default=(-1, 0))
+        self.link.send(HEADER.pack(MAGIC, len(self.inputs[self.remote]),
+                                   crc_frame, crc, start, len(payload)) + payload)
+
+    # ---- simulation ----
+    def _step(self):
+        f = self.frame
+        game = self.game
+        self.snapshots[f] = game.snapshot()
+        self.snapshots.pop(f - self.max_rollback - 1, None)
+        game.pac.next_dir = self.input_for(0, f)
+        game.ghosts[self.eng.Ghost.BLINKY].next_dir = self.input_for(1, f)
+        game.update()
+        self.frame = f + 1
+
+    def _rollback(self):
+        f, self.rollback_to = self.rollback_to, None
+        target = self.frame
+        started = time.perf_counter()
+        self.game.restore(self.snapshots[f])
+        self.frame = f
+        muted, self.game.muted = self.game.muted, True
+        while self.frame < target:
+            self._step()
+        self.game.muted = muted
+        st = self.stats
+        st["rollbacks"] += 1
+        st["max_depth"] = max(st["max_depth"], target - f)
+        st["resim"] += target - f
+        st["resim_s"] += time.perf_counter() - started
+
+    def _record_checksums(self):
+        # snapshots[k] depends only on frames < k, all of them confirmed
+        confirmed = len(self.inputs[self.remote])
+        while self.next_check < self.frame and self.next_check <= confirmed:
+            snap = self.snapshots.get(self.next_check)
+            if snap is not None:
+                self.crc[self.next_check] = zlib.crc32(repr(snap).encode())
+            self.next_check += CHECK_INTERVAL
+        for k in [k for k in self.crc if k < self.frame - 8 * CHECK_INTERVAL]:
+            del self.crc[k]
+        self._check_desync()
+
+    def _check_desync(self):
+        if self.peer_crc is None or self.peer_crc[0] not in self.crc:
+            return
+        frame, crc = self.peer_crc
+        self.peer_crc = None
+        if frame <= self.checked:
+            return
+        self.checked = frame
+        self.stats["checks"] += 1
+        if self.crc[frame] != crc:
+            self.stats["desyncs"] += 1
+
+    def sync(self):
+        """Exchange packets and apply any correction without advancing."""
+        self.poll()
+        if self.rollback_to is not None:
+            self._rollback()
+        self._record_checksums()
+        self.send()
+
+    def advance(self, local_dir):
+        """Run one frame with the local player's held direction.
+
+        Returns False (and runs nothing) when the peer has fallen
+        max_rollback frames behind; the caller just tries again next frame.
+        """
+        self.poll()
+        if self.rollback_to is not None:
+            self._rollback()
+        if self.frame - len(self.inputs[self.remote]) >= self.max_rollback:
+            self.stats["stalls"] += 1
+            self.send()
+            return False
+        self.inputs[self.local].append(local_dir)
+        self.send()
+        self._step()
+        self._record_checksums()
+        self.stats["frames"] += 1
+        return True
+
+
+# ── Self-Test ─────────────────────────────────────────────────────────────────
+def scripted_inputs(seed, frames):
+    """Held direction per frame: a random walk of 5-40 frame holds."""
+    rng = random.Random(seed)
+    out = []
+    while len(out) < frames:
+        out += [rng.randrange(4)] * rng.randint(5, 40)
+    return out[:frames]
+
+
+def replay(eng, seed, inputs, frames):
+    """Offline reference: the same inputs stepped straight through."""
+    game = eng.Game(seed=seed, versus=True)
+    game.muted = True
+    for f in range(frames):
+        game.pac.next_dir = inputs[0][f]
+        game.ghosts[eng.Ghost.BLINKY].next_dir = inputs[1][f]
+        game.update()
+    return game
+
+
+def selftest(args):
+    eng = load_engine(args.engine)
+    now = [0.0]
+    clock = lambda: now[0]
+    links = [LossyLink(("127.0.0.1", 0), latency=args.latency / 1000,
+                       jitter=args.jitter / 1000, loss=args.loss,
+                       seed=args.seed * 2 + i, clock=clock) for i in range(2)]
+    links[0].peer, links[1].peer = links[1].address, links[0].address
+    sessions = []
+    for i, link in enumerate(links):
+        game = eng.Game(seed=args.seed, versus=True)
+        game.muted = True
+        sessions.append(RollbackSession(eng, game, link, i, args.rollback, args.delay))
+    scripts = [scripted_inputs(args.seed * 2 + 100 + i, args.frames + args.delay)
+               for i in range(2)]
+
+    started = time.perf_counter()
+    ticks = 0
+    while min(s.frame for s in sessions) < args.frames:
+        for s in sessions:
+            if s.frame < args.frames:
+                s.advance(scripts[s.local][len(s.inputs[s.local])])
+            else:
+                s.sync()
+        now[0] += 1 / eng.FPS
+        ticks += 1
+        if ticks > 50 * args.frames:
+            raise RuntimeError("self-test made no progress")
+    # Drain: keep exchanging until every input is confirmed on both sides
+    while any(len(s.inputs[s.remote]) < args.frames or s.rollback_to is not None
+              for s in sessions):
+        for s in sessions:
+            s.sync()
+        now[0] += 1 / eng.FPS
+    elapsed = time.perf_counter() - started
+
+    seen = [tuple(tuple(s.inputs[p][:args.frames]) for p in (0, 1)) for s in sessions]
+    ref = replay(eng, args.seed, seen[0], args.frames).snapshot()
+    ok = seen[0] == seen[1] and all(s.game.snapshot() == ref for s in sessions)
+
+    per_tick = time_resim(eng, args.seed)
+    print(f"frames {args.frames}  latency {args.latency}ms +-{args.jitter}  "
+          f"loss {args.loss:.0%}  delay {args.delay}  rollback {args.rollback}")
+    for s in sessions:
+        st = s.stats
+        print(f"  player {s.local + 1}: {st['rollbacks']} rollbacks "
+              f"(max depth {st['max_depth']}, {st['resim']} re-sim ticks), "
+              f"{st['stalls']} stalls, {s.link.dropped}/{s.link.sent} packets dropped, "
+              f"{st['checks']} checks, {st['desyncs']} desyncs")
+    print(f"  re-sim cost {per_tick * 1000:.3f} ms/tick (restore + update + snapshot); "
+          f"{int(1 / eng.FPS / per_tick)} ticks fit in one frame")
+    print(f"  wall time {elapsed:.2f}s")
+    print("  result: " + ("identical to offline replay" if ok else "MISMATCH"))
+    for link in links:
+        link.close()
+    return ok
+
+
+def time_resim(eng, seed, ticks=2000):
+    """Seconds per rollback tick: snapshot, update, plus one restore per 8."""
+    game = eng.Game(seed=seed, versus=True)
+    game.muted = True
+    game.state = "PLAYING"
+    snap = game.snapshot()
+    started = time.perf_counter()
+    for i in range(ticks):
+        if i % MAX_ROLLBACK == 0:
+            game.restore(snap)
+        game.snapshot()
+        game.update()
+    return (time.perf_counter() - started) / ticks
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+def play(args):
+    eng = load_engine(args.engine, headless=False)
+    pygame = eng.pygame
+    if args.host is not None:
+        link = LossyLink(("0.0.0.0", args.host), None, args.latency / 1000,
+                         args.jitter / 1000, args.loss)
+        local = 0
+    else:
+        host, port = args.join.rsplit(":", 1)
+        link = LossyLink(("0.0.0.0", 0), (host, int(port)), args.latency / 1000,
+                         args.jitter / 1000, args.loss)
+        local = 1
+    game = eng.Game(seed=args.seed, versus=True)
+    session = RollbackSession(eng, game, link, local, args.rollback, args.delay)
+    keys = {pygame.K_UP: eng.UP, pygame.K_DOWN: eng.DOWN,
+            pygame.K_LEFT: eng.LEFT, pygame.K_RIGHT: eng.RIGHT}
+    held = eng.LEFT
+    who = "Pac-Man" if local == 0 else "Blinky"
+
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key in keys:
+                    held = keys[event.key]
+                elif event.key == pygame.K_ESCAPE:
+                    running = False
+        if game.state != "GAMEOVER":
+            session.advance(held)
+        else:
+            session.sync()
+        game.draw()
+        st = session.stats
+        pygame.display.set_caption(
+            f"Pac-Man versus - you are {who}  frame {session.frame}  "
+            f"rollbacks {st['rollbacks']} (max {st['max_depth']})  "
+            f"stalls {st['stalls']}  desyncs {st['desyncs']}")
+        eng.clock.tick(eng.FPS)
+    link.close()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    mode = ap.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--host", type=int, metavar="PORT", help="play Pac-Man, wait for a peer")
+    mode.add_argument("--join", metavar="HOST:PORT", help="play Blinky against a host")
+    mode.add_argument("--selftest", action="store_true",
+                      help="both sides in one process over localhost UDP")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--latency", type=float, default=0.0, help="one-way delay in ms")
+    ap.add_argument("--jitter", type=float, default=0.0, help="+- ms around --latency")
+    ap.add_argument("--loss", type=float, default=0.0, help="packet drop probability")
+    ap.add_argument("--delay", type=int, default=INPUT_DELAY, help="local input delay in frames")
+    ap.add_argument("--rollback", type=int, default=MAX_ROLLBACK, help="max rollback frames")
+    ap.add_argument("--frames", type=int, default=3600, help="self-test length")
+    ap.add_argument("--engine", default=DEFAULT_ENGINE)
+    args = ap.parse_args(argv)
+
+    if args.selftest:
+        ok = selftest(args)
+        sys.exit(0 if ok else 1)
+    play(args)
+
+
+if __name__ == "__main__":
+    main()
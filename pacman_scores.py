@@ -0,0 +1,192 @@
+"""
+High scores and leaderboards, persisted in SQLite without touching the
+frame path.
+
+The game loop only calls submit() (a queue put plus an in-memory update)
+and high()/top() (reads of that in-memory cache). A background thread owns
+the database connection: it loads the leaderboard once at start-up and
+writes queued scores in batches, one transaction per batch. The database
+runs in WAL mode with synchronous=NORMAL, so a commit appends to the log
+without an fsync; the log is synced at checkpoints, also on that thread.
+
+    store = ScoreStore(variant="v0")
+    store.submit(pac.score, level=3)    # from the game loop
+    store.high()                        # for the HUD
+
+    python pacman_scores.py [--variant v0]      # print the leaderboard
+    python pacman_scores.py --selftest          # a played game reaches the board
+"""
+
+import os
+import sys
+import time
+import queue
+import atexit
+import sqlite3
+import argparse
+import threading
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DB = os.path.join(HERE, "pacman_scores.db")
+KEEP = 10               # leaderboard entries cached per variant
+BATCH_DELAY = 0.25      # seconds the writer waits to gather more scores
+BATCH_MAX = 500
+FLUSH_TIMEOUT = 10.0    # seconds flush() waits for the writer
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    variant TEXT NOT NULL,
+    name    TEXT NOT NULL,
+    score   INTEGER NOT NULL,
+    level   INTEGER NOT NULL,
+    at      REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_rank ON scores (variant, score DESC);
+"""
+
+
+def _connect(path):
+    db = sqlite3.connect(path)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    db.executescript(SCHEMA)
+    return db
+
+
+class ScoreStore:
+    """Leaderboard for one game variant; see the module docstring."""
+
+    def __init__(self, path=DEFAULT_DB, variant="default", keep=KEEP):
+        self.path = path
+        self.variant = variant
+        self.keep = keep
+        self.board = []             # (score, name, level), best first
+        self.lock = threading.Lock()
+        self.queue = queue.Queue()
+        self.loaded = threading.Event()
+        self.written = 0
+        self.batches = 0
+        self._thread = threading.Thread(target=self._writer, name="scores", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ---- frame path (memory only) ----
+    def submit(self, score, name="PLAYER", level=0):
+        entry = (int(score), str(name), int(level))
+        with self.lock:
+            self._merge([entry])
+        self.queue.put(entry + (time.time(),))
+
+    def high(self):
+        with self.lock:
+            return self.board[0][0] if self.board else 0
+
+    def top(self):
+        with self.lock:
+            return list(self.board)
+
+    def _merge(self, entries):
+        self.board = sorted(self.board + entries, key=lambda e: -e[0])[:self.keep]
+
+    # ---- writer thread ----
+    def _writer(self):
+        db = _connect(self.path)
+        rows = db.execute("SELECT score, name, level FROM scores WHERE variant = ? "
+                          "ORDER BY score DESC LIMIT ?", (self.variant, self.keep)).fetchall()
+        with self.lock:
+            self._merge([tuple(r) for r in rows])
+        self.loaded.set()
+
+        stop = False
+        while not stop:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + BATCH_DELAY
+            while batch[-1] is not None and len(batch) < BATCH_MAX:
+                left = deadline - time.monotonic()
+                try:
+                    batch.append(self.queue.get(timeout=left) if left > 0
+                                 else self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if batch[-1] is None:
+                stop = True
+            entries = [e for e in batch if e is not None]
+            if entries:
+                with db:
+                    db.executemany("INSERT INTO scores (variant, score, name, level, at) "
+                                   "VALUES (?, ?, ?, ?, ?)",
+                                   [(self.variant,) + e for e in entries])
+                self.written += len(entries)
+                self.batches += 1
+            for _ in batch:
+                self.queue.task_done()
+        db.close()
+
+    def flush(self, timeout=FLUSH_TIMEOUT):
+        """Wait until every submitted score is on disk (not for the frame
+        path); False if the writer thread died or timeout seconds passed."""
+        deadline = time.monotonic() + timeout
+        while self.queue.unfinished_tasks:
+            if not self._thread.is_alive() or time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self):
+        if self._thread.is_alive():
+            self.queue.put(None)
+            self._thread.join()
+
+
+def selftest(edition="gemini4k1.0pacman4k.py", max_frames=200000):
+    """Play one game of a run_game() edition to game over, with no input,
+    into a throwaway database; check that its score is on the board and
+    on disk."""
+    import tempfile
+    import pygame
+    from pacman_golden import FrameProbe
+    from pacman_headless import load_engine
+    ed = load_engine(os.path.join(HERE, edition)).edition
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "scores.db")
+        store = ScoreStore(path, variant="selftest")
+        probe = FrameProbe(pygame, [], max_frames, max_frames, ed.profile.fps)
+        finished = []
+        probe.run(probe.hooks(ed, draw=False) + [(ed, "scores", store)],
+                  lambda: finished.append(ed.run_game()))
+        flushed = store.flush()
+        store.close()
+        db = _connect(path)
+        rows = db.execute("SELECT score FROM scores WHERE variant = 'selftest'").fetchall()
+        db.close()
+    print(f"{edition}: game over {'reached' if finished else 'NOT reached'} "
+          f"after {probe.flips} frames, high score {store.high()}, rows on disk {rows}")
+    ok = finished and flushed and store.high() > 0 and rows == [(store.high(),)]
+    print("result:", "ok" if ok else "FAIL")
+    return ok
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Print a high-score table.")
+    ap.add_argument("--db", default=DEFAULT_DB)
+    ap.add_argument("--variant", default=None, help="one variant (default: all)")
+    ap.add_argument("--top", type=int, default=KEEP)
+    ap.add_argument("--selftest", action="store_true",
+                    help="play a game to game over and check its score was stored")
+    args = ap.parse_args(argv)
+    if args.selftest:
+        return 0 if selftest() else 1
+    db = _connect(args.db)
+    variants = [args.variant] if args.variant else [
+        v for (v,) in db.execute("SELECT DISTINCT variant FROM scores ORDER BY variant")]
+    for v in variants:
+        print(v)
+        rows = db.execute("SELECT score, name, level FROM scores WHERE variant = ? "
+                          "ORDER BY score DESC LIMIT ?", (v, args.top))
+        for rank, (score, name, level) in enumerate(rows, 1):
+            print(f"  {rank:2d}. {score:8d}  {name:10s} level {level}")
+    db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
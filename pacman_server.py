@@ -0,0 +1,371 @@
+"""
+Multi-session game server: many independent headless games in one box.
+
+Sessions are sharded across worker processes (one per core by default).
+Each worker steps all of its games on a fixed-rate scheduler and pushes
+their state in the spectator wire format (keyframe, then deltas; see
+pacman_spectate.py). The front end is an asyncio TCP server: a client opens
+a session, sends held directions and receives its game's frames.
+
+New sessions are admitted only while the chosen worker's measured tick
+time, plus the estimated cost of one more game, stays inside the tick
+budget; otherwise the client is told the server is busy.
+
+    python pacman_server.py --port 7790
+    python pacman_server.py --selftest --bots 400 --seconds 5
+
+Client -> server: one JSON object per line
+    {"op": "new", "seed": 1, "hard": false}
+    {"op": "input", "dir": 2}            (0 up, 1 down, 2 left, 3 right)
+Server -> client: length-prefixed frames as in pacman_spectate.py, plus
+type b"J" carrying a JSON reply ({"ok": true, "session": 12} or
+{"ok": false, "error": "busy"}). When the game ends its last frame is
+followed by {"ok": true, "session": 12, "gameover": true} and the session
+is freed; the client may then ask for a new one. A line longer than
+LINE_LIMIT gets {"ok": false, "error": "line too long"} and the
+connection is closed.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import multiprocessing
+
+from pacman_headless import load_engine, DEFAULT_ENGINE
+from pacman_spectate import Replica, capture, encode_keyframe, encode_delta, LENGTH
+
+TICK_RATE = 60          # worker ticks per second (the engine's FPS)
+PUSH_EVERY = 2          # ticks between state pushes (30 Hz)
+BUDGET = 0.8            # share of the tick a worker may spend stepping games
+GAME_COST = 0.0002      # assumed seconds per game per tick before any measurement
+WRITE_LIMIT = 65536     # bytes queued for a client before frames are dropped
+LINE_LIMIT = 65536      # longest request line read from a client
+
+
+def _reply(obj):
+    body = b"J" + json.dumps(obj).encode()
+    return LENGTH.pack(len(body)) + body
+
+
+# ── Worker ────────────────────────────────────────────────────────────────────
+class _Session:
+    __slots__ = ('game', 'last', 'needs_key')
+
+    def __init__(self, game):
+        self.game = game
+        self.last = None
+        self.needs_key = True
+
+
+def worker_main(conn, engine_path, push_every):
+    """Step every hosted game at FPS; report frames and load to the front end."""
+    eng = load_engine(engine_path)
+    period = 1 / TICK_RATE
+    sessions = {}
+    load = 0.0                      # EWMA of stepping time per tick (s)
+    tick = 0
+    next_t = time.perf_counter()
+    while True:
+        while conn.poll():
+            msg = conn.recv()
+            op = msg[0]
+            if op == "new":
+                _, sid, seed, hard = msg
+                game = eng.Game(hard=hard, seed=seed)
+                game.muted = True
+                sessions[sid] = _Session(game)
+            elif op == "input":
+                s = sessions.get(msg[1])
+                if s is not None:
+                    s.game.pac.next_dir = msg[2]
+            elif op == "key":
+                s = sessions.get(msg[1])
+                if s is not None:
+                    s.needs_key = True
+            elif op == "close":
+                sessions.pop(msg[1], None)
+            elif op == "stop":
+                return
+
+        started = time.perf_counter()
+        for s in sessions.values():
+            if s.game.state != "GAMEOVER":
+                s.game.update()
+        if tick % push_every == 0:
+            frames = []
+            ended = []
+            for sid, s in sessions.items():
+                if s.game.state == "GAMEOVER":
+                    ended.append(sid)       # freed once this last frame is out
+                view = capture(s.game)
+                if view == s.last and not s.needs_key:
+                    continue
+                msg = None if s.needs_key else encode_delta(s.last, view, tick)
+                if msg is None:
+                    msg = encode_keyframe(view, tick)
+                    s.needs_key = False
+                s.last = view
+                frames.append((sid, msg))
+            for sid in ended:
+                del sessions[sid]
+            spent = time.perf_counter() - started
+            load = spent if tick == 0 else 0.9 * load + 0.1 * spent
+            conn.send(("frames", frames, load, len(sessions), ended))
+        tick += 1
+
+        next_t += period
+        delay = next_t - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        elif delay < -5 * period:
+            next_t = time.perf_counter()    # hopelessly behind: don't spiral
+
+
+# ── Front End ─────────────────────────────────────────────────────────────────
+class _Worker:
+    __slots__ = ('proc', 'conn', 'load', 'sessions', 'pending', 'peak')
+
+    def __init__(self, proc, conn):
+        self.proc = proc
+        self.conn = conn
+        self.load = 0.0
+        self.sessions = 0
+        self.pending = 0            # admitted, not yet counted by the worker
+        self.peak = (0, 0.0)        # most games hosted, with the load at the time
+
+
+class GameServer:
+    def __init__(self, workers=None, engine=DEFAULT_ENGINE, push_every=PUSH_EVERY,
+                 budget=BUDGET, max_sessions=0):
+        self.n_workers = workers or os.cpu_count() or 1
+        self.engine = engine
+        self.push_every = push_every
+        self.tick_budget = budget / TICK_RATE
+        self.max_sessions = max_sessions
+        self.workers = []
+        self.clients = {}           # sid -> (worker, writer)
+        self.next_sid = 1
+        self.stats = {"admitted": 0, "rejected": 0, "dropped": 0, "ended": 0}
+
+    def start_workers(self):
+        ctx = multiprocessing.get_context("spawn")
+        for _ in range(self.n_workers):
+            ours, theirs = ctx.Pipe()
+            proc = ctx.Process(target=worker_main, args=(theirs, self.engine, self.push_every),
+                               daemon=True)
+            proc.start()
+            w = _Worker(proc, ours)
+            self.workers.append(w)
+            asyncio.get_running_loop().add_reader(ours.fileno(), self._drain, w)
+
+    def _drain(self, w):
+        while w.conn.poll():
+            _, frames, w.load, w.sessions, ended = w.conn.recv()
+            w.pending = 0
+            if w.sessions >= w.peak[0]:
+                w.peak = (w.sessions, w.load)
+            for sid, msg in frames:
+                client = self.clients.get(sid)
+                if client is None:
+                    continue
+                writer = client[1]
+                if writer.transport.get_write_buffer_size() > WRITE_LIMIT:
+                    # Client not reading: skip frames, resync with a keyframe
+                    self.stats["dropped"] += 1
+                    w.conn.send(("key", sid))
+                    continue
+                writer.write(msg)
+            for sid in ended:
+                client = self.clients.pop(sid, None)
+                if client is not None:
+                    self.stats["ended"] += 1
+                    client[1].write(_reply({"ok": True, "session": sid, "gameover": True}))
+
+    def admit(self):
+        """Least-loaded worker that can take one more game, or None."""
+        total = sum(w.sessions + w.pending for w in self.workers)
+        if self.max_sessions and total >= self.max_sessions:
+            return None
+        best = min(self.workers, key=lambda w: w.load)
+        per_game = best.load / best.sessions if best.sessions else GAME_COST
+        if best.load + per_game * (best.pending + 1) > self.tick_budget:
+            return None
+        return best
+
+    async def serve_client(self, reader, writer):
+        sid = None
+        worker = None
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    writer.write(_reply({"ok": False, "error": "line too long"}))
+                    break
+                if not line:
+                    break
+                if sid is not None and sid not in self.clients:
+                    sid = None              # the game ended; the worker has freed it
+                # Anything malformed is refused, not allowed to end the session
+                try:
+                    req = json.loads(line)
+                    if not isinstance(req, dict):
+                        raise TypeError(type(req).__name__)
+                    op = req.get("op")
+                    if op == "new":
+                        seed = req.get("seed")
+                        seed = None if seed is None else int(seed)
+                        hard = bool(req.get("hard", False))
+                    elif op == "input":
+                        d = int(req["dir"])
+                        if d not in range(4):
+                            raise ValueError(d)
+                except (KeyError, TypeError, ValueError):
+                    writer.write(_reply({"ok": False, "error": "bad request"}))
+                    continue
+                if op == "new" and sid is None:
+                    worker = self.admit()
+                    if worker is None:
+                        self.stats["rejected"] += 1
+                        writer.write(_reply({"ok": False, "error": "busy"}))
+                        continue
+                    sid = self.next_sid
+                    self.next_sid += 1
+                    worker.pending += 1
+                    self.clients[sid] = (worker, writer)
+                    worker.conn.send(("new", sid, sid if seed is None else seed, hard))
+                    self.stats["admitted"] += 1
+                    writer.write(_reply({"ok": True, "session": sid}))
+                elif op == "input" and sid is not None:
+                    worker.conn.send(("input", sid, d))
+                else:
+                    writer.write(_reply({"ok": False, "error": "bad request"}))
+        except ConnectionError:
+            pass
+        finally:
+            if sid is not None:
+                self.clients.pop(sid, None)
+                try:
+                    worker.conn.send(("close", sid))
+                except OSError:
+                    pass                # worker already stopped
+            writer.close()
+
+    def stop(self):
+        loop = asyncio.get_running_loop()
+        for w in self.workers:
+            loop.remove_reader(w.conn.fileno())
+            w.conn.send(("stop",))
+            w.proc.join(timeout=2)
+
+
+async def run_server(args):
+    server = GameServer(args.workers, args.engine, args.push, args.budget, args.max_sessions)
+    server.start_workers()
+    tcp = await asyncio.start_server(server.serve_client, args.host, args.port, limit=LINE_LIMIT)
+    print(f"serving on {args.host}:{args.port} with {server.n_workers} workers")
+    try:
+        async with tcp:
+            await tcp.serve_forever()
+    finally:
+        server.stop()
+
+
+# ── Self-Test ─────────────────────────────────────────────────────────────────
+async def _bot(port, seed, seconds, results):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(json.dumps({"op": "new", "seed": seed}).encode() + b"\n")
+    rng = random.Random(seed)
+    replica = Replica()
+    buf = b""
+    admitted = None
+    deadline = time.monotonic() + seconds
+    next_turn = 0.0
+    while time.monotonic() < deadline:
+        try:
+            data = await asyncio.wait_for(reader.read(65536), 0.1)
+        except asyncio.TimeoutError:
+            data = b""
+        if data == b"" and reader.at_eof():
+            break
+        buf += data
+        while len(buf) >= LENGTH.size:
+            (n,) = LENGTH.unpack_from(buf)
+            if len(buf) < LENGTH.size + n:
+                break
+            body, buf = buf[LENGTH.size:LENGTH.size + n], buf[LENGTH.size + n:]
+            if body[:1] == b"J":
+                reply = json.loads(body[1:])
+                if reply.get("gameover"):
+                    deadline = 0
+                elif admitted is None:
+                    admitted = reply["ok"]
+                    if not admitted:
+                        deadline = 0
+            else:
+                replica.apply(body)
+        if admitted and time.monotonic() > next_turn:
+            writer.write(json.dumps({"op": "input", "dir": rng.randrange(4)}).encode() + b"\n")
+            next_turn = time.monotonic() + rng.uniform(0.1, 1.0)
+    writer.close()
+    results.append((admitted, replica.keyframes + replica.deltas))
+
+
+async def selftest(args):
+    server = GameServer(args.workers, args.engine, args.push, args.budget, args.max_sessions)
+    server.start_workers()
+    tcp = await asyncio.start_server(server.serve_client, "127.0.0.1", 0, limit=LINE_LIMIT)
+    port = tcp.sockets[0].getsockname()[1]
+    results = []
+    bots = []
+    for i in range(args.bots):
+        bots.append(asyncio.create_task(_bot(port, i, args.seconds, results)))
+        # Ramp up so admission control sees real load figures
+        await asyncio.sleep(args.ramp / max(1, args.bots))
+    await asyncio.gather(*bots)
+    loads = [w.peak for w in server.workers]
+    tcp.close()
+    server.stop()
+
+    ok_bots = [frames for admitted, frames in results if admitted]
+    print(f"{args.bots} clients, {server.n_workers} workers, budget "
+          f"{server.tick_budget * 1000:.1f} ms/tick")
+    print(f"  admitted {server.stats['admitted']}  rejected {server.stats['rejected']}  "
+          f"frames dropped for slow clients {server.stats['dropped']}  "
+          f"games ended {server.stats['ended']}")
+    if ok_bots:
+        print(f"  frames per admitted client: min {min(ok_bots)}  max {max(ok_bots)}")
+    for i, (n, load) in enumerate(loads):
+        print(f"  worker {i}: peak {n} games at {load * 1000:.2f} ms/tick")
+    return bool(ok_bots) and min(ok_bots) > 0
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=7790)
+    ap.add_argument("--workers", type=int, default=0, help="worker processes (0 = one per core)")
+    ap.add_argument("--push", type=int, default=PUSH_EVERY, help="ticks between state pushes")
+    ap.add_argument("--budget", type=float, default=BUDGET,
+                    help="share of each tick a worker may spend stepping games")
+    ap.add_argument("--max-sessions", type=int, default=0, help="hard cap (0 = load only)")
+    ap.add_argument("--selftest", action="store_true", help="run bot clients against a local server")
+    ap.add_argument("--bots", type=int, default=200)
+    ap.add_argument("--seconds", type=float, default=5.0)
+    ap.add_argument("--ramp", type=float, default=2.0, help="seconds to connect all bots")
+    ap.add_argument("--engine", default=DEFAULT_ENGINE)
+    args = ap.parse_args(argv)
+    if args.selftest:
+        sys.exit(0 if asyncio.run(selftest(args)) else 1)
+    try:
+        asyncio.run(run_server(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
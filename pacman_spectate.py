@@ -0,0 +1,411 @@
+"""
+Spectator streaming: the live game as a keyframe plus per-frame deltas.
+
+An asyncio TCP server runs on its own thread inside the game process. The
+game thread only captures a small view of the state after each drawn frame
+and hands it over; diffing, encoding and sending happen on the server
+thread. A new spectator gets a keyframe (maze, scores, every entity), then
+deltas carrying only what changed: moved entities, eaten dot indices,
+score, lives, level, mode and state. A spectator that cannot keep up has
+its backlog dropped and is resynchronised with a fresh keyframe, so a slow
+screen never holds up the game or the other viewers.
+
+    python $acholdingpacman4k.py --spectate 7788      # play and stream
+    python pacman_spectate.py --watch 127.0.0.1:7788  # watch
+    python pacman_spectate.py --selftest              # localhost check
+
+Wire format: each message is a big-endian uint16 length followed by a type
+byte, b"K" (keyframe) or b"D" (delta), and the fields packed below.
+"""
+
+import sys
+import time
+import socket
+import struct
+import asyncio
+import argparse
+import threading
+
+from pacman_headless import load_engine, random_inputs, DEFAULT_ENGINE
+
+QUEUE_SIZE = 64         # messages buffered per spectator before a resync
+WRITE_BUFFER = 16384    # bytes the transport holds before drain() waits
+STATES = ("READY", "PLAYING", "DEAD", "GAMEOVER")
+
+LENGTH = struct.Struct("!H")
+KEY_HEAD = struct.Struct("!cIIBBBBH")   # type, tick, score, lives, level, mode, state, maze len
+DELTA_HEAD = struct.Struct("!cIB")      # type, tick, flags
+ENTITY = struct.Struct("!hhBB")         # x, y (quarter pixels), dir, mode (Pac-Man: alive)
+SCORE = struct.Struct("!I")
+SCALARS = struct.Struct("!BBBB")        # lives, level, mode, state
+COUNT = struct.Struct("!H")
+
+F_SCORE, F_SCALARS, F_ENTITIES, F_DOTS = 1, 2, 4, 8
+
+
+# ── Capture / Encoding ────────────────────────────────────────────────────────
+def capture(game):
+    """Spectator-visible state, as immutable values (runs on the game thread)."""
+    pac = game.pac
+    ents = [(round(pac.x * 4), round(pac.y * 4), pac.dir, int(pac.alive))]
+    ents += [(round(g.x * 4), round(g.y * 4), g.dir, g.mode) for g in game.ghosts]
+    return (bytes(game.maze), game.score, game.lives, game.level,
+            game.global_mode, STATES.index(game.state), tuple(ents))
+
+
+def _frame(body):
+    return LENGTH.pack(len(body)) + body
+
+
+def encode_keyframe(view, tick):
+    maze, score, lives, level, mode, state, ents = view
+    parts = [KEY_HEAD.pack(b"K", tick, score, lives, level, mode, state, len(maze)),
+             maze, bytes([len(ents)])]
+    parts += [ENTITY.pack(*e) for e in ents]
+    return _frame(b"".join(parts))
+
+
+def encode_delta(prev, view, tick):
+    """Delta from prev to view, or None when only a keyframe will do."""
+    maze0, score0, *scalars0, ents0 = prev
+    maze, score, *scalars, ents = view
+    dots = []
+    if maze != maze0:
+        for i, (a, b) in enumerate(zip(maze0, maze)):
+            if a != b:
+                if b != 0:
+                    return None         # tiles refilled: new level
+                dots.append(i)
+
+    flags = 0
+    parts = []
+    if score != score0:
+        flags |= F_SCORE
+        parts.append(SCORE.pack(score))
+    if scalars != scalars0:
+        flags |= F_SCALARS
+        parts.append(SCALARS.pack(*scalars))
+    moved = [(i, e) for i, e in enumerate(ents) if e != ents0[i]]
+    if moved:
+        flags |= F_ENTITIES
+        parts.append(bytes([len(moved)]))
+        parts += [bytes([i]) + ENTITY.pack(*e) for i, e in moved]
+    if dots:
+        flags |= F_DOTS
+        parts.append(COUNT.pack(len(dots)))
+        parts.append(struct.pack("!%dH" % len(dots), *dots))
+    return _frame(DELTA_HEAD.pack(b"D", tick, flags) + b"".join(parts))
+
+
+class Replica:
+    """Spectator-side state rebuilt from the message stream."""
+
+    def __init__(self):
+        self.buf = b""
+        self.tick = -1
+        self.view = None
+        self.keyframes = 0
+        self.deltas = 0
+
+    def feed(self, data):
+        self.buf += data
+        while len(self.buf) >= LENGTH.size:
+            (n,) = LENGTH.unpack_from(self.buf)
+            if len(self.buf) < LENGTH.size + n:
+                return
+            body = self.buf[LENGTH.size:LENGTH.size + n]
+            self.buf = self.buf[LENGTH.size + n:]
+            self.apply(body)
+
+    def apply(self, body):
+        if body[:1] == b"K":
+            _, tick, score, lives, level, mode, state, n = KEY_HEAD.unpack_from(body)
+            at = KEY_HEAD.size
+            maze = bytearray(body[at:at + n])
+            at += n
+            ents = [ENTITY.unpack_from(body, at + 1 + i * ENTITY.size)
+                    for i in range(body[at])]
+            self.view = [maze, score, lives, level, mode, state, ents]
+            self.keyframes += 1
+        elif self.view is not None:
+            _, tick, flags = DELTA_HEAD.unpack_from(body)
+            at = DELTA_HEAD.size
+            v = self.view
+            if flags & F_SCORE:
+                (v[1],) = SCORE.unpack_from(body, at)
+                at += SCORE.size
+            if flags & F_SCALARS:
+                v[2], v[3], v[4], v[5] = SCALARS.unpack_from(body, at)
+                at += SCALARS.size
+            if flags & F_ENTITIES:
+                n = body[at]
+                at += 1
+                for _ in range(n):
+                    v[6][body[at]] = ENTITY.unpack_from(body, at + 1)
+                    at += 1 + ENTITY.size
+            if flags & F_DOTS:
+                (n,) = COUNT.unpack_from(body, at)
+                at += COUNT.size
+                for i in struct.unpack_from("!%dH" % n, body, at):
+                    v[0][i] = 0
+            self.deltas += 1
+        else:
+            return                      # delta before the first keyframe
+        self.tick = tick
+
+    def matches(self, view):
+        return self.view is not None and (bytes(self.view[0]), *self.view[1:6],
+                                          tuple(self.view[6])) == view
+
+    def apply_to(self, eng, game):
+        """Pose a local Game so its draw() shows the replicated state."""
+        maze, game.score, game.lives, game.level, game.global_mode, state, ents = self.view
+        game.maze[:] = maze
+        game.ticks = self.tick          # the stream's frames drive the blink
+        game.state = STATES[state]
+        pac = game.pac
+        x, y, pac.dir, alive = ents[0]
+        pac.alive = bool(alive)
+        pac.place(x / 4, y / 4)
+        for g, (x, y, g.dir, g.mode) in zip(game.ghosts, ents[1:]):
+            g.place(x / 4, y / 4)
+            if g.mode == eng.Ghost.FRIGHT:
+                g.scared_timer = 1 << 30        # no flash information on the wire
+
+
+# ── Server ────────────────────────────────────────────────────────────────────
+class _Spectator:
+    __slots__ = ('queue', 'needs_key', 'resyncs', 'sent')
+
+    def __init__(self, size):
+        self.queue = asyncio.Queue(size)
+        self.needs_key = True
+        self.resyncs = 0
+        self.sent = 0
+
+
+class SpectatorServer:
+    """Background-thread asyncio server; publish(game) from the game loop."""
+
+    def __init__(self, host="127.0.0.1", port=0, queue_size=QUEUE_SIZE):
+        self.host, self.port = host, port
+        self.queue_size = queue_size
+        self.clients = set()
+        self.last = None
+        self.tick = 0
+        self.bytes = {"K": 0, "D": 0}
+        self.messages = {"K": 0, "D": 0}
+        self.loop = None
+        self._ready = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="spectators", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        server = self.loop.run_until_complete(
+            asyncio.start_server(self._serve, self.host, self.port))
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            server.close()
+            tasks = asyncio.all_tasks(self.loop)
+            for task in tasks:
+                task.cancel()
+            self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            self.loop.close()
+
+    async def _serve(self, reader, writer):
+        sock = writer.get_extra_info("socket")
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, WRITE_BUFFER)
+        writer.transport.set_write_buffer_limits(high=WRITE_BUFFER)
+        sp = _Spectator(self.queue_size)
+        self.clients.add(sp)
+        try:
+            while True:
+                msg = await sp.queue.get()
+                if msg is None:
+                    break
+                writer.write(msg)
+                sp.sent += len(msg)
+                await writer.drain()    # waits while the client is behind
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.clients.discard(sp)
+            writer.close()
+
+    def publish(self, game):
+        """Queue the current frame for every spectator (game thread)."""
+        view = capture(game)
+        self.loop.call_soon_threadsafe(self._broadcast, view)
+
+    def _broadcast(self, view):
+        tick = self.tick
+        self.tick += 1
+        delta = None if self.last is None else encode_delta(self.last, view, tick)
+        self.last = view
+        key = None
+        for sp in self.clients:
+            if sp.queue.full():
+                # Too slow: drop the backlog and start over from a keyframe
+                while not sp.queue.empty():
+                    sp.queue.get_nowait()
+                sp.needs_key = True
+                sp.resyncs += 1
+            if sp.needs_key or delta is None:
+                if key is None:
+                    key = encode_keyframe(view, tick)
+                msg = key
+                sp.needs_key = False
+            else:
+                msg = delta
+            kind = chr(msg[2])
+            self.bytes[kind] += len(msg)
+            self.messages[kind] += 1
+            sp.queue.put_nowait(msg)
+
+    def stats(self):
+        return [(sp.sent, sp.resyncs) for sp in list(self.clients)]
+
+    def close(self):
+        def stop():
+            for sp in self.clients:
+                while not sp.queue.empty():
+                    sp.queue.get_nowait()
+                sp.queue.put_nowait(None)
+            self.loop.call_later(0.05, self.loop.stop)
+        self.loop.call_soon_threadsafe(stop)
+        self._thread.join()
+
+
+# ── Viewer ────────────────────────────────────────────────────────────────────
+def watch(args):
+    eng = load_engine(args.engine, headless=False)
+    pygame = eng.pygame
+    host, port = args.watch.rsplit(":", 1)
+    sock = socket.create_connection((host, int(port)))
+    sock.setblocking(False)
+    game = eng.Game()
+    game.muted = True
+    replica = Replica()
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN
+                                             and event.key == pygame.K_ESCAPE):
+                running = False
+        try:
+            while True:
+                data = sock.recv(65536)
+                if not data:
+                    running = False
+                    break
+                replica.feed(data)
+        except BlockingIOError:
+            pass
+        if replica.view is not None:
+            replica.apply_to(eng, game)
+            game.draw()
+            pygame.display.set_caption(f"Pac-Man spectator  frame {replica.tick}  "
+                                       f"keyframes {replica.keyframes}")
+        eng.clock.tick(eng.FPS)
+    sock.close()
+
+
+# ── Self-Test ─────────────────────────────────────────────────────────────────
+def _reader(sock, replica, stop):
+    while not stop.is_set():
+        try:
+            data = sock.recv(65536)
+        except socket.timeout:
+            continue
+        except OSError:
+            return
+        if not data:
+            return
+        replica.feed(data)
+
+
+def selftest(args):
+    eng = load_engine(args.engine)
+    server = SpectatorServer(queue_size=args.queue).start()
+    stop = threading.Event()
+    fast = []
+    for _ in range(args.clients):
+        sock = socket.create_connection(("127.0.0.1", server.port))
+        sock.settimeout(0.05)
+        replica = Replica()
+        threading.Thread(target=_reader, args=(sock, replica, stop), daemon=True).start()
+        fast.append((sock, replica))
+    # The stalled spectator never reads; its receive window stays tiny
+    stalled = socket.socket()
+    stalled.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    stalled.connect(("127.0.0.1", server.port))
+    while len(server.clients) < args.clients + 1:
+        time.sleep(0.01)
+
+    game = eng.Game(seed=args.seed)
+    game.muted = True
+    inputs = dict(random_inputs(args.seed, args.ticks))
+    started = time.perf_counter()
+    for tick in range(args.ticks):
+        if tick in inputs:
+            game.pac.next_dir = inputs[tick]
+        game.update()
+        server.publish(game)
+        time.sleep(1 / args.rate)
+    final = capture(game)
+    deadline = time.time() + 5
+    while time.time() < deadline and any(r.tick < args.ticks - 1 for _, r in fast):
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - started
+
+    stats = server.stats()
+    stop.set()
+    server.close()
+    for sock, _ in fast:
+        sock.close()
+    stalled.close()
+
+    ok = all(r.matches(final) for _, r in fast)
+    resyncs = max(r for _, r in stats)
+    ok = ok and resyncs > 0
+    print(f"frames {args.ticks} to {args.clients} spectators + 1 stalled  ({elapsed:.2f}s)")
+    print(f"  keyframe {len(encode_keyframe(final, 0))} bytes, deltas "
+          f"{server.bytes['D'] / max(1, server.messages['D']):.1f} bytes on average")
+    for (_, r), i in zip(fast, range(len(fast))):
+        print(f"  spectator {i}: {r.keyframes} keyframe(s), {r.deltas} deltas, "
+              f"{'in sync' if r.matches(final) else 'OUT OF SYNC'}")
+    print(f"  stalled spectator: backlog dropped {resyncs} times, queue capped at {args.queue}")
+    print("  result: " + ("ok" if ok else "FAILED"))
+    return ok
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    mode = ap.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--watch", metavar="HOST:PORT", help="connect and render the stream")
+    mode.add_argument("--selftest", action="store_true",
+                      help="stream a headless game to local spectators")
+    ap.add_argument("--clients", type=int, default=4)
+    ap.add_argument("--ticks", type=int, default=3000)
+    ap.add_argument("--rate", type=float, default=2000, help="self-test frames per second")
+    ap.add_argument("--queue", type=int, default=QUEUE_SIZE)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--engine", default=DEFAULT_ENGINE)
+    args = ap.parse_args(argv)
+    if args.selftest:
+        sys.exit(0 if selftest(args) else 1)
+    watch(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""
+Swarm stress mode: hundreds of ghosts on the standard maze.
+
+Two backends share the same maze, Pac-Man and renderer so their costs can
+be compared directly:
+
+  arrays   (default) ghost state lives in flat arrays (tile, heading,
+           progress, personality). Ghosts steer by precomputed flow fields,
+           one per target class (four scatter corners + Pac-Man's tile), so
+           a decision is a single table lookup. Pac-Man collisions are
+           checked through a per-tile spatial grid.
+  objects  one Ghost instance per ghost, each running Ghost.update and a
+           full distance check against Pac-Man every tick, i.e. the
+           current per-object design.
+
+    python pacman_swarm.py --ghosts 500
+    python pacman_swarm.py --ghosts 2000 --headless --ticks 600 --backend objects
+"""
+
+import sys
+import time
+import random
+import argparse
+from array import array
+
+from pacman_headless import load_engine, DEFAULT_ENGINE
+
+NO_DIR = 255
+# Scatter/chase cycle for the whole swarm: (seconds, chase?)
+SWARM_WAVES = ((7, False), (20, True))
+
+
+# ── Flow Fields ───────────────────────────────────────────────────────────────
+class FlowFields:
+    """Best exit per (tile, heading) for every target class.
+
+    A flow table is a bytearray indexed by tile * 4 + heading. It is derived
+    from the shared DistanceFields and respects the no-reverse rule and the
+    Up > Left > Down > Right tie-break. Chase tables are cached per Pac-Man
+    tile, so each one is built at most once per run.
+    """
+
+    def __init__(self, eng):
+        self.eng = eng
+        self.dist = eng.DistanceFields.shared(False)
+        self.exits = eng.GHOST_EXITS[False]
+        corners = [(25, -2), (2, -2), (27, 31), (0, 31)]
+        self.scatter = [self._build(self.dist.field(c, r)) for c, r in corners]
+        self.chase = {}
+
+    def _build(self, field):
+        eng = self.eng
+        flow = bytearray([NO_DIR]) * (eng.ROWS * eng.COLS * 4)
+        for t, per_dir in enumerate(self.exits):
+            r, c = divmod(t, eng.COLS)
+            for heading, opts in enumerate(per_dir):
+                best, best_n = NO_DIR, None
+                for d in opts:
+                    n = field[(r + eng.DY[d]) * eng.COLS + (c + eng.DX[d]) % eng.COLS]
+                    if best_n is None or n < best_n:
+                        best, best_n = d, n
+                flow[t * 4 + heading] = best
+        return flow
+
+    def chase_to(self, c, r):
+        key = r * self.eng.COLS + c
+        flow = self.chase.get(key)
+        if flow is None:
+            flow = self.chase[key] = self._build(self.dist.field(c, r))
+        return flow
+
+
+def spawn_tiles(eng):
+    """Open tiles connected to Blinky's start, outside the ghost house."""
+    reach = eng.DistanceFields.shared(False).field(13, 11)
+    tiles = []
+    for t in sorted(eng.DistanceFields.shared(False).rows):
+        if reach[t] != eng.UNREACHABLE and eng.MAZE_BYTES[t] != eng.H:
+            tiles.append(t)
+    return tiles
+
+
+def legal_dirs(eng, t):
+    """Every direction a ghost may leave tile t in (door excluded)."""
+    exits = eng.GHOST_EXITS[False][t]
+    return sorted(set(exits[0]) | set(exits[1]))
+
+
+# ── Array Backend ─────────────────────────────────────────────────────────────
+class ArraySwarm:
+    def __init__(self, eng, count, rng):
+        self.eng = eng
+        self.flows = FlowFields(eng)
+        self.spawn = spawn_tiles(eng)
+        self.tile = array('H', (rng.choice(self.spawn) for _ in range(count)))
+        self.dir = array('B', (rng.choice(legal_dirs(eng, t)) for t in self.tile))
+        self.prog = array('f', bytes(4 * count))
+        self.kind = array('B', (i % 4 for i in range(count)))
+        self.count = count
+        # Level 1 cruising speed, as Ghost.update moves the objects backend
+        self.speed = eng.LEVELS.row(1).ghost_speed
+
+    def step(self, pac, chase):
+        eng = self.eng
+        cols = eng.COLS
+        dx, dy = eng.DX, eng.DY
+        tile, dirs, prog, kind = self.tile, self.dir, self.prog, self.kind
+        flows = self.flows.scatter
+        chase_flow = self.flows.chase_to(pac.col, pac.row) if chase else None
+        speed = self.speed
+        for i in range(self.count):
+            p = prog[i] + speed
+            while p >= eng.TILE:
+                p -= eng.TILE
+                t = tile[i]
+                d = dirs[i]
+                r, c = divmod(t, cols)
+                t = (r + dy[d]) * cols + (c + dx[d]) % cols
+                flow = chase_flow if chase_flow is not None else flows[kind[i]]
+                nd = flow[t * 4 + d]
+                tile[i] = t
+                dirs[i] = nd if nd != NO_DIR else eng.OPP[d]
+            prog[i] = p
+
+    def position(self, i):
+        eng = self.eng
+        r, c = divmod(self.tile[i], eng.COLS)
+        cx, cy = eng.get_tile_center(c, r)
+        d = self.dir[i]
+        p = self.prog[i]
+        return cx + eng.DX[d] * p, cy + eng.DY[d] * p
+
+    def collide(self, pac):
+        """Indices of ghosts touching Pac-Man, via a per-tile spatial grid."""
+        cols = self.eng.COLS
+        grid = {}
+        for i, t in enumerate(self.tile):
+            grid.setdefault(t, []).append(i)
+        hits = []
+        for rr in (pac.row - 1, pac.row, pac.row + 1):
+            for cc in (pac.col - 1, pac.col, pac.col + 1):
+                for i in grid.get(rr * cols + cc % cols, ()):
+                    x, y = self.position(i)
+                    if (x - pac.x) ** 2 + (y - pac.y) ** 2 < 100:
+                        hits.append(i)
+        return hits
+
+    def respawn(self, i, rng):
+        self.tile[i] = rng.choice(self.spawn)
+        self.dir[i] = rng.choice(legal_dirs(self.eng, self.tile[i]))
+        self.prog[i] = 0.0
+
+    def draw_list(self, chase):
+        for i in range(self.count):
+            x, y = self.position(i)
+            yield self.kind[i], x, y, self.dir[i]
+
+
+# ── Object Backend ────────────────────────────────────────────────────────────
+class ObjectSwarm:
+    def __init__(self, eng, count, rng):
+        self.eng = eng
+        self.spawn = spawn_tiles(eng)
+        self.ghosts = []
+        for i in range(count):
+            g = eng.Ghost(i % 4)
+            r, c = divmod(rng.choice(self.spawn), eng.COLS)
+            g.x, g.y = eng.get_tile_center(c, r)
+            g.update_grid_pos()
+            g.mode = eng.Ghost.SCATTER
+            self.ghosts.append(g)
+        self.maze = eng.make_maze()
+        self.row = eng.LEVELS.row(1)
+        self.count = count
+
+    def step(self, pac, chase):
+        mode = self.eng.Ghost.CHASE if chase else self.eng.Ghost.SCATTER
+        for g in self.ghosts:
+            if g.mode != mode:
+                g.mode = mode
+            g.update(self.maze, pac, self.ghosts, mode, 244, self.row)
+
+    def collide(self, pac):
+        return [i for i, g in enumerate(self.ghosts)
+                if (g.x - pac.x) ** 2 + (g.y - pac.y) ** 2 < 100]
+
+    def respawn(self, i, rng):
+        eng = self.eng
+        r, c = divmod(rng.choice(self.spawn), eng.COLS)
+        g = self.ghosts[i]
+        g.x, g.y = eng.get_tile_center(c, r)
+        g.update_grid_pos()
+
+    def draw_list(self, chase):
+        for g in self.ghosts:
+            yield g.id, g.x, g.y, g.dir
+
+
+# ── Rendering ─────────────────────────────────────────────────────────────────
+def build_maze_layer(eng):
+    surf = eng.pygame.Surface((eng.WIN_W, eng.WIN_H))
+    surf.fill(eng.BK)
+    for r, row in enumerate(eng.MAZE):
+        for c, val in enumerate(row):
+            if val == eng.W:
+                eng.pygame.draw.rect(surf, eng.WC, (c * eng.TILE + 4, eng.MTOP + r * eng.TILE + 4, 8, 8))
+    return surf
+
+
+def draw_swarm(eng, surf, layer, pac, swarm, chase, proxies):
+    surf.blit(layer, (0, 0))
+    pac.draw(surf)
+    mode = eng.Ghost.CHASE if chase else eng.Ghost.SCATTER
+    for kind, x, y, d in swarm.draw_list(chase):
+        g = proxies[kind]
+        g.x, g.y, g.dir, g.mode = x, y, d, mode
+        g.draw(surf)
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+def run(args):
+    eng = load_engine(args.engine, headless=args.headless)
+    pygame = eng.pygame
+    rng = random.Random(args.seed)
+    random.seed(args.seed)
+
+    maze = eng.make_maze()
+    pac = eng.Pacman()
+    backend = ArraySwarm if args.backend == "arrays" else ObjectSwarm
+    swarm = backend(eng, args.ghosts, rng)
+    proxies = [eng.Ghost(i) for i in range(4)]
+    layer = build_maze_layer(eng)
+    font = pygame.font.SysFont("monospace", 14, bold=True)
+
+    wave_idx, wave_left = 0, SWARM_WAVES[0][0] * eng.FPS
+    cost = {"ai": 0.0, "collide": 0.0, "render": 0.0}
+    hits = 0
+    tick = 0
+    clock = pygame.time.Clock()
+    running = True
+    while running and (args.ticks <= 0 or tick < args.ticks):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    running = False
+                elif event.key in (pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT):
+                    pac.next_dir = {pygame.K_UP: eng.UP, pygame.K_DOWN: eng.DOWN,
+                                    pygame.K_LEFT: eng.LEFT, pygame.K_RIGHT: eng.RIGHT}[event.key]
+        if args.headless and tick % 45 == 0:
+            pac.next_dir = rng.randrange(4)
+
+        wave_left -= 1
+        if wave_left <= 0:
+            wave_idx = (wave_idx + 1) % len(SWARM_WAVES)
+            wave_left = SWARM_WAVES[wave_idx][0] * eng.FPS
+        chase = SWARM_WAVES[wave_idx][1]
+
+        t0 = time.perf_counter()
+        pac.update(maze, eng.LEVELS.row(1))
+        swarm.step(pac, chase)
+        t1 = time.perf_counter()
+        for i in swarm.collide(pac):
+            hits += 1
+            swarm.respawn(i, rng)
+        t2 = time.perf_counter()
+        if not args.headless or args.render:
+            draw_swarm(eng, eng.screen, layer, pac, swarm, chase, proxies)
+            eng.screen.blit(font.render(f"{swarm.count} ghosts  hits {hits}  {clock.get_fps():.0f} fps",
+                                        True, eng.WH), (8, 8))
+            pygame.display.flip()
+        t3 = time.perf_counter()
+        cost["ai"] += t1 - t0
+        cost["collide"] += t2 - t1
+        cost["render"] += t3 - t2
+        tick += 1
+        clock.tick(0 if args.headless else eng.FPS)
+
+    ticks = max(1, tick)
+    total = sum(cost.values())
+    print(f"backend {args.backend}  ghosts {swarm.count}  ticks {tick}  hits {hits}")
+    for name, spent in cost.items():
+        print(f"  {name:8s} {1000 * spent / ticks:8.3f} ms/tick")
+    print(f"  {'total':8s} {1000 * total / ticks:8.3f} ms/tick  "
+          f"(frame budget {1000 / eng.FPS:.1f} ms)")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    ap.add_argument("--ghosts", type=int, default=300)
+    ap.add_argument("--backend", choices=("arrays", "objects"), default="arrays")
+    ap.add_argument("--headless", action="store_true",
+                    help="no window; autopilot Pac-Man, run as fast as possible")
+    ap.add_argument("--render", action="store_true",
+                    help="with --headless, still render every frame off-screen")
+    ap.add_argument("--ticks", type=int, default=0, help="stop after N ticks (0 = run until closed)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--engine", default=DEFAULT_ENGINE)
+    run(ap.parse_args(argv))
+    if "pygame" in sys.modules:
+        sys.modules["pygame"].quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Per-tick trajectory export to memory-mapped columnar files.
+
+A dataset is a directory with one raw little-endian column file per field
+(<name>.bin) and schema.json naming each column's dtype and the row count.
+Column files are preallocated and grown in large steps. Rows are staged in
+memory and copied into the maps a whole chunk at a time. On close each file
+is trimmed to the rows written. Readers map the columns straight from disk;
+there is nothing to parse:
+
+    cols = open_dataset("runs/a")
+    cols["pac_x"][cols["game"] == 3]
+
+    python pacman_trajectories.py --out runs/a --games 20 --ticks 20000
+    python pacman_trajectories.py --info runs/a
+
+Requires NumPy.
+"""
+
+import os
+import json
+import time
+import argparse
+
+import numpy as np
+
+from pacman_headless import load_engine, random_inputs, DEFAULT_ENGINE
+
+CHUNK = 1 << 16         # rows staged before a block copy into the maps
+GROW = 1 << 20          # rows added to the column files at a time
+
+
+def columns(n_ghosts=4):
+    """(name, dtype) for every recorded field, in row order."""
+    cols = [("game", "<u4"), ("tick", "<u4"),
+            ("pac_x", "<f4"), ("pac_y", "<f4"), ("pac_dir", "u1")]
+    for i in range(n_ghosts):
+        cols += [(f"g{i}_x", "<f4"), (f"g{i}_y", "<f4"),
+                 (f"g{i}_dir", "u1"), (f"g{i}_mode", "u1")]
+    cols += [("score", "<u4"), ("dots_left", "<u2")]
+    return cols
+
+
+def capture_row(game, game_id, tick):
+    """One row in columns() order."""
+    pac = game.pac
+    row = [game_id, tick, pac.x, pac.y, pac.dir]
+    for g in game.ghosts:
+        row += (g.x, g.y, g.dir, g.mode)
+    row += (game.score, game.dots_left)
+    return row
+
+
+# ── Writer ────────────────────────────────────────────────────────────────────
+class TrajectoryWriter:
+    """Append-only columnar writer; use as a context manager or call close()."""
+
+    def __init__(self, directory, cols=None, chunk=CHUNK, grow=GROW):
+        self.dir = directory
+        self.cols = cols or columns()
+        self.dtypes = [np.dtype(t) for _, t in self.cols]
+        self.chunk = chunk
+        self.grow = grow
+        self.rows = 0
+        self.capacity = 0
+        self.staged = []
+        self.maps = []
+        os.makedirs(directory, exist_ok=True)
+        self.paths = [os.path.join(directory, name + ".bin") for name, _ in self.cols]
+        for path in self.paths:
+            open(path, "wb").close()
+        self._reserve(grow)
+
+    def _reserve(self, capacity):
+        """Extend every column file to capacity rows and remap it."""
+        for m in self.maps:
+            m.flush()
+        self.maps = []
+        for path, dt in zip(self.paths, self.dtypes):
+            os.truncate(path, capacity * dt.itemsize)
+            self.maps.append(np.memmap(path, dtype=dt, mode="r+", shape=(capacity,)))
+        self.capacity = capacity
+
+    def append(self, row):
+        self.staged.append(row)
+        if len(self.staged) >= self.chunk:
+            self._spill()
+
+    def _spill(self):
+        n = len(self.staged)
+        if not n:
+            return
+        if self.rows + n > self.capacity:
+            self._reserve(max(self.rows + n, self.capacity + self.grow))
+        lo, hi = self.rows, self.rows + n
+        for m, values in zip(self.maps, zip(*self.staged)):
+            m[lo:hi] = values
+        self.rows = hi
+        self.staged = []
+
+    def close(self):
+        self._spill()
+        for m in self.maps:
+            m.flush()
+        self.maps = []
+        for path, dt in zip(self.paths, self.dtypes):
+            os.truncate(path, self.rows * dt.itemsize)
+        schema = {"rows": self.rows,
+                  "columns": [{"name": n, "dtype": t} for n, t in self.cols]}
+        with open(os.path.join(self.dir, "schema.json"), "w") as f:
+            json.dump(schema, f, indent=1)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_dataset(directory):
+    """Read-only memory maps of every column, keyed by name."""
+    with open(os.path.join(directory, "schema.json")) as f:
+        schema = json.load(f)
+    rows = schema["rows"]
+    out = {}
+    for col in schema["columns"]:
+        path = os.path.join(directory, col["name"] + ".bin")
+        if rows:
+            out[col["name"]] = np.memmap(path, dtype=col["dtype"], mode="r", shape=(rows,))
+        else:
+            out[col["name"]] = np.empty(0, dtype=col["dtype"])
+    return out
+
+
+# ── Export ────────────────────────────────────────────────────────────────────
+def export(engine, writer, seed, max_ticks, hard=False):
+    """Play one seeded game (as pacman_headless.play does) recording every tick."""
+    game = engine.Game(hard=hard, seed=seed)
+    game.muted = True
+    inputs = dict(random_inputs(seed, max_ticks))
+    for tick in range(max_ticks):
+        if game.state == "GAMEOVER":
+            break
+        if tick in inputs:
+            game.pac.next_dir = inputs[tick]
+        game.update()
+        writer.append(capture_row(game, seed, tick))
+    return game
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    ap.add_argument("--out", help="dataset directory to write")
+    ap.add_argument("--info", metavar="DIR", help="summarise an existing dataset")
+    ap.add_argument("--games", type=int, default=10)
+    ap.add_argument("--ticks", type=int, default=60 * 60 * 5)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--hard", action="store_true")
+    ap.add_argument("--engine", default=DEFAULT_ENGINE)
+    args = ap.parse_args(argv)
+
+    if args.info:
+        cols = open_dataset(args.info)
+        rows = len(cols["tick"])
+        size = sum(c.nbytes for c in cols.values())
+        print(f"{rows} rows, {len(cols)} columns, {size / 1e6:.1f} MB "
+              f"({size / max(1, rows):.0f} bytes/row)")
+        if rows:
+            print(f"games {len(np.unique(cols['game']))}  max score {int(cols['score'].max())}")
+        return
+    if not args.out:
+        ap.error("--out or --info is required")
+
+    engine = load_engine(args.engine)
+    started = time.perf_counter()
+    with TrajectoryWriter(args.out) as writer:
+        for seed in range(args.seed, args.seed + args.games):
+            export(engine, writer, seed, args.ticks, args.hard)
+    elapsed = time.perf_counter() - started
+    print(f"wrote {writer.rows} rows to {args.out} in {elapsed:.2f}s "
+          f"({writer.rows / max(elapsed, 1e-9):.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
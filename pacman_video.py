@@ -0,0 +1,200 @@
+"""
+Offline video export of recorded games.
+
+A recording is a small JSON file holding what pacman_headless.play needs to
+reproduce a game exactly: seed, hard flag, tick count and the
+(tick, direction) input script. Rendering re-simulates it headlessly and
+draws every tick through Game.draw into an off-screen Surface, one frame
+per tick at the engine's FPS. The pellet blink is driven from the frame
+number, so the output is the same every time.
+
+Rendering is split across processes by frame range. Each worker replays
+(fast-forwarding) up to the start of its range, then draws and writes its
+frames to a chunk file of its own. The chunks are joined in order at the
+end: for Y4M they are concatenated behind a single stream header, for a
+PNG sequence every worker writes straight into the output directory.
+
+    python pacman_video.py record --seed 7 --ticks 3600 -o game.json
+    python pacman_video.py render game.json -o game.y4m --workers 4
+    python pacman_video.py render game.json -o frames/ --format png
+
+Y4M output (YUV 4:2:0, full-range BT.601) requires NumPy.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import multiprocessing
+
+from pacman_headless import load_engine, random_inputs, play, DEFAULT_ENGINE
+
+TAIL = 120              # ticks kept after game over in a recording
+
+
+# ── Recordings ────────────────────────────────────────────────────────────────
+def record(engine, seed, max_ticks, hard=False):
+    """Recording of one seeded game with the random joystick script."""
+    inputs = random_inputs(seed, max_ticks)
+    result = play(engine, seed, inputs, max_ticks, hard=hard)
+    ticks = min(max_ticks, result["ticks"] + TAIL)
+    return {"seed": seed, "hard": hard, "ticks": ticks,
+            "inputs": [[t, d] for t, d in inputs if t < ticks],
+            "score": result["score"]}
+
+
+def load_recording(path):
+    with open(path) as f:
+        rec = json.load(f)
+    rec["inputs"] = [(int(t), int(d)) for t, d in rec["inputs"]]
+    return rec
+
+
+def simulate(engine, rec, lo, hi):
+    """Yield the game after each tick in [lo, hi) of a recording.
+
+    Ticks before lo are fast-forwarded; inputs are applied just before
+    their tick runs, as in pacman_headless.play.
+    """
+    game = engine.Game(hard=rec.get("hard", False), seed=rec["seed"])
+    game.muted = True
+    inputs = rec["inputs"]
+    i = 0
+    tick = 0
+    while tick < hi:
+        while i < len(inputs) and inputs[i][0] <= tick:
+            game.pac.next_dir = inputs[i][1]
+            i += 1
+        if tick < lo:
+            stop = min(lo, inputs[i][0]) if i < len(inputs) else lo
+            tick += game.fast_forward(stop - tick)
+            continue
+        game.update()
+        yield tick, game
+        tick += 1
+
+
+# ── Frame Writers ─────────────────────────────────────────────────────────────
+def y4m_header(width, height, fps):
+    return f"YUV4MPEG2 W{width} H{height} F{fps}:1 Ip A1:1 C420jpeg\n".encode()
+
+
+def y4m_frame(rgb, width, height):
+    """Packed RGB bytes -> one Y4M FRAME record (4:2:0, full range).
+
+    Integer BT.601 with 8-bit coefficients. Chroma is linear in RGB, so it
+    is computed once per 2x2 block from the block's summed RGB.
+    """
+    import numpy as np
+    px = np.frombuffer(rgb, np.uint8).reshape(height, width, 3).astype(np.int32)
+    r, g, b = px[..., 0], px[..., 1], px[..., 2]
+    y = (77 * r + 150 * g + 29 * b + 128) >> 8
+    q = px[0::2, 0::2] + px[0::2, 1::2] + px[1::2, 0::2] + px[1::2, 1::2]
+    r, g, b = q[..., 0], q[..., 1], q[..., 2]
+    u = ((-43 * r - 85 * g + 128 * b + 512) >> 10) + 128
+    v = ((128 * r - 107 * g - 21 * b + 512) >> 10) + 128
+    planes = [np.clip(p, 0, 255).astype(np.uint8) for p in (y, u, v)]
+    return b"FRAME\n" + b"".join(p.tobytes() for p in planes)
+
+
+def render_range(job):
+    """Worker: draw frames [lo, hi) into a chunk; return (lo, hi, seconds)."""
+    engine_path, rec, lo, hi, fmt, out = job
+    eng = load_engine(engine_path)
+    pygame = eng.pygame
+    surf = pygame.Surface((eng.WIN_W, eng.WIN_H))
+    started = time.perf_counter()
+    chunk = open(out, "wb") if fmt == "y4m" else None
+    try:
+        for tick, game in simulate(eng, rec, lo, hi):
+            game.draw(surf, tick=tick)
+            if chunk is None:
+                pygame.image.save(surf, os.path.join(out, f"frame_{tick:06d}.png"))
+            else:
+                rgb = pygame.image.tostring(surf, "RGB")
+                chunk.write(y4m_frame(rgb, eng.WIN_W, eng.WIN_H))
+    finally:
+        if chunk is not None:
+            chunk.close()
+    return lo, hi, time.perf_counter() - started
+
+
+def render(engine_path, rec, out, fmt="y4m", workers=0, chunk_frames=0):
+    """Render a recording to out (a .y4m file or a PNG directory)."""
+    eng = load_engine(engine_path)
+    total = rec["ticks"]
+    workers = workers or os.cpu_count() or 1
+    step = chunk_frames or -(-total // workers)
+    ranges = [(lo, min(total, lo + step)) for lo in range(0, total, step)]
+
+    if fmt == "png":
+        os.makedirs(out, exist_ok=True)
+        jobs = [(engine_path, rec, lo, hi, fmt, out) for lo, hi in ranges]
+    else:
+        jobs = [(engine_path, rec, lo, hi, fmt, f"{out}.part{n:04d}")
+                for n, (lo, hi) in enumerate(ranges)]
+
+    if workers == 1:
+        done = [render_range(job) for job in jobs]
+    else:
+        # close/join rather than the context manager: its terminate() sends
+        # SIGTERM, which SDL in the workers turns into a QUIT event
+        pool = multiprocessing.get_context("spawn").Pool(min(workers, len(jobs)))
+        try:
+            done = pool.map(render_range, jobs)
+        finally:
+            pool.close()
+            pool.join()
+
+    if fmt == "y4m":
+        with open(out, "wb") as f:
+            f.write(y4m_header(eng.WIN_W, eng.WIN_H, eng.FPS))
+            for job in jobs:
+                with open(job[5], "rb") as part:
+                    shutil.copyfileobj(part, f, 1 << 20)
+                os.remove(job[5])
+    return done
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    rp = sub.add_parser("record", help="record a seeded game with random input")
+    rp.add_argument("-o", "--out", required=True)
+    rp.add_argument("--seed", type=int, default=0)
+    rp.add_argument("--ticks", type=int, default=60 * 60)
+    rp.add_argument("--hard", action="store_true")
+    vp = sub.add_parser("render", help="render a recording to video frames")
+    vp.add_argument("recording")
+    vp.add_argument("-o", "--out", required=True)
+    vp.add_argument("--format", choices=("y4m", "png"), default=None,
+                    help="default: y4m for a .y4m path, png otherwise")
+    vp.add_argument("--workers", type=int, default=0, help="processes (0 = one per core)")
+    vp.add_argument("--chunk", type=int, default=0,
+                    help="frames per job (default: split evenly across workers)")
+    for p in (rp, vp):
+        p.add_argument("--engine", default=DEFAULT_ENGINE)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "record":
+        rec = record(load_engine(args.engine), args.seed, args.ticks, args.hard)
+        with open(args.out, "w") as f:
+            json.dump(rec, f)
+        print(f"seed {rec['seed']}: score {rec['score']} in {rec['ticks']} ticks -> {args.out}")
+        return
+
+    rec = load_recording(args.recording)
+    fmt = args.format or ("y4m" if args.out.endswith(".y4m") else "png")
+    started = time.perf_counter()
+    done = render(args.engine, rec, args.out, fmt, args.workers, args.chunk)
+    elapsed = time.perf_counter() - started
+    busy = sum(d[2] for d in done)
+    print(f"{rec['ticks']} frames in {len(done)} chunks -> {args.out}")
+    print(f"wall time {elapsed:.2f}s ({rec['ticks'] / max(elapsed, 1e-9):.0f} frames/s), "
+          f"worker time {busy:.2f}s")
+
+
+if __name__ == "__main__":
+    sys.exit(main())